@@ -0,0 +1,153 @@
+# app/commands/shard_media.py
+# 평평한 업로드 디렉터리의 기존 파일을 2단계 샤드 디렉터리로 옮기고, DB 의 URL 컬럼을 고친다.
+# 여러 번 실행해도 안전하다 (이미 샤드 경로인 행은 건너뛰고, 옮겨진 파일은 그대로 둔다).
+# 앱과 GC 스윕이 도는 중에도 실행할 수 있다. 경로 하나씩 파일을 옮기고(수정 시각을 갱신해 스윕의 유예 기간 안에 둔다),
+# 그 경로를 가리키는 blob 행과 모델 행을 한 트랜잭션에서 고친다. 샤드 경로에 같은 내용의 blob 이 이미 있으면 그 행에 합친다.
+#
+#   python -m Day6.app.commands.shard_media [--batch-size 500] [--dry-run]
+
+import argparse
+import asyncio
+import logging
+import os
+
+from fastapi.concurrency import run_in_threadpool
+from tortoise import Model, Tortoise, timezone
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import F
+from tortoise.transactions import in_transaction
+
+from Day6.app.configs import config
+from Day6.app.configs.database import TORTOISE_ORM
+from Day6.app.models.media import MediaBlob
+from Day6.app.services.media_gc import MEDIA_REFERENCES
+from Day6.app.utils.file import MEDIA_UPLOAD_DIRS, is_sharded, move_file, shard_path
+
+logger = logging.getLogger(__name__)
+
+# (모델, URL 컬럼, 변형 컬럼). 모델 행을 먼저 훑고, 어떤 모델도 가리키지 않는 blob 행을 마지막에 훑는다.
+SHARD_TABLES: tuple[tuple[type[Model], str, str], ...] = (
+    *((model, f"{prefix}_url", f"{prefix}_variants") for model, prefix in MEDIA_REFERENCES),
+    (MediaBlob, "path", "variants"),
+)
+
+
+def _sharded_urls(url: str, variants: dict[str, str] | None) -> tuple[str, dict[str, str] | None]:
+    """원본은 자기 이름으로 샤드를 정하고, 변형은 원본과 같은 디렉터리로 보낸다."""
+    upload_dir, filename = os.path.split(url)
+    new_url = shard_path(upload_dir, filename)
+    new_dir = os.path.dirname(new_url)
+    if variants is None:
+        return new_url, None
+    return new_url, {name: f"{new_dir}/{os.path.basename(path)}" for name, path in variants.items()}
+
+
+def _move_all(moves: list[tuple[str, str]]) -> int:
+    moved = 0
+    for src_url, dst_url in moves:
+        if move_file(src_url, dst_url):
+            # URL 을 고치기 전까지 옮긴 파일은 아무도 가리키지 않으므로, 스윕이 고아로 보지 않게 수정 시각을 지금으로 바꾼다.
+            os.utime(os.path.join(config.MEDIA_DIR, dst_url))
+            moved += 1
+        else:
+            logger.warning("media file not found: %s", src_url)
+    return moved
+
+
+async def _switch(
+    url: str, new_url: str, new_variants: dict[str, str] | None, counts: dict[str, dict[str, int]]
+) -> None:
+    """url 을 가리키는 blob 행과 모델 행을 한 트랜잭션에서 new_url 로 바꾼다."""
+    async with in_transaction() as connection:
+        blob = await MediaBlob.filter(path=url).select_for_update().using_db(connection).first()
+        if blob is not None:
+            if await MediaBlob.filter(path=new_url).using_db(connection).exists():
+                # 샤드 도입 뒤 같은 내용이 다시 올라와 행이 이미 있다. 참조 수를 그 행으로 넘기고 평평한 행은 지운다.
+                # 남은 평평한 파일은 아무도 가리키지 않게 되므로 스윕이 회수한다.
+                await (
+                    MediaBlob.filter(path=new_url)
+                    .using_db(connection)
+                    .update(ref_count=F("ref_count") + blob.ref_count, referenced_at=timezone.now())
+                )
+                await MediaBlob.filter(id=blob.id).using_db(connection).delete()
+                counts[MediaBlob.__name__]["merged"] += 1
+            else:
+                variants = new_variants if blob.variants is not None else None
+                await MediaBlob.filter(id=blob.id).using_db(connection).update(path=new_url, variants=variants)
+            counts[MediaBlob.__name__]["rows"] += 1
+
+        for model, url_field, variants_field in SHARD_TABLES[:-1]:
+            counts[model.__name__]["rows"] += await (
+                model.filter(**{url_field: url})
+                .using_db(connection)
+                .update(**{url_field: new_url, variants_field: new_variants})
+            )
+
+
+async def _shard_url(
+    url: str, variants: dict[str, str] | None, counts: dict[str, dict[str, int]], dry_run: bool
+) -> int:
+    """url 과 그 변형을 샤드 경로로 옮기고 DB 를 고친다. 옮긴 파일 수를 돌려준다."""
+    blob = await MediaBlob.get_or_none(path=url)
+    new_url, new_variants = _sharded_urls(url, variants or (blob.variants if blob is not None else None))
+    if dry_run:
+        for model, url_field, _ in SHARD_TABLES:
+            counts[model.__name__]["rows"] += await model.filter(**{url_field: url}).count()
+        return 0
+
+    moved = 0
+    # 합칠 대상이 이미 있으면 그 파일을 쓰고, 평평한 파일은 옮기지 않는다.
+    if blob is None or not await MediaBlob.exists(path=new_url):
+        moves = [
+            (url, new_url),
+            *((path, new_variants[name]) for name, path in (variants or {}).items() if new_variants),
+        ]
+        moved = await run_in_threadpool(_move_all, moves)
+    try:
+        await _switch(url, new_url, new_variants, counts)
+    except IntegrityError:
+        # 파일을 옮기는 사이 같은 내용이 샤드 경로로 올라와 행이 생겼다. 다시 시도하면 그 행에 합친다.
+        await _switch(url, new_url, new_variants, counts)
+    return moved
+
+
+async def shard_media(batch_size: int = 500, dry_run: bool = False) -> dict[str, dict[str, int]]:
+    counts = {model.__name__: {"rows": 0, "files": 0} for model, _, _ in SHARD_TABLES}
+    counts[MediaBlob.__name__]["merged"] = 0
+    for model, url_field, variants_field in SHARD_TABLES:
+        last_id = 0
+        while rows := await (
+            model.filter(id__gt=last_id, **{f"{url_field}__isnull": False})
+            .order_by("id")
+            .limit(batch_size)
+            .values_list("id", url_field, variants_field)
+        ):
+            last_id = rows[-1][0]
+            # 같은 배치의 뒤쪽 행은 앞에서 함께 고쳐졌을 수 있다.
+            handled: set[str] = set()
+            for _, url, variants in rows:
+                # 이미 옮겼거나, 업로드 디렉터리 밖(예: 절대 경로로 저장된 옛 값)인 행은 건드리지 않는다.
+                if url in handled or is_sharded(url) or os.path.dirname(url) not in MEDIA_UPLOAD_DIRS:
+                    continue
+                handled.add(url)
+                counts[model.__name__]["files"] += await _shard_url(url, variants, counts, dry_run)
+
+    return counts
+
+
+async def main(batch_size: int, dry_run: bool) -> None:
+    await Tortoise.init(config=TORTOISE_ORM)
+    try:
+        for table, counts in (await shard_media(batch_size, dry_run)).items():
+            print(f"{table:10s} rows={counts['rows']:8d}  files={counts['files']:8d}")
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="파일을 옮기거나 DB 를 고치지 않고 대상 개수만 센다")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size, args.dry_run))
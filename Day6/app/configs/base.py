@@ -22,5 +22,65 @@ class Config(BaseSettings):
     MYSQL_CONNECT_TIMEOUT: int = 5
     CONNECTION_POOL_MAXSIZE: int = 10
 
+    USER_CACHE_MAXSIZE: int = int(os.getenv("USER_CACHE_MAXSIZE", "10000"))
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+
+    TOKEN_CACHE_MAXSIZE: int = int(os.getenv("TOKEN_CACHE_MAXSIZE", "10000"))
+    TOKEN_CACHE_TTL_SECONDS: float = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_CONCURRENCY: int = int(os.getenv("PASSWORD_HASH_MAX_CONCURRENCY", "4"))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+    LAST_LOGIN_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("LAST_LOGIN_FLUSH_INTERVAL_SECONDS", "5"))
+    LAST_LOGIN_FLUSH_BATCH_SIZE: int = int(os.getenv("LAST_LOGIN_FLUSH_BATCH_SIZE", "500"))
+    LAST_LOGIN_MAX_PENDING: int = int(os.getenv("LAST_LOGIN_MAX_PENDING", "10000"))
+    # DB 장애로 flush 가 계속 실패할 때 메모리에 들고 있을 최대 항목 수. 넘으면 가장 오래된 것부터 버린다.
+    LAST_LOGIN_MAX_BUFFERED: int = int(os.getenv("LAST_LOGIN_MAX_BUFFERED", "100000"))
+
+    IMAGE_VARIANT_WORKERS: int = int(os.getenv("IMAGE_VARIANT_WORKERS", "2"))
+    IMAGE_VARIANT_MAX_CONCURRENCY: int = int(os.getenv("IMAGE_VARIANT_MAX_CONCURRENCY", "4"))
+    IMAGE_VARIANT_MAX_QUEUE: int = int(os.getenv("IMAGE_VARIANT_MAX_QUEUE", "32"))
+
+    # 좋아요/취소를 메모리에 모았다가 주기적으로 반영한다. False 면 요청마다 바로 쓴다.
+    LIKE_BUFFER_ENABLED: bool = os.getenv("LIKE_BUFFER_ENABLED", "true").lower() == "true"
+    LIKE_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("LIKE_FLUSH_INTERVAL_SECONDS", "1"))
+    LIKE_FLUSH_BATCH_SIZE: int = int(os.getenv("LIKE_FLUSH_BATCH_SIZE", "500"))
+    LIKE_MAX_PENDING: int = int(os.getenv("LIKE_MAX_PENDING", "10000"))
+    REVIEW_IS_LIKED_MAX_IDS: int = int(os.getenv("REVIEW_IS_LIKED_MAX_IDS", "100"))
+    LIKE_COUNT_RECONCILE_INTERVAL_SECONDS: float = float(os.getenv("LIKE_COUNT_RECONCILE_INTERVAL_SECONDS", "3600"))
+    LIKE_COUNT_RECONCILE_BATCH_SIZE: int = int(os.getenv("LIKE_COUNT_RECONCILE_BATCH_SIZE", "1000"))
+
+    MEDIA_GC_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("MEDIA_GC_FLUSH_INTERVAL_SECONDS", "1"))
+    MEDIA_GC_SWEEP_INTERVAL_SECONDS: float = float(os.getenv("MEDIA_GC_SWEEP_INTERVAL_SECONDS", "3600"))
+    MEDIA_GC_GRACE_SECONDS: float = float(os.getenv("MEDIA_GC_GRACE_SECONDS", "3600"))
+    MEDIA_GC_BATCH_SIZE: int = int(os.getenv("MEDIA_GC_BATCH_SIZE", "1000"))
+
+    # 미디어 저장소: "local" (MEDIA_DIR) 또는 "s3" (S3 호환 오브젝트 스토리지)
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "local")
+    S3_ENDPOINT_URL: str = os.getenv("S3_ENDPOINT_URL", "http://localhost:9000")
+    S3_BUCKET: str = os.getenv("S3_BUCKET", "media")
+    S3_REGION: str = os.getenv("S3_REGION", "us-east-1")
+    S3_ACCESS_KEY: str = os.getenv("S3_ACCESS_KEY", "")
+    S3_SECRET_KEY: str = os.getenv("S3_SECRET_KEY", "")
+    S3_PATH_STYLE: bool = os.getenv("S3_PATH_STYLE", "true").lower() == "true"
+    DIRECT_UPLOAD_EXPIRES_SECONDS: int = int(os.getenv("DIRECT_UPLOAD_EXPIRES_SECONDS", "900"))
+    # 이어 올리기 세션의 수명과 클라이언트에 권하는 청크 크기
+    UPLOAD_SESSION_EXPIRES_SECONDS: int = int(os.getenv("UPLOAD_SESSION_EXPIRES_SECONDS", str(24 * 60 * 60)))
+    UPLOAD_SESSION_CHUNK_SIZE: int = int(os.getenv("UPLOAD_SESSION_CHUNK_SIZE", str(1024 * 1024)))
+
+    # 워커당 동시에 디스크에 쓰는 업로드 수와 대기열. 대기열이 차거나 UPLOAD_QUEUE_TIMEOUT_SECONDS 안에 자리가 나지 않으면 503.
+    UPLOAD_MAX_CONCURRENCY: int = int(os.getenv("UPLOAD_MAX_CONCURRENCY", "8"))
+    UPLOAD_MAX_QUEUE: int = int(os.getenv("UPLOAD_MAX_QUEUE", "32"))
+    UPLOAD_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("UPLOAD_QUEUE_TIMEOUT_SECONDS", "5"))
+
+    # 자주 요청되는 작은 미디어 파일을 메모리에 두는 캐시. 다른 워커에서 지운 파일도 TTL 이 지나면 빠진다.
+    MEDIA_CACHE_MAX_BYTES: int = int(os.getenv("MEDIA_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    MEDIA_CACHE_MAX_ITEM_BYTES: int = int(os.getenv("MEDIA_CACHE_MAX_ITEM_BYTES", str(256 * 1024)))
+    MEDIA_CACHE_TTL_SECONDS: float = float(os.getenv("MEDIA_CACHE_TTL_SECONDS", "60"))
+
+    MAX_UPLOAD_SIZE: int = int(os.getenv("MAX_UPLOAD_SIZE", str(10 * 1024 * 1024)))
+    MAX_IMAGE_PIXELS: int = int(os.getenv("MAX_IMAGE_PIXELS", str(40_000_000)))
+
     BASE_DIR: Path = Path(__file__).resolve().parent.parent.parent
     MEDIA_DIR: str = os.path.join(BASE_DIR, "media")
@@ -9,6 +9,8 @@ TORTOISE_APP_MODELS = [
     "Day6.app.models.users",
     "Day6.app.models.reviews",
     "Day6.app.models.likes",
+    "Day6.app.models.media",
+    "Day6.app.models.uploads",
     "aerich.models",
 ]
 
@@ -1,21 +1,58 @@
 # main.py
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI
 
+from Day6.app.configs import config
 from Day6.app.configs.database import initialize_tortoise
 from Day6.app.routers.likes import like_router
+from Day6.app.routers.media import media_router
+from Day6.app.routers.metrics import metrics_router
 from Day6.app.routers.movies import movie_router
 from Day6.app.routers.reviews import review_router
 from Day6.app.routers.users import user_router
+from Day6.app.services.image import image_variant_service
+from Day6.app.services.last_login import last_login_buffer
+from Day6.app.services.likes import like_buffer, like_count_reconciler
+from Day6.app.services.media_gc import media_gc
+from Day6.app.services.password import password_hasher
+from Day6.app.utils.middleware import BodySizeLimitMiddleware
+from Day6.app.utils.response import FastJSONResponse
+from Day6.app.utils.storage import storage
 
-app = FastAPI()
+# multipart 경계와 폼 필드가 차지하는 여유분
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # register_tortoise 의 lifespan 안쪽에서 실행되므로 DB 연결이 살아있는 동안 시작/종료된다.
+    last_login_buffer.start()
+    media_gc.start()
+    like_buffer.start()
+    like_count_reconciler.start()
+    yield
+    await last_login_buffer.stop()
+    await like_buffer.stop()
+    await media_gc.stop()
+    await like_count_reconciler.stop()
+    password_hasher.shutdown()
+    image_variant_service.shutdown()
+    await storage.close()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+app.add_middleware(BodySizeLimitMiddleware, max_body_size=config.MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD)
 
 # include routers in app
 app.include_router(user_router)
 app.include_router(movie_router)
 app.include_router(review_router)
 app.include_router(like_router)
+app.include_router(metrics_router)
+app.include_router(media_router)
 
 initialize_tortoise(app=app)
 
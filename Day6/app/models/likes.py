@@ -13,4 +13,5 @@ class ReviewLike(BaseModel, Model):
 
     class Meta:
         table = "review_likes"
+        # (user_id, review_id) 유니크 인덱스가 유저별 좋아요 조회(review_id IN (...))도 받쳐준다.
         unique_together = (("user", "review"),)
@@ -0,0 +1,23 @@
+from typing import Any
+
+from tortoise import Model, fields
+
+from Day6.app.models.base import BaseModel
+
+
+class MediaBlob(BaseModel, Model):
+    """내용(sha256) 기준으로 한 번만 저장되는 미디어 파일과 그 참조 수"""
+
+    path = fields.CharField(max_length=255, unique=True)
+    sha256 = fields.CharField(max_length=64, db_index=True)
+    size = fields.BigIntField()
+    ref_count = fields.IntField(default=0)
+    # 마지막으로 참조 수가 늘어난 시각. 스윕은 이 시각이 유예 기간보다 오래된 행만 정리한다.
+    referenced_at = fields.DatetimeField(auto_now=True)
+    # 변형 이름 -> 상대 경로 (thumb, medium, webp ...)
+    variants: dict[str, str] | None = fields.JSONField(null=True)
+    # width, height, size, dominant_color, blurhash. 업로드 때 한 번만 계산한다.
+    metadata: dict[str, Any] | None = fields.JSONField(null=True)
+
+    class Meta:
+        table = "media_blobs"
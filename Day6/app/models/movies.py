@@ -25,6 +25,10 @@ class Movie(BaseModel, Model):
     playtime = fields.IntField()
     genre = fields.CharEnumField(GenreEnum)
     poster_image_url = fields.CharField(max_length=255, null=True)
+    poster_image_variants: dict[str, str] | None = fields.JSONField(null=True)
+    poster_image_metadata: dict[str, Any] | None = fields.JSONField(null=True)
 
     class Meta:
         table = "movies"
+        # search_movie 의 keyset 페이지네이션 정렬 키
+        indexes = (("created_at", "id"),)
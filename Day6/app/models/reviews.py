@@ -1,3 +1,5 @@
+from typing import Any
+
 from tortoise import Model, fields
 
 from Day6.app.models.base import BaseModel
@@ -9,7 +11,11 @@ class Review(BaseModel, Model):
     title = fields.CharField(max_length=50, null=False)
     content = fields.TextField(max_length=255, null=False)
     review_image_url = fields.CharField(max_length=255, null=True)
+    review_image_variants: dict[str, str] | None = fields.JSONField(null=True)
+    review_image_metadata: dict[str, Any] | None = fields.JSONField(null=True)
     created_at = fields.DatetimeField(auto_now_add=True)
+    # review_likes 중 is_liked 인 행 수. 좋아요/취소 트랜잭션 안에서 F 식으로 함께 바꾸고, 어긋나면 주기적으로 바로잡는다.
+    like_count = fields.IntField(default=0)
 
     user: fields.ForeignKeyRelation[User] = fields.ForeignKeyField(
         "models.User", related_name="reviews", on_delete=fields.CASCADE
@@ -21,3 +27,5 @@ class Review(BaseModel, Model):
     class Meta:
         table = "reviews"
         unique_together = (("user", "movie"),)
+        # get_movie_reviews 의 sort=recent / sort=top keyset 페이지네이션 정렬 키
+        indexes = (("movie_id", "created_at", "id"), ("movie_id", "like_count", "id"))
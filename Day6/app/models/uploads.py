@@ -0,0 +1,21 @@
+from tortoise import Model, fields
+
+from Day6.app.models.base import BaseModel
+from Day6.app.models.users import User
+
+
+class UploadSession(BaseModel, Model):
+    """청크 단위로 이어 올리는 업로드. 받은 바이트는 `path`(MEDIA_DIR 기준 스테이징 파일)의 offset 위치에 쓴다."""
+
+    path = fields.CharField(max_length=255, unique=True)
+    size = fields.BigIntField()
+    # 지금까지 이어서 받은 바이트 수. 다음 청크는 이 위치부터 보내야 한다.
+    offset = fields.BigIntField(default=0)
+    expires_at = fields.DatetimeField(db_index=True)
+
+    user: fields.ForeignKeyRelation[User] = fields.ForeignKeyField(
+        "models.User", related_name="upload_sessions", on_delete=fields.CASCADE
+    )
+
+    class Meta:
+        table = "upload_sessions"
@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Any
 
 from tortoise import Model, fields
 
@@ -17,6 +18,8 @@ class User(BaseModel, Model):
     gender = fields.CharEnumField(GenderName)
     last_login = fields.DatetimeField(null=True)
     profile_image_url = fields.CharField(max_length=255, null=True)
+    profile_image_variants: dict[str, str] | None = fields.JSONField(null=True)
+    profile_image_metadata: dict[str, Any] | None = fields.JSONField(null=True)
 
     class Meta:
         table = "users"
@@ -1,36 +1,37 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 
-from Day6.app.models.likes import ReviewLike
+from Day6.app.configs import config
+from Day6.app.models.reviews import Review
 from Day6.app.models.users import User
 from Day6.app.schemas.likes import ReviewLikeResponse
+from Day6.app.services.likes import like_buffer, review_like_service
 from Day6.app.utils.auth import get_current_user
 
 like_router = APIRouter(prefix="/likes", tags=["likes"])
 
 
+async def _ensure_review_exists(review_id: int) -> None:
+    # 버퍼는 flush 때 지워진 리뷰의 상태를 버리므로, 없는 리뷰는 여기서 바로 404 로 알려준다.
+    if not await Review.exists(id=review_id):
+        raise HTTPException(status_code=404, detail="Review does not exist")
+
+
 @like_router.get("/reviews/{review_id}/like", status_code=200)
 async def like_review(user: Annotated[User, Depends(get_current_user)], review_id: int) -> None:
-    review_like, _ = await ReviewLike.get_or_create(user_id=user.id, review_id=review_id)
-
-    if not review_like.is_liked:
-        review_like.is_liked = True
-        await review_like.save()
+    await _ensure_review_exists(review_id)
+    if config.LIKE_BUFFER_ENABLED:
+        like_buffer.record(user.id, review_id, True)
+    else:
+        await review_like_service.like(user.id, review_id)
 
 
 @like_router.get("/reviews/{review_id}/unlike", status_code=200)
 async def unlike_review(user: Annotated[User, Depends(get_current_user)], review_id: int) -> ReviewLikeResponse:
-    if not (review_like := await ReviewLike.get_or_none(user_id=user.id, review_id=review_id)):
-        return ReviewLikeResponse(user_id=user.id, review_id=review_id, is_liked=False)
-
-    if review_like.is_liked:
-        review_like.is_liked = False
-        await review_like.save()
-
-    return ReviewLikeResponse(
-        id=review_like.id,
-        user_id=review_like.user_id,  # type: ignore[attr-defined]
-        review_id=review_like.review_id,  # type: ignore[attr-defined]
-        is_liked=review_like.is_liked,
-    )
+    await _ensure_review_exists(review_id)
+    if config.LIKE_BUFFER_ENABLED:
+        like_buffer.record(user.id, review_id, False)
+    else:
+        await review_like_service.unlike(user.id, review_id)
+    return ReviewLikeResponse(user_id=user.id, review_id=review_id, is_liked=False)
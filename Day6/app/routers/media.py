@@ -0,0 +1,198 @@
+import mimetypes
+import uuid
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, RedirectResponse
+from tortoise import Model
+
+from Day6.app.configs import config
+from Day6.app.models.uploads import UploadSession
+from Day6.app.models.users import User
+from Day6.app.schemas.media import (
+    CompleteDirectUploadRequest,
+    CreateUploadSessionRequest,
+    DirectUploadRequest,
+    DirectUploadResponse,
+    MediaTarget,
+    MediaTargetRequest,
+    StoredMediaResponse,
+    UploadSessionResponse,
+)
+from Day6.app.services.file import file_upload_service
+from Day6.app.services.media import media_store
+from Day6.app.services.upload_session import upload_session_service
+from Day6.app.utils.auth import get_current_user
+from Day6.app.utils.concurrency import LimitedRoute, limited_by
+from Day6.app.utils.file import (
+    STAGING_DIR,
+    CachedMedia,
+    is_staging_path,
+    media_cache,
+    media_cache_key,
+    read_media_file,
+    resolve_media_file,
+    upload_limiter,
+    validate_image_filename,
+    write_chunks,
+)
+from Day6.app.utils.http_cache import is_not_modified, media_cache_headers
+from Day6.app.utils.storage import LocalStorage, storage
+
+media_router = APIRouter(prefix="/media", tags=["media"], route_class=LimitedRoute)
+
+# 업로드 대상 -> 모델의 이미지 필드 접두사
+MEDIA_TARGET_FIELDS: dict[MediaTarget, str] = {
+    MediaTarget.MOVIE_POSTER: "poster_image",
+    MediaTarget.PROFILE_IMAGE: "profile_image",
+    MediaTarget.REVIEW_IMAGE: "review_image",
+}
+
+
+@media_router.post("/uploads", response_model=DirectUploadResponse, status_code=201)  # 직접 업로드 URL 발급
+async def create_direct_upload(
+    data: DirectUploadRequest, user: Annotated[User, Depends(get_current_user)]
+) -> DirectUploadResponse:
+    ext = validate_image_filename(data.filename)
+    if data.size > config.MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail=f"file is too large. max size: {config.MAX_UPLOAD_SIZE} bytes")
+
+    # 업로드한 유저만 완료 처리할 수 있도록 경로에 유저 id 를 넣는다.
+    upload_id = f"{STAGING_DIR}/{user.id}/{uuid.uuid4().hex}.{ext}"
+    presigned = storage.presign_upload(upload_id, config.DIRECT_UPLOAD_EXPIRES_SECONDS)
+
+    return DirectUploadResponse(
+        upload_id=upload_id,
+        upload_url=presigned.url,
+        method=presigned.method,
+        headers=presigned.headers,
+        expires_in=config.DIRECT_UPLOAD_EXPIRES_SECONDS,
+    )
+
+
+@media_router.put("/uploads/{upload_id:path}", status_code=204)  # 로컬 저장소용 서명된 업로드 수신
+@limited_by(upload_limiter)
+async def receive_direct_upload(upload_id: str, expires: int, signature: str, request: Request) -> Response:
+    if not isinstance(storage, LocalStorage) or not storage.verify_upload_signature(upload_id, expires, signature):
+        raise HTTPException(status_code=403, detail="Invalid or expired upload signature")
+
+    await write_chunks(request.stream(), upload_id)
+    return Response(status_code=204)
+
+
+@media_router.post("/uploads/complete", response_model=StoredMediaResponse, status_code=200)  # 직접 업로드 완료
+@limited_by(upload_limiter)
+async def complete_direct_upload(
+    data: CompleteDirectUploadRequest, user: Annotated[User, Depends(get_current_user)]
+) -> StoredMediaResponse:
+    if not data.upload_id.startswith(f"{STAGING_DIR}/{user.id}/") or ".." in data.upload_id:
+        raise HTTPException(status_code=403, detail="You are not the owner of the upload")
+
+    instance = await file_upload_service.attach_upload(
+        user, data.target, data.target_id, file_upload_service.open_staged_upload(data.upload_id)
+    )
+    return _stored_media_response(instance, data.target)
+
+
+@media_router.post("/sessions", response_model=UploadSessionResponse, status_code=201)  # 이어 올리기 세션 생성
+async def create_upload_session(
+    data: CreateUploadSessionRequest, user: Annotated[User, Depends(get_current_user)]
+) -> UploadSessionResponse:
+    session = await upload_session_service.create(user, data.filename, data.size)
+    return _upload_session_response(session)
+
+
+@media_router.get("/sessions/{session_id}", response_model=UploadSessionResponse, status_code=200)  # 받은 위치 조회
+async def get_upload_session(
+    session_id: int, user: Annotated[User, Depends(get_current_user)]
+) -> UploadSessionResponse:
+    return _upload_session_response(await upload_session_service.get(user, session_id))
+
+
+@media_router.put("/sessions/{session_id}", response_model=UploadSessionResponse, status_code=200)  # 청크 업로드
+@limited_by(upload_limiter)
+async def put_upload_session_chunk(
+    session_id: int, offset: int, request: Request, user: Annotated[User, Depends(get_current_user)]
+) -> UploadSessionResponse:
+    session = await upload_session_service.get(user, session_id)
+    session = await upload_session_service.write_chunk(session, offset, request.stream())
+    return _upload_session_response(session)
+
+
+@media_router.post("/sessions/{session_id}/complete", response_model=StoredMediaResponse, status_code=200)
+@limited_by(upload_limiter)
+async def complete_upload_session(
+    session_id: int, data: MediaTargetRequest, user: Annotated[User, Depends(get_current_user)]
+) -> StoredMediaResponse:
+    session = await upload_session_service.get(user, session_id)
+    instance = await upload_session_service.finalize(user, session, data.target, data.target_id)
+    return _stored_media_response(instance, data.target)
+
+
+@media_router.delete("/sessions/{session_id}", status_code=204)  # 이어 올리기 취소
+async def delete_upload_session(session_id: int, user: Annotated[User, Depends(get_current_user)]) -> None:
+    await upload_session_service.abort(await upload_session_service.get(user, session_id))
+
+
+def _upload_session_response(session: UploadSession) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        id=session.id,
+        size=session.size,
+        offset=session.offset,
+        chunk_size=config.UPLOAD_SESSION_CHUNK_SIZE,
+        expires_at=session.expires_at,
+    )
+
+
+def _stored_media_response(instance: Model, target: MediaTarget) -> StoredMediaResponse:
+    field = MEDIA_TARGET_FIELDS[target]
+    return StoredMediaResponse(
+        url=getattr(instance, f"{field}_url") or "",
+        variants=getattr(instance, f"{field}_variants") or {},
+        metadata=getattr(instance, f"{field}_metadata"),
+    )
+
+
+def _cached_media_response(cached: CachedMedia, method: str) -> Response:
+    headers = {**cached.headers, "accept-ranges": "bytes", "content-length": str(len(cached.content))}
+    return Response(b"" if method == "HEAD" else cached.content, headers=headers, media_type=cached.media_type)
+
+
+@media_router.api_route("/{file_url:path}", methods=["GET", "HEAD"], status_code=200)
+async def get_media(file_url: str, request: Request) -> Response:
+    # 스테이징 파일은 아직 검증(이미지 확인, 최적화)되지 않았으므로 공개하지 않는다.
+    if is_staging_path(file_url):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    # 원격 저장소라면 앱이 바이트를 중계하지 않고 서명된 URL 로 보낸다.
+    if (public_url := storage.public_url(file_url)) is not None:
+        return RedirectResponse(public_url, status_code=307)
+
+    # 자주 요청되는 작은 파일은 메모리에서 바로 응답한다. 부분 요청(Range)은 FileResponse 에 맡긴다.
+    if (cached := media_cache.get(media_cache_key(file_url))) is not None:
+        if is_not_modified(request.headers, cached.headers["etag"], cached.mtime):
+            return Response(status_code=304, headers=cached.headers)
+        if "range" not in request.headers:
+            return _cached_media_response(cached, request.method)
+
+    # 파일을 확인하고 읽는 사이 지워지거나 바뀌면 캐시에 넣지 않도록 먼저 세대를 받아 둔다.
+    generation = media_cache.generation()
+    file_path, stat_result = await run_in_threadpool(resolve_media_file, file_url)
+    headers = media_cache_headers(stat_result, immutable=await media_store.is_settled(file_url))
+
+    if is_not_modified(request.headers, headers["etag"], stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    if media_cache.accepts(stat_result.st_size) and "range" not in request.headers:
+        cached = CachedMedia(
+            content=await run_in_threadpool(read_media_file, file_path),
+            media_type=mimetypes.guess_type(file_path)[0] or "application/octet-stream",
+            headers=headers,
+            mtime=stat_result.st_mtime,
+        )
+        media_cache.set(media_cache_key(file_url), cached, len(cached.content), generation=generation)
+        return _cached_media_response(cached, request.method)
+
+    # FileResponse 가 Range/If-Range 를 처리하고, 서버가 http.response.pathsend 를 지원하면 sendfile 로 보낸다.
+    return FileResponse(file_path, headers=headers, stat_result=stat_result)
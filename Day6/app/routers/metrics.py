@@ -0,0 +1,32 @@
+from typing import Any
+
+from fastapi import APIRouter
+
+from Day6.app.services.image import image_variant_service
+from Day6.app.services.last_login import last_login_buffer
+from Day6.app.services.likes import like_buffer, like_count_reconciler
+from Day6.app.services.media import media_store
+from Day6.app.services.media_gc import media_gc
+from Day6.app.services.password import password_hasher
+from Day6.app.utils.auth import user_cache
+from Day6.app.utils.file import media_cache, upload_limiter
+from Day6.app.utils.jwt import token_cache
+
+metrics_router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@metrics_router.get("", status_code=200)  # 캐시 등 프로세스 내부 지표 조회
+async def get_metrics() -> dict[str, dict[str, Any]]:
+    return {
+        "user_cache": user_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "last_login_buffer": last_login_buffer.stats(),
+        "media_store": media_store.stats(),
+        "media_gc": media_gc.stats(),
+        "like_buffer": like_buffer.stats(),
+        "like_count_reconciler": like_count_reconciler.stats(),
+        "image_variant_service": image_variant_service.stats(),
+        "upload_limiter": upload_limiter.stats(),
+        "media_cache": media_cache.stats(),
+    }
@@ -1,48 +1,107 @@
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Any, Callable
 
-from fastapi import APIRouter, HTTPException, Path, Query, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response, UploadFile
 
 from Day6.app.models.movies import Movie
 from Day6.app.models.reviews import Review
+from Day6.app.models.users import User
 from Day6.app.schemas.movies import (
+    MOVIE_RESPONSE_FIELDS,
     CreateMovieRequest,
+    MoviePageResponse,
     MovieResponse,
     MovieSearchParams,
     MovieUpdateParams,
+    movie_fields_response,
+    movie_page_serializer,
+    movie_serializer,
 )
-from Day6.app.schemas.reviews import ReviewResponse
-from Day6.app.utils.file import delete_file, upload_file, validate_image_extension
+from Day6.app.schemas.pagination import PaginationParams
+from Day6.app.schemas.reviews import (
+    ReviewFeedParams,
+    ReviewPageResponse,
+    ReviewSort,
+    review_page_serializer,
+)
+from Day6.app.services.file import file_upload_service
+from Day6.app.services.likes import like_buffer
+from Day6.app.services.media import media_store
+from Day6.app.utils.auth import get_optional_user
+from Day6.app.utils.concurrency import LimitedRoute, limited_by
+from Day6.app.utils.file import upload_limiter
+from Day6.app.utils.pagination import decode_cursor, encode_cursor, keyset_filter
+from Day6.app.utils.response import FastJSONResponse
+
+movie_router = APIRouter(prefix="/movies", tags=["movies"], route_class=LimitedRoute)
+
 
-movie_router = APIRouter(prefix="/movies", tags=["movies"])
+def _parse_fields(fields: str | None) -> tuple[str, ...] | None:
+    """fields=id,title,genre 형태의 sparse fieldset 을 검증한다. id 는 항상 포함된다."""
+    if fields is None:
+        return None
+
+    selected = tuple(dict.fromkeys(["id", *(name.strip() for name in fields.split(",") if name.strip())]))
+    if invalid := [name for name in selected if name not in MOVIE_RESPONSE_FIELDS]:
+        raise HTTPException(
+            status_code=400, detail=f"invalid fields: {invalid}. available fields: {list(MOVIE_RESPONSE_FIELDS)}"
+        )
+    return selected
 
 
 @movie_router.post("", response_model=MovieResponse, status_code=201)  # 영화 등록
-async def create_movie(movie: CreateMovieRequest) -> MovieResponse:
+async def create_movie(movie: CreateMovieRequest) -> Response:
     new_movie = await Movie.create(**movie.model_dump())
-    return MovieResponse.model_validate(new_movie)
+    return movie_serializer.response(new_movie, status_code=201)
+
+
+@movie_router.get("", response_model=MoviePageResponse, status_code=200)  # 영화 검색
+async def search_movie(query_params: Annotated[MovieSearchParams, Query()]) -> Response:
+    search_query = query_params.model_dump(exclude={"fields", *PaginationParams.model_fields})
+    valid_query = {key: value for key, value in search_query.items() if value is not None}
+    queryset = Movie.filter(**valid_query)
+    selected = _parse_fields(query_params.fields)
+
+    # (created_at, id) 기준 keyset 페이지네이션. OFFSET 없이 마지막으로 본 행 다음부터 읽는다.
+    if query_params.cursor is not None:
+        queryset = queryset.filter(
+            keyset_filter(("created_at", "id"), decode_cursor(query_params.cursor, datetime.fromisoformat, int))
+        )
+
+    # 필요한 컬럼만 SELECT 해서 plot(LONGTEXT)/cast(JSON) 을 읽지 않도록 한다. created_at 은 커서용.
+    columns = dict.fromkeys([*(selected or MOVIE_RESPONSE_FIELDS), "created_at"])
+    rows = await queryset.order_by("created_at", "id").limit(query_params.limit + 1).values(*columns)
+
+    next_cursor = None
+    if len(rows) > query_params.limit:
+        rows = rows[: query_params.limit]
+        next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
 
+    if selected is None:
+        return movie_page_serializer.response({"items": rows, "next_cursor": next_cursor})
 
-@movie_router.get("", response_model=list[MovieResponse], status_code=200)  # 영화 검색
-async def search_movie(query_params: Annotated[MovieSearchParams, Query()]) -> list[Movie]:
-    valid_query = {key: value for key, value in query_params.model_dump().items() if value is not None}
-    return await Movie.filter(**valid_query).all()
+    fields_response = movie_fields_response(selected)
+    return FastJSONResponse({"items": [fields_response(**row) for row in rows], "next_cursor": next_cursor})
 
 
 @movie_router.get("/{movie_id}", response_model=MovieResponse, status_code=200)  # 특정 영화 검색
-async def read_movie(movie_id: int = Path(gt=0)) -> MovieResponse:
-    if movie := await Movie.get_or_none(id=movie_id):
-        return MovieResponse.model_validate(movie)
-    else:
+async def read_movie(movie_id: int = Path(gt=0), fields: Annotated[str | None, Query()] = None) -> Response:
+    selected = _parse_fields(fields)
+    if not (row := await Movie.filter(id=movie_id).first().values(*(selected or MOVIE_RESPONSE_FIELDS))):
         raise HTTPException(status_code=404, detail="Movie not found")
 
+    if selected is None:
+        return movie_serializer.response(row)
+    return FastJSONResponse(movie_fields_response(selected)(**row))
+
 
 @movie_router.patch("/{movie_id}", response_model=MovieResponse, status_code=200)  # 영화 갱신
-async def update_movie(data: MovieUpdateParams, movie_id: int = Path(gt=0)) -> MovieResponse:
+async def update_movie(data: MovieUpdateParams, movie_id: int = Path(gt=0)) -> Response:
     if movie := await Movie.get_or_none(id=movie_id):
         valid_params = {key: value for key, value in data.model_dump().items() if value is not None}
         await movie.update_from_dict(valid_params)
         await movie.save()
-        return MovieResponse.model_validate(movie)
+        return movie_serializer.response(movie)
     else:
         raise HTTPException(status_code=404, detail="Movie not found")
 
@@ -51,33 +110,81 @@ async def update_movie(data: MovieUpdateParams, movie_id: int = Path(gt=0)) -> M
 async def delete_movie(movie_id: int = Path(gt=0)) -> None:
     if movie := await Movie.get(id=movie_id):
         await movie.delete()
+        if movie.poster_image_url is not None:
+            await media_store.release(movie.poster_image_url)
     else:
         raise HTTPException(status_code=404, detail="Movie not found")
 
 
 @movie_router.post("/{movie_id}/poster_image", response_model=MovieResponse, status_code=201)
-async def register_poster_image(image: UploadFile, movie_id: int = Path(gt=0)) -> MovieResponse:
-    validate_image_extension(image)
-
+@limited_by(upload_limiter)
+async def register_poster_image(image: UploadFile, movie_id: int = Path(gt=0)) -> Response:
     if not (movie := await Movie.get_or_none(id=movie_id)):
         raise HTTPException(status_code=404, detail="Movie not found")
 
-    prev_image_url = movie.poster_image_url
-    try:
-        image_url = await upload_file(image, "movies/poster_images")
-        movie.poster_image_url = image_url
-        await movie.save()
-
-        if prev_image_url is not None:
-            delete_file(prev_image_url)
-
-        return MovieResponse.model_validate(movie)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
-
+    await file_upload_service.movie_poster_image_upload(movie, image)
+
+    return movie_serializer.response(movie, status_code=201)
+
+
+# 리뷰 피드 정렬 -> (정렬 키, 커서 값 파서). 둘 다 최신/많은 순이라 내림차순으로 읽는다.
+REVIEW_FEED_KEYS: dict[ReviewSort, tuple[tuple[str, str], tuple[Callable[[Any], Any], Callable[[Any], Any]]]] = {
+    ReviewSort.recent: (("created_at", "id"), (datetime.fromisoformat, int)),
+    ReviewSort.top: (("like_count", "id"), (int, int)),
+}
+
+
+@movie_router.get("/{movie_id}/reviews", response_model=ReviewPageResponse, status_code=200)  # 영화 리뷰 피드
+async def get_movie_reviews(
+    query_params: Annotated[ReviewFeedParams, Query()],
+    viewer: Annotated[User | None, Depends(get_optional_user)],
+    movie_id: int = Path(gt=0),
+) -> Response:
+    keys, parsers = REVIEW_FEED_KEYS[query_params.sort]
+    queryset = Review.filter(movie_id=movie_id)
+    # sort=top 은 like_count 가 바뀌는 중에 넘기면 경계의 리뷰가 빠지거나 겹칠 수 있다. 피드 특성상 감수한다.
+    if query_params.cursor is not None:
+        queryset = queryset.filter(keyset_filter(keys, decode_cursor(query_params.cursor, *parsers), descending=True))
+
+    # 작성자 요약은 JOIN 으로 같은 쿼리에서 읽는다.
+    rows = await (
+        queryset.order_by(*(f"-{key}" for key in keys))
+        .limit(query_params.limit + 1)
+        .values(
+            "id",
+            "movie_id",
+            "title",
+            "content",
+            "review_image_url",
+            "review_image_variants",
+            "review_image_metadata",
+            "like_count",
+            "created_at",
+            "user_id",
+            "user__username",
+            "user__profile_image_url",
+        )
+    )
+    if not rows and query_params.cursor is None and not await Movie.exists(id=movie_id):
+        raise HTTPException(status_code=404, detail="Movie not found")
 
-@movie_router.get("/{movie_id}/reviews", status_code=200)
-async def get_movie_reviews(movie_id: int = Path(gt=0)) -> list[ReviewResponse]:
-    if reviews := await Review.filter(movie_id=movie_id).all():
-        return [ReviewResponse.model_validate(review) for review in reviews]
-    raise HTTPException(status_code=404, detail="No reviews found")
+    next_cursor = None
+    if len(rows) > query_params.limit:
+        rows = rows[: query_params.limit]
+        next_cursor = encode_cursor(*(rows[-1][key] for key in keys))
+
+    # 보는 유저의 좋아요 여부는 페이지 전체를 IN 쿼리 한 번으로 읽는다.
+    liked = await like_buffer.liked_states(viewer.id, [row["id"] for row in rows]) if viewer and rows else {}
+    items = [
+        {
+            **row,
+            "is_liked": liked.get(row["id"]) if viewer else None,
+            "author": {
+                "id": row["user_id"],
+                "username": row["user__username"],
+                "profile_image_url": row["user__profile_image_url"],
+            },
+        }
+        for row in rows
+    ]
+    return review_page_serializer.response({"items": items, "next_cursor": next_cursor})
@@ -1,7 +1,8 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
 
+from Day6.app.configs import config
 from Day6.app.models.likes import ReviewLike
 from Day6.app.models.reviews import Review
 from Day6.app.models.users import User
@@ -10,18 +11,24 @@ from Day6.app.schemas.reviews import (
     CreateReviewRequest,
     ReviewResponse,
     UpdateReviewRequest,
+    review_serializer,
 )
+from Day6.app.services.file import file_upload_service
+from Day6.app.services.likes import like_buffer
+from Day6.app.services.media import media_store
 from Day6.app.utils.auth import get_current_user
-from Day6.app.utils.file import delete_file, upload_file
+from Day6.app.utils.concurrency import LimitedRoute, limited_by
+from Day6.app.utils.file import REVIEW_IMAGE_DIR, upload_limiter
 
-review_router = APIRouter(prefix="/reviews", tags=["reviews"])
+review_router = APIRouter(prefix="/reviews", tags=["reviews"], route_class=LimitedRoute)
 
 
-@review_router.post("/", status_code=201)
+@review_router.post("/", response_model=ReviewResponse, status_code=201)
+@limited_by(upload_limiter)
 async def create_review(
     user: Annotated[User, Depends(get_current_user)],
     review_form: Annotated[CreateReviewRequest, Depends(CreateReviewRequest.as_form)],
-) -> ReviewResponse:
+) -> Response:
     data = {
         "user_id": user.id,
         "movie_id": review_form.movie_id,
@@ -29,27 +36,50 @@ async def create_review(
         "content": review_form.content,
     }
 
+    stored = None
     if review_form.review_image:
-        data["review_image_url"] = await upload_file(review_form.review_image, "reviews/images")
+        stored = await media_store.save(review_form.review_image, REVIEW_IMAGE_DIR)
+        data["review_image_url"], data["review_image_variants"] = stored.url, stored.variants
+        data["review_image_metadata"] = stored.metadata
 
-    review = await Review.create(**data)  # type: ignore[arg-type]
+    try:
+        review = await Review.create(**data)  # type: ignore[arg-type]
+    except Exception:
+        # 리뷰가 만들어지지 않았으면 방금 올린 이미지의 참조도 반납한다.
+        if stored is not None:
+            await media_store.release(stored.url)
+        raise
 
-    return ReviewResponse.model_validate(review)
+    return review_serializer.response(review, status_code=201)
 
 
-@review_router.get("/{review_id}", status_code=200)
-async def get_review(review_id: int) -> ReviewResponse:
+@review_router.get("/is_liked")  # 여러 리뷰의 내 좋아요 여부. /{review_id} 보다 먼저 등록해야 한다.
+async def get_reviews_is_liked(
+    user: Annotated[User, Depends(get_current_user)],
+    review_ids: Annotated[list[int], Query(min_length=1, max_length=config.REVIEW_IS_LIKED_MAX_IDS)],
+) -> list[ReviewIsLikedResponse]:
+    # (user_id, review_id) 유니크 인덱스를 타는 IN 쿼리 한 번으로 모두 읽는다.
+    states = await like_buffer.liked_states(user.id, list(dict.fromkeys(review_ids)))
+    return [
+        ReviewIsLikedResponse(review_id=review_id, user_id=user.id, is_liked=is_liked)
+        for review_id, is_liked in states.items()
+    ]
+
+
+@review_router.get("/{review_id}", response_model=ReviewResponse, status_code=200)
+async def get_review(review_id: int) -> Response:
     if review := await Review.get_or_none(id=review_id):
-        return ReviewResponse.model_validate(review)
+        return review_serializer.response(review)
     raise HTTPException(status_code=404, detail="Review does not exist")
 
 
-@review_router.patch("/{review_id}")
+@review_router.patch("/{review_id}", response_model=ReviewResponse)
+@limited_by(upload_limiter)
 async def update_review(
     user: Annotated[User, Depends(get_current_user)],
     review_id: int,
     update_form: Annotated[UpdateReviewRequest, Depends(UpdateReviewRequest.as_form)],
-) -> ReviewResponse:
+) -> Response:
     if not (review := await Review.get_or_none(id=review_id)):
         raise HTTPException(status_code=404, detail="Review does not exist")
 
@@ -59,19 +89,18 @@ async def update_review(
     if review.user_id != user.id:  # type: ignore[attr-defined]
         raise HTTPException(status_code=403, detail="You are not the owner of the review")
 
-    review.title = UpdateReviewRequest.title if UpdateReviewRequest.title is not None else review.title
-    review.content = UpdateReviewRequest.content if UpdateReviewRequest.content is not None else review.content
-
-    if UpdateReviewRequest.review_image:
-        prev_image_url = review.review_image_url
-        review.review_image_url = await upload_file(UpdateReviewRequest.review_image, "reviews/images")
-
-        if prev_image_url is not None:
-            delete_file(prev_image_url)
-
-    await review.save()
+    values = {
+        "title": update_form.title if update_form.title is not None else review.title,
+        "content": update_form.content if update_form.content is not None else review.content,
+    }
+    if update_form.review_image:
+        # 글 수정과 이미지 교체를 한 번의 UPDATE 로 반영해, 이미지 저장이 실패하면 글도 바뀌지 않게 한다.
+        await file_upload_service.review_image_upload(review, update_form.review_image, extra_values=values)
+    else:
+        review.update_from_dict(values)
+        await review.save(update_fields=list(values))
 
-    return ReviewResponse.model_validate(review)
+    return review_serializer.response(review)
 
 
 @review_router.delete("/{review_id}", status_code=204)
@@ -82,18 +111,28 @@ async def delete_review(user: Annotated[User, Depends(get_current_user)], review
     if review.user_id != user.id:  # type: ignore[attr-defined]
         raise HTTPException(status_code=403, detail="You are not the owner of the review")
     await review.delete()
+    if review.review_image_url is not None:
+        await media_store.release(review.review_image_url)
 
 
 @review_router.get("/{review_id}/like_count")
 async def get_review_like_count(review_id: int) -> ReviewLikeCountResponse:
-    likes = await Review.filter(id=review_id).count()
-    return ReviewLikeCountResponse(review_id=review_id, like_count=likes)
+    # 좋아요마다 함께 갱신되는 like_count 를 기본 키로 한 행만 읽는다.
+    if (like_count := await Review.filter(id=review_id).first().values_list("like_count", flat=True)) is None:
+        raise HTTPException(status_code=404, detail="Review does not exist")
+    # 버퍼에 모여 아직 반영되지 않은 좋아요/취소도 더한다.
+    pending_delta = await like_buffer.pending_like_delta(review_id) if config.LIKE_BUFFER_ENABLED else 0
+    total = int(like_count) + pending_delta  # type: ignore[call-overload]
+    return ReviewLikeCountResponse(review_id=review_id, like_count=total)
 
 
 @review_router.get("/{review_id}/is_liked")
 async def get_review_is_liked(
     user: Annotated[User, Depends(get_current_user)], review_id: int = Path(gt=0)
 ) -> ReviewIsLikedResponse:
-    if review_like := await ReviewLike.get_or_none(id=review_id, user_id=user.id):
+    # 아직 반영되지 않은 자기 좋아요/취소가 있으면 그것을 돌려준다.
+    if (is_liked := like_buffer.pending_state(user.id, review_id)) is not None:
+        return ReviewIsLikedResponse(review_id=review_id, user_id=user.id, is_liked=is_liked)
+    if review_like := await ReviewLike.get_or_none(review_id=review_id, user_id=user.id):
         return ReviewIsLikedResponse(review_id=review_id, user_id=user.id, is_liked=review_like.is_liked)
     return ReviewIsLikedResponse(review_id=review_id, user_id=user.id, is_liked=False)
@@ -0,0 +1,64 @@
+from datetime import datetime
+from enum import StrEnum
+
+from pydantic import BaseModel, Field
+
+
+class ImageMetadata(BaseModel):
+    """원본을 받기 전에 자리를 잡고 흐린 미리보기를 그릴 수 있게 업로드 때 계산해 둔 값"""
+
+    width: int
+    height: int
+    size: int
+    # 최적화(메타데이터 제거, 재인코딩) 전 업로드 크기. 이전에 저장된 이미지에는 없다.
+    original_size: int | None = None
+    dominant_color: str
+    blurhash: str
+
+
+class MediaTarget(StrEnum):
+    MOVIE_POSTER = "movie_poster"
+    PROFILE_IMAGE = "profile_image"
+    REVIEW_IMAGE = "review_image"
+
+
+class DirectUploadRequest(BaseModel):
+    filename: str
+    size: int = Field(gt=0)
+
+
+class DirectUploadResponse(BaseModel):
+    upload_id: str
+    upload_url: str
+    method: str
+    headers: dict[str, str]
+    expires_in: int
+
+
+class MediaTargetRequest(BaseModel):
+    target: MediaTarget
+    # 프로필 이미지는 로그인한 유저에게 붙으므로 필요 없다.
+    target_id: int | None = None
+
+
+class CompleteDirectUploadRequest(MediaTargetRequest):
+    upload_id: str
+
+
+class CreateUploadSessionRequest(BaseModel):
+    filename: str
+    size: int = Field(gt=0)
+
+
+class UploadSessionResponse(BaseModel):
+    id: int
+    size: int
+    offset: int
+    chunk_size: int
+    expires_at: datetime
+
+
+class StoredMediaResponse(BaseModel):
+    url: str
+    variants: dict[str, str]
+    metadata: ImageMetadata | None = None
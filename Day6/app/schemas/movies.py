@@ -1,8 +1,12 @@
+from functools import lru_cache
 from typing import Annotated, Any, Dict, List
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, create_model
 
 from Day6.app.models.movies import GenreEnum
+from Day6.app.schemas.media import ImageMetadata
+from Day6.app.schemas.pagination import PaginationParams
+from Day6.app.utils.response import ResponseSerializer
 
 
 class CreateMovieRequest(BaseModel):
@@ -21,11 +25,35 @@ class MovieResponse(BaseModel):
     playtime: int
     genre: GenreEnum
     poster_image_url: str | None = None
+    poster_image_variants: Dict[str, str] | None = None
+    poster_image_metadata: ImageMetadata | None = None
 
     model_config = {"from_attributes": True}  # from_orm 대신
 
 
-class MovieSearchParams(BaseModel):
+class MoviePageResponse(BaseModel):
+    items: List[MovieResponse]
+    next_cursor: str | None = None
+
+
+movie_serializer = ResponseSerializer(MovieResponse)
+movie_page_serializer = ResponseSerializer(MoviePageResponse)
+
+MOVIE_RESPONSE_FIELDS = tuple(MovieResponse.model_fields)
+
+
+@lru_cache(maxsize=128)
+def movie_fields_response(fields: tuple[str, ...]) -> type[BaseModel]:
+    """fields= 로 요청한 필드만 가진 MovieResponse 축소 모델. 필드 조합마다 한 번만 만든다."""
+    field_definitions: dict[str, Any] = {
+        name: (MovieResponse.model_fields[name].annotation, MovieResponse.model_fields[name]) for name in fields
+    }
+    return create_model("MovieFieldsResponse", __config__=ConfigDict(from_attributes=True), **field_definitions)
+
+
+class MovieSearchParams(PaginationParams):
+    fields: str | None = None
+
     title: str | None = None
     genre: GenreEnum | None = None
     plot: str | None = None
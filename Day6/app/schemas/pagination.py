@@ -0,0 +1,8 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+
+class PaginationParams(BaseModel):
+    limit: Annotated[int, Field(ge=1, le=100)] = 20
+    cursor: str | None = None
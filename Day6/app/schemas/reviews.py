@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+from datetime import datetime
+from enum import Enum
+
 from fastapi import File, Form, UploadFile
 from pydantic import BaseModel
 
+from Day6.app.schemas.media import ImageMetadata
+from Day6.app.schemas.pagination import PaginationParams
+from Day6.app.utils.response import ResponseSerializer
+
 
 class ReviewResponse(BaseModel):
     id: int
@@ -11,6 +18,53 @@ class ReviewResponse(BaseModel):
     title: str
     content: str
     review_image_url: str | None = None
+    review_image_variants: dict[str, str] | None = None
+    review_image_metadata: ImageMetadata | None = None
+    like_count: int = 0
+
+
+review_serializer = ResponseSerializer(ReviewResponse)
+review_list_serializer = ResponseSerializer(list[ReviewResponse])
+
+
+class ReviewSort(str, Enum):
+    recent = "recent"
+    top = "top"
+
+
+class ReviewFeedParams(PaginationParams):
+    model_config = {"extra": "forbid"}
+
+    sort: ReviewSort = ReviewSort.recent
+
+
+class ReviewAuthorResponse(BaseModel):
+    id: int
+    username: str
+    profile_image_url: str | None = None
+
+
+class ReviewFeedItemResponse(BaseModel):
+    id: int
+    movie_id: int
+    title: str
+    content: str
+    review_image_url: str | None = None
+    review_image_variants: dict[str, str] | None = None
+    review_image_metadata: ImageMetadata | None = None
+    like_count: int
+    created_at: datetime
+    # 로그인하지 않은 요청이면 None
+    is_liked: bool | None = None
+    author: ReviewAuthorResponse
+
+
+class ReviewPageResponse(BaseModel):
+    items: list[ReviewFeedItemResponse]
+    next_cursor: str | None = None
+
+
+review_page_serializer = ResponseSerializer(ReviewPageResponse)
 
 
 class CreateReviewRequest(BaseModel):
@@ -2,6 +2,9 @@ from enum import Enum
 
 from pydantic import BaseModel
 
+from Day6.app.schemas.media import ImageMetadata
+from Day6.app.utils.response import ResponseSerializer
+
 
 class GenderName(str, Enum):
     male = "male"
@@ -35,10 +38,16 @@ class UserResponse(BaseModel):
     age: int
     gender: GenderName
     profile_image_url: str | None = None
+    profile_image_variants: dict[str, str] | None = None
+    profile_image_metadata: ImageMetadata | None = None
 
     model_config = {"from_attributes": True}  # from_orm 대신
 
 
+user_serializer = ResponseSerializer(UserResponse)
+user_list_serializer = ResponseSerializer(list[UserResponse])
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -1,55 +1,154 @@
 # app/services/file.py
 import os
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import Any, AsyncIterator
 
 from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from tortoise import Model
 
 from Day6.app.configs import config
 from Day6.app.models.movies import Movie
+from Day6.app.models.reviews import Review
+from Day6.app.models.uploads import UploadSession
 from Day6.app.models.users import User
+from Day6.app.schemas.media import MediaTarget
+from Day6.app.services.media import media_store
+from Day6.app.utils.auth import user_cache
 from Day6.app.utils.file import (
-    FileDoesNotExist,
-    FileExtensionError,
+    POSTER_IMAGE_DIR,
+    PROFILE_IMAGE_DIR,
+    REVIEW_IMAGE_DIR,
     delete_file,
-    upload_file,
-    validate_image_extension,
 )
+from Day6.app.utils.storage import storage
 
 
 class FileUploadService:
-    def __init__(self) -> None:
-        self.save_dir_path = config.MEDIA_DIR
+    @asynccontextmanager
+    async def _open_local_upload(self, file_url: str, size: int) -> AsyncIterator[UploadFile]:
+        f = await run_in_threadpool(open, os.path.join(config.MEDIA_DIR, file_url), "rb")
+        try:
+            yield UploadFile(file=f, filename=os.path.basename(file_url), size=size)
+        finally:
+            await run_in_threadpool(f.close)
+
+    @asynccontextmanager
+    async def open_staged_upload(self, upload_id: str) -> AsyncIterator[UploadFile]:
+        """클라이언트가 직접 올린 스테이징 파일을 저장소에서 가져와 UploadFile 로 연다. 끝나면 스테이징 파일을 지운다."""
+        if (size := await storage.size(upload_id)) is None:
+            raise HTTPException(status_code=404, detail="Upload not found")
 
-    async def _image_upload(self, file: UploadFile, upload_dir: str, prev_image_url: str | None = None) -> str:
-        """파일을 업로드하는 서비스 로직"""
         try:
-            validate_image_extension(file)
-            saved_path = await upload_file(file, os.path.join(self.save_dir_path, upload_dir))
-            file_url = os.path.relpath(saved_path, self.save_dir_path)
-        except FileExtensionError as e:
-            raise HTTPException(status_code=400, detail=str(e))
+            if size > config.MAX_UPLOAD_SIZE:
+                raise HTTPException(
+                    status_code=413, detail=f"file is too large. max size: {config.MAX_UPLOAD_SIZE} bytes"
+                )
+            await storage.fetch(upload_id, config.MAX_UPLOAD_SIZE)
+            async with self._open_local_upload(upload_id, size) as file:
+                yield file
+        finally:
+            await storage.delete_many([upload_id])
+            await run_in_threadpool(delete_file, upload_id)  # 원격 저장소라면 fetch 로 받은 로컬 사본
+
+    @asynccontextmanager
+    async def open_session_upload(self, session: UploadSession) -> AsyncIterator[UploadFile]:
+        """다 받은 이어 올리기 세션의 스테이징 파일(로컬)을 UploadFile 로 연다. 끝나면 세션과 스테이징 파일을 지운다."""
+        try:
+            async with self._open_local_upload(session.path, session.size) as file:
+                yield file
+        finally:
+            await UploadSession.filter(id=session.id).delete()
+            await run_in_threadpool(delete_file, session.path)
+
+    async def attach_upload(
+        self,
+        user: User,
+        target: MediaTarget,
+        target_id: int | None,
+        upload: AbstractAsyncContextManager[UploadFile],
+    ) -> Movie | User | Review:
+        """업로드를 대상(영화 포스터, 내 프로필 이미지, 내 리뷰 이미지)에 붙인다. 대상을 확인한 뒤에 업로드를 연다."""
+        if target == MediaTarget.PROFILE_IMAGE:
+            async with upload as file:
+                return await self.user_profile_image_upload(user, file)
+
+        if target == MediaTarget.MOVIE_POSTER:
+            if not (movie := await Movie.get_or_none(id=target_id)):
+                raise HTTPException(status_code=404, detail="Movie not found")
+            async with upload as file:
+                return await self.movie_poster_image_upload(movie, file)
+
+        if not (review := await Review.get_or_none(id=target_id)):
+            raise HTTPException(status_code=404, detail="Review does not exist")
+        if review.user_id != user.id:  # type: ignore[attr-defined]
+            raise HTTPException(status_code=403, detail="You are not the owner of the review")
+        async with upload as file:
+            return await self.review_image_upload(review, file)
+
+    async def _replace_image(
+        self, instance: Model, field: str, file: UploadFile, upload_dir: str, extra_values: dict[str, Any] | None = None
+    ) -> None:
+        """새 이미지를 저장소에 올려 `{field}_url`/`_variants`/`_metadata` 를 바꾸고, 저장이 끝난 뒤 이전 이미지의 참조를 반납한다.
+
+        저장하는 사이 다른 요청이 먼저 이미지를 바꿨다면 이 업로드는 반영하지 않고 409 를 낸다.
+        이전 이미지의 참조는 그것을 실제로 바꾼 요청만 반납한다.
+        extra_values 는 이미지 교체와 같은 UPDATE 로 함께 반영해, 둘 중 하나만 반영되는 일이 없게 한다.
+        """
+        url_field, variants_field, metadata_field = f"{field}_url", f"{field}_variants", f"{field}_metadata"
+        prev_image_url: str | None = getattr(instance, url_field)
+        try:
+            stored = await media_store.save(file, upload_dir)
+        except HTTPException:
+            raise
         except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+            raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
+        values: dict[str, Any] = {
+            **(extra_values or {}),
+            url_field: stored.url,
+            variants_field: stored.variants,
+            metadata_field: stored.metadata,
+        }
+        model = type(instance)
         try:
-            if prev_image_url:
-                delete_file(os.path.join(self.save_dir_path, prev_image_url))
-        except FileDoesNotExist:
-            return file_url
+            # 읽어 둔 이전 이미지를 아직 가리킬 때만 바꾼다.
+            changed = await model.filter(id=instance.pk, **{url_field: prev_image_url}).update(**values)
+            # MySQL 은 값이 그대로인 행을 바뀐 행 수에 세지 않으므로, 같은 이미지를 다시 올린 경우는 따로 확인한다.
+            if not changed and stored.url == prev_image_url:
+                changed = await model.filter(id=instance.pk, **{url_field: stored.url}).count()
+        except Exception as e:
+            await media_store.release(stored.url)
+            raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
-        return saved_path
+        if not changed:
+            await media_store.release(stored.url)
+            raise HTTPException(status_code=409, detail="The image was changed by another request")
+
+        for name, value in values.items():
+            setattr(instance, name, value)
+        if prev_image_url is not None:
+            await media_store.release(prev_image_url)
 
     async def user_profile_image_upload(self, user: User, file: UploadFile) -> User:
-        upload_dir = "users/profile_images"
-        saved_image_url = await self._image_upload(file, upload_dir, user.profile_image_url)
-        user.profile_image_url = saved_image_url
-        await user.save()
+        try:
+            await self._replace_image(user, "profile_image", file, PROFILE_IMAGE_DIR)
+        finally:
+            user_cache.invalidate(user.id)
 
         return user
 
     async def movie_poster_image_upload(self, movie: Movie, file: UploadFile) -> Movie:
-        upload_dir = "movies/poster_images"
-        saved_image_url = await self._image_upload(file, upload_dir, movie.poster_image_url)
-        movie.poster_image_url = saved_image_url
-        await movie.save()
+        await self._replace_image(movie, "poster_image", file, POSTER_IMAGE_DIR)
 
         return movie
+
+    async def review_image_upload(
+        self, review: Review, file: UploadFile, extra_values: dict[str, Any] | None = None
+    ) -> Review:
+        await self._replace_image(review, "review_image", file, REVIEW_IMAGE_DIR, extra_values)
+
+        return review
+
+
+file_upload_service = FileUploadService()
@@ -0,0 +1,43 @@
+# app/services/image.py
+from typing import Any
+
+from Day6.app.configs import config
+from Day6.app.utils.concurrency import ProcessPoolRunner
+from Day6.app.utils.image import process_image
+
+
+class ImageVariantService:
+    """업로드된 이미지를 최적화하고 썸네일/중간 크기/WebP 변형과 메타데이터(크기, 대표색, blurhash)를 프로세스 풀에서 만드는 서비스"""
+
+    def __init__(self, max_workers: int, max_concurrency: int, max_queue: int) -> None:
+        self._runner = ProcessPoolRunner("image processor", max_workers, max_concurrency, max_queue)
+        self.generated = 0
+        # 최적화 전(업로드)과 후(저장) 원본 크기의 누적 합
+        self.bytes_before = 0
+        self.bytes_after = 0
+
+    async def generate(self, path: str) -> tuple[dict[str, str], dict[str, Any]]:
+        variants, metadata = await self._runner.run(process_image, config.MEDIA_DIR, path)
+        self.generated += 1
+        self.bytes_before += metadata["original_size"]
+        self.bytes_after += metadata["size"]
+        return variants, metadata
+
+    def shutdown(self) -> None:
+        self._runner.shutdown()
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "generated": self.generated,
+            "bytes_before": self.bytes_before,
+            "bytes_after": self.bytes_after,
+            "bytes_saved": self.bytes_before - self.bytes_after,
+            **self._runner.stats(),
+        }
+
+
+image_variant_service = ImageVariantService(
+    max_workers=config.IMAGE_VARIANT_WORKERS,
+    max_concurrency=config.IMAGE_VARIANT_MAX_CONCURRENCY,
+    max_queue=config.IMAGE_VARIANT_MAX_QUEUE,
+)
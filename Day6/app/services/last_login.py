@@ -0,0 +1,92 @@
+# app/services/last_login.py
+import asyncio
+import logging
+from datetime import datetime
+
+from Day6.app.configs import config
+from Day6.app.models.users import User
+from Day6.app.utils.periodic import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginBuffer:
+    """로그인 시각을 메모리에 모아두었다가 주기적으로 한 번의 UPDATE 로 반영하는 write-behind 버퍼
+
+    flush 는 한 번에 하나만 돈다. 반영하지 못한 항목은 max_buffered 개까지만 들고 있고, 넘으면 가장 오래된 것부터 버린다.
+    """
+
+    def __init__(self, flush_interval: float, batch_size: int, max_pending: int, max_buffered: int) -> None:
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.max_buffered = max_buffered
+        self.flushed = 0
+        self.dropped = 0
+        # 오래된 기록이 앞에 오도록 유지한다.
+        self._pending: dict[int, datetime] = {}
+        self._lock = asyncio.Lock()
+        self._flush_task: asyncio.Task[None] | None = None
+        self._periodic = PeriodicTask("last_login_flush", flush_interval, self.flush)
+
+    def record(self, user_id: int, logged_in_at: datetime) -> None:
+        # 같은 유저가 여러 번 로그인하면 마지막 시각만 남는다.
+        self._pending.pop(user_id, None)
+        self._pending[user_id] = logged_in_at
+        self._trim()
+
+        if len(self._pending) >= self.max_pending and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_in_background())
+
+    async def _flush_in_background(self) -> None:
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("failed to flush last_login")
+
+    def _trim(self) -> None:
+        while len(self._pending) > self.max_buffered:
+            del self._pending[next(iter(self._pending))]
+            self.dropped += 1
+
+    async def flush(self) -> int:
+        # 주기적 flush, max_pending 에 닿아 띄운 flush, 종료 시 flush 가 겹치지 않게 한다.
+        async with self._lock:
+            if not self._pending:
+                return 0
+
+            pending, self._pending = self._pending, {}
+            users = [User(id=user_id, last_login=logged_in_at) for user_id, logged_in_at in pending.items()]
+            try:
+                await User.bulk_update(users, fields=["last_login"], batch_size=self.batch_size)
+            except BaseException:
+                # 실패하거나 취소(종료, 타임아웃)된 값은 되돌려 다음 주기에 재시도한다. 그 사이 들어온 더 최신 값은 유지한다.
+                self._pending = {**{k: v for k, v in pending.items() if k not in self._pending}, **self._pending}
+                self._trim()
+                raise
+
+            self.flushed += len(users)
+            return len(users)
+
+    def start(self) -> None:
+        self._periodic.start()
+
+    async def stop(self) -> None:
+        await self._periodic.stop()
+        # record() 가 띄운 flush 가 끝나기를 기다린 뒤 남은 것을 반영한다.
+        if self._flush_task is not None:
+            await self._flush_task
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("failed to flush last_login on shutdown")
+
+    def stats(self) -> dict[str, int]:
+        return {"pending": len(self._pending), "flushed": self.flushed, "dropped": self.dropped}
+
+
+last_login_buffer = LastLoginBuffer(
+    flush_interval=config.LAST_LOGIN_FLUSH_INTERVAL_SECONDS,
+    batch_size=config.LAST_LOGIN_FLUSH_BATCH_SIZE,
+    max_pending=config.LAST_LOGIN_MAX_PENDING,
+    max_buffered=config.LAST_LOGIN_MAX_BUFFERED,
+)
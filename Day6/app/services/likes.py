@@ -0,0 +1,275 @@
+# app/services/likes.py
+import asyncio
+import logging
+from collections import Counter
+
+from tortoise import timezone
+from tortoise.expressions import F
+from tortoise.functions import Count
+from tortoise.transactions import in_transaction
+
+from Day6.app.configs import config
+from Day6.app.models.likes import ReviewLike
+from Day6.app.models.reviews import Review
+from Day6.app.models.users import User
+from Day6.app.utils.periodic import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+
+# (user_id, review_id) 유니크 키로 좋아요 행을 한 문장에 넣거나 켠다. 바뀐 행 수가 0 이면 이미 좋아요 상태였다는 뜻이다.
+# MySQL 의 ON DUPLICATE KEY UPDATE 는 삽입이면 1, 값이 바뀌면 2, 그대로면 0 을 돌려주고,
+# SQLite/PostgreSQL 은 상태가 바뀔 때만 UPDATE 하도록 WHERE 를 붙여 같은 의미가 되게 한다.
+LIKE_UPSERT_SQL = {
+    "mysql": (
+        "INSERT INTO review_likes (user_id, review_id, is_liked, created_at) VALUES (%s, %s, TRUE, %s) "
+        "ON DUPLICATE KEY UPDATE is_liked = TRUE"
+    ),
+    "sqlite": (
+        "INSERT INTO review_likes (user_id, review_id, is_liked, created_at) VALUES (?, ?, TRUE, ?) "
+        "ON CONFLICT (user_id, review_id) DO UPDATE SET is_liked = TRUE WHERE review_likes.is_liked = FALSE"
+    ),
+    "postgres": (
+        "INSERT INTO review_likes (user_id, review_id, is_liked, created_at) VALUES ($1, $2, TRUE, $3) "
+        "ON CONFLICT (user_id, review_id) DO UPDATE SET is_liked = TRUE WHERE review_likes.is_liked = FALSE"
+    ),
+}
+
+
+class ReviewLikeService:
+    """좋아요 상태와 Review.like_count 를 한 트랜잭션에서 함께 바꾼다.
+
+    좋아요/취소는 각각 한 문장(업서트, 조건부 UPDATE)이라 동시에 여러 번 눌러도 경합이 없고,
+    상태를 실제로 바꾼 요청만 바뀐 행 수로 알아내 카운터를 움직인다.
+    """
+
+    async def like(self, user_id: int, review_id: int) -> bool:
+        async with in_transaction() as connection:
+            sql = LIKE_UPSERT_SQL[connection.capabilities.dialect]
+            changed, _ = await connection.execute_query(sql, [user_id, review_id, timezone.now()])
+            if changed:
+                await Review.filter(id=review_id).using_db(connection).update(like_count=F("like_count") + 1)
+        return bool(changed)
+
+    async def unlike(self, user_id: int, review_id: int) -> bool:
+        # 좋아요한 적이 없으면 행을 만들 필요가 없으므로 업서트 대신 조건부 UPDATE 한 문장으로 끈다.
+        async with in_transaction() as connection:
+            changed = await (
+                ReviewLike.filter(user_id=user_id, review_id=review_id, is_liked=True)
+                .using_db(connection)
+                .update(is_liked=False)
+            )
+            if changed:
+                await Review.filter(id=review_id).using_db(connection).update(like_count=F("like_count") - 1)
+        return bool(changed)
+
+
+class LikeBuffer:
+    """좋아요/취소를 (user_id, review_id) 별 마지막 상태로 메모리에 모았다가 주기적으로 한 번에 반영하는 write-behind 버퍼.
+
+    토글 폭주가 와도 flush 마다 배치당 여러 행 업서트 한 번과 리뷰별 카운터 UPDATE 한 번만 나간다.
+    flush 는 프로세스 안에서 한 번에 하나만 돌고, 행 잠금은 (user_id, review_id) 순서로 잡아 교착 가능성을 줄인다.
+    """
+
+    def __init__(self, flush_interval: float, batch_size: int, max_pending: int) -> None:
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.recorded = 0
+        self.flushed = 0
+        self._pending: dict[tuple[int, int], bool] = {}
+        # flush 중이라 커밋되기 전인 상태. 커밋될 때까지 조회는 이 값을 본다.
+        self._flushing: dict[tuple[int, int], bool] = {}
+        self._lock = asyncio.Lock()
+        self._flush_task: asyncio.Task[None] | None = None
+        self._periodic = PeriodicTask("like_flush", flush_interval, self.flush)
+
+    def record(self, user_id: int, review_id: int, is_liked: bool) -> None:
+        # 같은 유저가 여러 번 누르면 마지막 상태만 남는다.
+        self._pending[(user_id, review_id)] = is_liked
+        self.recorded += 1
+
+        if len(self._pending) >= self.max_pending and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_in_background())
+
+    def pending_state(self, user_id: int, review_id: int) -> bool | None:
+        """아직 반영되지 않은(flush 중인 것 포함) 상태. 조회 시 DB 값보다 우선해 자기가 누른 결과를 바로 보게 한다."""
+        key = (user_id, review_id)
+        return self._pending.get(key, self._flushing.get(key))
+
+    async def liked_states(self, user_id: int, review_ids: list[int]) -> dict[int, bool]:
+        """여러 리뷰의 좋아요 여부를 IN 쿼리 한 번으로 읽고, 아직 반영되지 않은 상태를 덮어쓴다."""
+        rows = await ReviewLike.filter(user_id=user_id, review_id__in=review_ids).values_list("review_id", "is_liked")
+        stored = {int(review_id): bool(is_liked) for review_id, is_liked in rows}
+        states = {}
+        for review_id in review_ids:
+            if (is_liked := self.pending_state(user_id, review_id)) is None:
+                is_liked = stored.get(review_id, False)
+            states[review_id] = is_liked
+        return states
+
+    async def pending_like_delta(self, review_id: int) -> int:
+        """아직 반영되지 않은 상태가 review_id 의 like_count 를 얼마나 바꿀지. 저장된 상태와 다른 것만 센다.
+
+        버퍼 크기는 max_pending 으로 묶여 있어 전부 훑는다. flush 가 커밋되는 순간과 겹치면 한 주기 늦은 값일 수 있다.
+        """
+        states = {
+            user_id: is_liked
+            for (user_id, pending_review_id), is_liked in {**self._flushing, **self._pending}.items()
+            if pending_review_id == review_id
+        }
+        if not states:
+            return 0
+        rows = await ReviewLike.filter(review_id=review_id, user_id__in=list(states)).values_list("user_id", "is_liked")
+        stored = {int(user_id): bool(is_liked) for user_id, is_liked in rows}
+        return sum(
+            (1 if is_liked else -1) for user_id, is_liked in states.items() if is_liked != stored.get(user_id, False)
+        )
+
+    async def _flush_in_background(self) -> None:
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("failed to flush review likes")
+
+    async def _flush_batch(self, items: list[tuple[tuple[int, int], bool]]) -> None:
+        user_ids = {user_id for (user_id, _), _ in items}
+        review_ids = {review_id for (_, review_id), _ in items}
+        async with in_transaction() as connection:
+            # 그 사이 지워진 리뷰/유저의 상태는 버린다. 남겨 두면 FK 오류로 매번 배치 전체가 실패한다.
+            alive_reviews = {
+                review.id for review in await Review.filter(id__in=review_ids).only("id").using_db(connection)
+            }
+            alive_users = {user.id for user in await User.filter(id__in=user_ids).only("id").using_db(connection)}
+            current = {
+                (like.user_id, like.review_id): like.is_liked  # type: ignore[attr-defined]
+                for like in await ReviewLike.filter(user_id__in=user_ids, review_id__in=review_ids)
+                .order_by("user_id", "review_id")
+                .select_for_update()
+                .using_db(connection)
+            }
+            changed = [
+                (user_id, review_id, is_liked)
+                for (user_id, review_id), is_liked in items
+                if user_id in alive_users
+                and review_id in alive_reviews
+                and current.get((user_id, review_id), False) != is_liked
+            ]
+            if not changed:
+                return
+
+            await ReviewLike.bulk_create(
+                [
+                    ReviewLike(user_id=user_id, review_id=review_id, is_liked=is_liked)
+                    for user_id, review_id, is_liked in changed
+                ],
+                on_conflict=("user_id", "review_id"),
+                update_fields=("is_liked",),
+                using_db=connection,
+            )
+            deltas: Counter[int] = Counter()
+            for _, review_id, is_liked in changed:
+                deltas[review_id] += 1 if is_liked else -1
+            for review_id, delta in sorted(deltas.items()):
+                if delta:
+                    await Review.filter(id=review_id).using_db(connection).update(like_count=F("like_count") + delta)
+
+    async def flush(self) -> int:
+        # 주기적 flush, max_pending 에 닿아 띄운 flush, 종료 시 flush 가 겹치지 않게 한다.
+        async with self._lock:
+            if not self._pending:
+                return 0
+
+            self._flushing, self._pending = self._pending, {}
+            items = sorted(self._flushing.items())
+            try:
+                for i in range(0, len(items), self.batch_size):
+                    batch = items[i : i + self.batch_size]
+                    await self._flush_batch(batch)
+                    for key, _ in batch:
+                        del self._flushing[key]
+            except BaseException:
+                # 실패하거나 취소(종료, 타임아웃)된 상태는 되돌려 다음 주기에 재시도한다(이미 반영된 배치는 상태가 같아 다시 쓰지 않는다).
+                # 그 사이 들어온 더 최신 상태는 유지한다.
+                for key, is_liked in self._flushing.items():
+                    self._pending.setdefault(key, is_liked)
+                raise
+            finally:
+                self._flushing = {}
+
+            self.flushed += len(items)
+            return len(items)
+
+    def start(self) -> None:
+        self._periodic.start()
+
+    async def stop(self) -> None:
+        await self._periodic.stop()
+        # record() 가 띄운 flush 가 끝나기를 기다린 뒤 남은 것을 반영한다.
+        if self._flush_task is not None:
+            await self._flush_task
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("failed to flush review likes on shutdown")
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "flushing": len(self._flushing),
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+        }
+
+
+class LikeCountReconciler:
+    """Review.like_count 를 review_likes 의 실제 개수와 비교해 어긋난 행을 고치는 주기적 작업"""
+
+    def __init__(self, interval: float, batch_size: int) -> None:
+        self.batch_size = batch_size
+        self.repaired = 0
+        self._periodic = PeriodicTask("like_count_reconcile", interval, self.reconcile)
+
+    async def reconcile(self) -> int:
+        repaired = 0
+        last_id = 0
+        while rows := await (
+            Review.filter(id__gt=last_id).order_by("id").limit(self.batch_size).values_list("id", "like_count")
+        ):
+            ids = [review_id for review_id, _ in rows]
+            actual: dict[int, int] = dict(
+                await ReviewLike.filter(review_id__in=ids, is_liked=True)
+                .annotate(count=Count("id"))
+                .group_by("review_id")
+                .values_list("review_id", "count")
+            )
+            for review_id, like_count in rows:
+                if (count := actual.get(review_id, 0)) != like_count:
+                    # 센 뒤에 좋아요가 바뀌었다면 like_count 도 바뀌었으므로 덮어쓰지 않고 다음 주기에 다시 본다.
+                    repaired += await Review.filter(id=review_id, like_count=like_count).update(like_count=count)
+            last_id = rows[-1][0]
+
+        if repaired:
+            logger.warning("repaired like_count of %d reviews", repaired)
+        self.repaired += repaired
+        return repaired
+
+    def start(self) -> None:
+        self._periodic.start()
+
+    async def stop(self) -> None:
+        await self._periodic.stop()
+
+    def stats(self) -> dict[str, int]:
+        return {"repaired": self.repaired}
+
+
+review_like_service = ReviewLikeService()
+like_buffer = LikeBuffer(
+    flush_interval=config.LIKE_FLUSH_INTERVAL_SECONDS,
+    batch_size=config.LIKE_FLUSH_BATCH_SIZE,
+    max_pending=config.LIKE_MAX_PENDING,
+)
+like_count_reconciler = LikeCountReconciler(
+    interval=config.LIKE_COUNT_RECONCILE_INTERVAL_SECONDS,
+    batch_size=config.LIKE_COUNT_RECONCILE_BATCH_SIZE,
+)
@@ -0,0 +1,136 @@
+# app/services/media.py
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from PIL import Image, UnidentifiedImageError
+from tortoise import timezone
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import F
+
+from Day6.app.models.media import MediaBlob
+from Day6.app.services.image import image_variant_service
+from Day6.app.services.media_gc import media_gc
+from Day6.app.utils.file import (
+    delete_file,
+    hash_upload,
+    media_cache,
+    media_cache_key,
+    shard_path,
+    upload_file,
+    validate_image_content,
+    validate_image_extension,
+)
+from Day6.app.utils.http_cache import content_sha256
+from Day6.app.utils.image import image_variant_paths
+from Day6.app.utils.storage import storage
+
+
+@dataclass(frozen=True)
+class StoredMedia:
+    url: str
+    variants: dict[str, str] = field(default_factory=dict)
+    metadata: dict[str, Any] | None = None
+
+
+class MediaStore:
+    """sha256 으로 주소를 정하는 중복 제거 미디어 저장소.
+
+    같은 내용은 `{upload_dir}/{xx}/{yy}/{sha256}.{ext}` 한 파일(과 그 변형들)만 디스크에 두고, 참조 수(ref_count)로 수명을 관리한다.
+    이미 있는 내용을 다시 올리면 파일 쓰기와 이미지 변환 없이 참조 수만 올린다.
+    sha256 은 업로드한 내용의 해시이고, 저장되는 파일은 그 내용을 최적화(재인코딩)한 결과다.
+    """
+
+    def __init__(self) -> None:
+        self.written = 0
+        self.deduplicated = 0
+
+    async def _write(self, file: UploadFile, upload_dir: str, filename: str) -> tuple[dict[str, str], dict[str, Any]]:
+        path = (await upload_file(file, upload_dir, filename=filename)).url
+        self.written += 1
+        try:
+            variants, metadata = await image_variant_service.generate(path)
+        except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+            await run_in_threadpool(delete_file, path)
+            raise HTTPException(status_code=400, detail="invalid image file")
+
+        # 워커가 원본을 최적화해 덮어썼을 수 있다.
+        media_cache.invalidate(media_cache_key(path))
+        # 변환은 로컬 파일로 하고, 결과물(원본 + 변형)을 저장소로 넘긴다.
+        await storage.persist([path, *variants.values()])
+        return variants, metadata
+
+    async def save(self, file: UploadFile, upload_dir: str) -> StoredMedia:
+        ext = validate_image_extension(file)
+        # 해시 계산이나 디스크 쓰기 전에 앞부분만 읽어 이미지가 아닌 업로드를 걸러낸다.
+        await validate_image_content(file, ext)
+        sha256, size = await hash_upload(file)
+        filename = f"{sha256}.{ext}"
+        path = shard_path(upload_dir, filename)
+
+        # 이미 저장된 내용이면 참조 수만 올린다. 행은 있는데 파일이 사라졌거나 메타데이터가 없는(이전에 저장된) 경우,
+        # 또는 새 내용이면 파일과 변형, 메타데이터를 만든다.
+        blob = await self._acquire(path, sha256, size)
+        if blob is not None and blob.metadata is not None and await storage.exists(path):
+            self.deduplicated += 1
+            return StoredMedia(url=path, variants=blob.variants or {}, metadata=blob.metadata)
+
+        try:
+            variants, metadata = await self._write(file, upload_dir, filename)
+        except Exception:
+            # 위에서 올린 참조를 돌려준다. 마지막 참조였다면 쓰다 만 원본과 변형은 GC 큐로 간다.
+            await self.release(path)
+            raise
+        await MediaBlob.filter(path=path).update(variants=variants, metadata=metadata)
+        return StoredMedia(url=path, variants=variants, metadata=metadata)
+
+    async def _acquire(self, path: str, sha256: str, size: int) -> MediaBlob | None:
+        """파일을 쓰기 전에 path 의 참조를 잡는다. 기존 행이면 참조 수를 올려 그 행을, 새로 만들었으면 None 을 돌려준다.
+
+        GC flush 는 행이 있는 경로를 지우지 않으므로, 같은 내용이 방금 반납되어 삭제 큐에 있더라도 쓰는 중인 파일은 지워지지 않는다.
+        """
+        blob = await MediaBlob.get_or_none(path=path)
+        # 그 사이 마지막 참조가 반납되어 행이 지워졌다면 새로 만든다.
+        if blob is not None and await MediaBlob.filter(id=blob.id).update(
+            ref_count=F("ref_count") + 1, referenced_at=timezone.now()
+        ):
+            return blob
+
+        try:
+            await MediaBlob.create(path=path, sha256=sha256, size=size, ref_count=1)
+        except IntegrityError:
+            # 같은 내용이 동시에 올라와 다른 요청이 먼저 행을 만든 경우. 그 요청이 아직 쓰는 중일 수 있어 파일은 직접 쓴다.
+            await MediaBlob.filter(path=path).update(ref_count=F("ref_count") + 1, referenced_at=timezone.now())
+        return None
+
+    async def release(self, path: str) -> None:
+        """참조를 하나 반납하고, 더 이상 참조가 없으면 행을 지우고 파일(변형 포함)은 GC 큐에 넘긴다."""
+        if not await MediaBlob.filter(path=path).update(ref_count=F("ref_count") - 1):
+            # 중복 제거 이전에 uuid 이름으로 저장된 파일은 참조 수가 없으므로 바로 큐에 넣는다.
+            media_gc.enqueue(path)
+            return
+
+        if not (blob := await MediaBlob.get_or_none(path=path, ref_count__lte=0)):
+            return
+        # 그 사이 다른 요청이 참조를 올렸다면 조건에 걸리지 않아 지워지지 않는다.
+        if await MediaBlob.filter(id=blob.id, ref_count__lte=0).delete():
+            # 변형을 만들다 실패한 행은 variants 가 비어 있으므로, 만들어졌을 수 있는 변형 경로를 함께 넘긴다.
+            media_gc.enqueue(path, *(blob.variants or image_variant_paths(path)).values())
+
+    async def is_settled(self, file_url: str) -> bool:
+        """내용 주소 파일의 저장(최적화, 변형 생성)이 끝나 더 이상 바이트가 바뀌지 않는지 확인한다.
+
+        원본과 변형은 같은 디렉터리의 `{sha256}.{ext}` 행을 따르고, 저장이 끝나야 그 행에 메타데이터가 채워진다.
+        """
+        if (sha256 := content_sha256(file_url)) is None:
+            return False
+        prefix = f"{os.path.dirname(file_url)}/{sha256}."
+        return await MediaBlob.filter(sha256=sha256, path__startswith=prefix, metadata__isnull=False).exists()
+
+    def stats(self) -> dict[str, int]:
+        return {"written": self.written, "deduplicated": self.deduplicated}
+
+
+media_store = MediaStore()
@@ -0,0 +1,154 @@
+# app/services/media_gc.py
+import logging
+from datetime import timedelta
+
+from tortoise import Model, timezone
+
+from Day6.app.configs import config
+from Day6.app.models.media import MediaBlob
+from Day6.app.models.movies import Movie
+from Day6.app.models.reviews import Review
+from Day6.app.models.uploads import UploadSession
+from Day6.app.models.users import User
+from Day6.app.utils.file import MEDIA_UPLOAD_DIRS, STAGING_DIR
+from Day6.app.utils.http_cache import content_sha256
+from Day6.app.utils.image import image_variant_paths
+from Day6.app.utils.periodic import PeriodicTask
+from Day6.app.utils.storage import storage
+
+logger = logging.getLogger(__name__)
+
+# 미디어를 참조하는 (모델, 필드 접두사). `{prefix}_url`, `{prefix}_variants` 컬럼을 본다.
+MEDIA_REFERENCES: tuple[tuple[type[Model], str], ...] = (
+    (Movie, "poster_image"),
+    (User, "profile_image"),
+    (Review, "review_image"),
+)
+
+
+class MediaGarbageCollector:
+    """미디어 파일 삭제를 요청 경로 밖으로 옮기는 큐와, 참조가 끊긴 파일을 회수하는 주기적 스윕"""
+
+    def __init__(self, flush_interval: float, sweep_interval: float, grace_seconds: float, batch_size: int) -> None:
+        self.grace_seconds = grace_seconds
+        self.batch_size = batch_size
+        self.deleted = 0
+        self.swept = 0
+        # 원본 경로 -> 함께 지울 파일들(원본 + 변형)
+        self._pending: dict[str, tuple[str, ...]] = {}
+        self._flush_periodic = PeriodicTask("media_gc_flush", flush_interval, self.flush)
+        self._sweep_periodic = PeriodicTask("media_gc_sweep", sweep_interval, self.sweep)
+
+    def enqueue(self, path: str, *variant_paths: str) -> None:
+        self._pending[path] = (path, *variant_paths)
+
+    async def flush(self) -> int:
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        # 큐에 들어간 뒤 같은 내용이 다시 올라와 행이 새로 생겼다면 지우지 않는다.
+        paths = list(pending)
+        try:
+            for i in range(0, len(paths), self.batch_size):
+                revived = await MediaBlob.filter(path__in=paths[i : i + self.batch_size]).values_list("path", flat=True)
+                for revived_path in revived:
+                    pending.pop(str(revived_path), None)
+        except Exception:
+            # 확인하지 못한 항목은 되돌려 다음 주기에 재시도한다.
+            for pending_path, files in pending.items():
+                self._pending.setdefault(pending_path, files)
+            raise
+
+        deleted = await storage.delete_many([file for files in pending.values() for file in files])
+        self.deleted += deleted
+        return deleted
+
+    async def _model_referenced(self, paths: list[str]) -> set[str]:
+        """paths 중 모델의 이미지 컬럼이 가리키는 경로"""
+        referenced: set[str] = set()
+        for model, prefix in MEDIA_REFERENCES:
+            url_field = f"{prefix}_url"
+            urls = await model.filter(**{f"{url_field}__in": paths}).values_list(url_field, flat=True)
+            referenced.update(str(url) for url in urls)
+        return referenced
+
+    async def _referenced_files(self, paths: list[str]) -> set[str]:
+        """paths 중 모델, 살아 있는 blob(원본과 변형), 아직 받는 중인 이어 올리기 세션이 가리키는 경로"""
+        referenced = await self._model_referenced(paths)
+        # 변형은 같은 sha256 의 blob 이 있는 동안 함께 남긴다.
+        if sha256s := {sha256 for path in paths if (sha256 := content_sha256(path))}:
+            for blob_path, variants in await MediaBlob.filter(sha256__in=list(sha256s)).values_list("path", "variants"):
+                referenced.update((str(blob_path), *(variants or image_variant_paths(str(blob_path))).values()))
+        sessions = await UploadSession.filter(path__in=paths, expires_at__gt=timezone.now()).values_list(
+            "path", flat=True
+        )
+        referenced.update(str(path) for path in sessions)
+        return referenced
+
+    async def sweep(self) -> int:
+        """참조가 없는 blob 행과 디스크의 고아 파일을 회수한다. 유예 기간 안에 만들어진 것은 업로드 중일 수 있어 건드리지 않는다.
+
+        전체 참조 경로를 메모리에 모으지 않고, blob 과 후보 파일을 batch_size 씩 읽어 IN 쿼리로 참조 여부를 확인한다.
+        """
+        # 만료된 이어 올리기 세션을 지우면 그 스테이징 파일은 아래 2) 에서 회수된다.
+        await UploadSession.filter(expires_at__lte=timezone.now()).delete()
+        cutoff = timezone.now() - timedelta(seconds=self.grace_seconds)
+        swept = 0
+
+        # 1) 어떤 모델도 가리키지 않는 blob 행 (예: 유저 삭제로 CASCADE 된 리뷰의 이미지)
+        last_id = 0
+        while blobs := await (
+            MediaBlob.filter(id__gt=last_id).order_by("id").limit(self.batch_size).values_list("id", "path", "variants")
+        ):
+            referenced = await self._model_referenced([path for _, path, _ in blobs])
+            orphans = [(blob_id, path, variants or {}) for blob_id, path, variants in blobs if path not in referenced]
+            if orphans:
+                await MediaBlob.filter(id__in=[blob_id for blob_id, _, _ in orphans], referenced_at__lt=cutoff).delete()
+                alive = set(
+                    await MediaBlob.filter(id__in=[blob_id for blob_id, _, _ in orphans]).values_list("path", flat=True)
+                )
+                for _, path, variants in orphans:
+                    if path not in alive:
+                        self.enqueue(path, *variants.values())
+                        swept += 1
+            last_id = blobs[-1][0]
+
+        # 2) 행도 참조도 없는 디스크의 파일 (중복 제거 이전 파일, 쓰다 만 임시 파일 등)
+        queued = {file for files in self._pending.values() for file in files}
+        modified_before = cutoff.timestamp()
+        # 완료 처리되지 않은 직접 업로드(STAGING_DIR)는 아무도 참조하지 않으므로 유예 기간이 지나면 지워진다.
+        for upload_dir in (*MEDIA_UPLOAD_DIRS, STAGING_DIR):
+            async for candidates in storage.iter_stale(upload_dir, modified_before, self.batch_size):
+                referenced = await self._referenced_files(candidates)
+                for file_url in candidates:
+                    if file_url not in referenced and file_url not in queued:
+                        self.enqueue(file_url)
+                        swept += 1
+
+        await self.flush()
+        self.swept += swept
+        return swept
+
+    def start(self) -> None:
+        self._flush_periodic.start()
+        self._sweep_periodic.start()
+
+    async def stop(self) -> None:
+        await self._sweep_periodic.stop()
+        await self._flush_periodic.stop()
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("failed to flush media gc queue on shutdown")
+
+    def stats(self) -> dict[str, int]:
+        return {"pending": len(self._pending), "deleted": self.deleted, "swept": self.swept}
+
+
+media_gc = MediaGarbageCollector(
+    flush_interval=config.MEDIA_GC_FLUSH_INTERVAL_SECONDS,
+    sweep_interval=config.MEDIA_GC_SWEEP_INTERVAL_SECONDS,
+    grace_seconds=config.MEDIA_GC_GRACE_SECONDS,
+    batch_size=config.MEDIA_GC_BATCH_SIZE,
+)
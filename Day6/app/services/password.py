@@ -0,0 +1,38 @@
+# app/services/password.py
+from Day6.app.configs import config
+from Day6.app.utils.concurrency import ProcessPoolRunner
+from Day6.app.utils.password import hash_password, verify_password
+
+
+class PasswordHashService:
+    """bcrypt 해싱/검증을 프로세스 풀에서 실행해 이벤트 루프를 막지 않도록 하는 서비스"""
+
+    def __init__(self, max_workers: int, max_concurrency: int, max_queue: int) -> None:
+        self._runner = ProcessPoolRunner("password hasher", max_workers, max_concurrency, max_queue)
+
+    @property
+    def max_workers(self) -> int:
+        return self._runner.max_workers
+
+    @max_workers.setter
+    def max_workers(self, value: int) -> None:
+        self._runner.max_workers = value
+
+    async def hash(self, password: str) -> str:
+        return await self._runner.run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._runner.run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        self._runner.shutdown()
+
+    def stats(self) -> dict[str, int | float]:
+        return self._runner.stats()
+
+
+password_hasher = PasswordHashService(
+    max_workers=config.PASSWORD_HASH_WORKERS,
+    max_concurrency=config.PASSWORD_HASH_MAX_CONCURRENCY,
+    max_queue=config.PASSWORD_HASH_MAX_QUEUE,
+)
@@ -0,0 +1,101 @@
+# app/services/upload_session.py
+import uuid
+from datetime import timedelta
+from typing import AsyncIterable
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from tortoise import timezone
+from tortoise.transactions import in_transaction
+
+from Day6.app.configs import config
+from Day6.app.models.movies import Movie
+from Day6.app.models.reviews import Review
+from Day6.app.models.uploads import UploadSession
+from Day6.app.models.users import User
+from Day6.app.schemas.media import MediaTarget
+from Day6.app.services.file import file_upload_service
+from Day6.app.utils.file import (
+    STAGING_DIR,
+    append_part,
+    delete_file,
+    validate_image_filename,
+    write_part,
+)
+
+
+class UploadSessionService:
+    """세션 생성 -> offset 위치로 청크 PUT -> 완료 처리 순서의 이어 올리기 업로드.
+
+    실패한 청크만 다시 보내면 되고, 요청 하나가 전송 내내 워커를 붙잡지 않는다. 완료되면 FileUploadService 로 대상에 붙인다.
+    """
+
+    async def create(self, user: User, filename: str, size: int) -> UploadSession:
+        ext = validate_image_filename(filename)
+        if size > config.MAX_UPLOAD_SIZE:
+            raise HTTPException(status_code=413, detail=f"file is too large. max size: {config.MAX_UPLOAD_SIZE} bytes")
+
+        return await UploadSession.create(
+            user_id=user.id,
+            path=f"{STAGING_DIR}/{user.id}/{uuid.uuid4().hex}.{ext}",
+            size=size,
+            expires_at=timezone.now() + timedelta(seconds=config.UPLOAD_SESSION_EXPIRES_SECONDS),
+        )
+
+    async def get(self, user: User, session_id: int) -> UploadSession:
+        session = await UploadSession.get_or_none(id=session_id, expires_at__gt=timezone.now())
+        if session is None:
+            raise HTTPException(status_code=404, detail="Upload session not found")
+        if session.user_id != user.id:  # type: ignore[attr-defined]
+            raise HTTPException(status_code=403, detail="You are not the owner of the upload session")
+        return session
+
+    @staticmethod
+    def _offset_mismatch(offset: int) -> HTTPException:
+        # 클라이언트는 Upload-Offset 부터 다시 보내면 된다.
+        return HTTPException(
+            status_code=409, detail=f"offset mismatch. expected: {offset}", headers={"Upload-Offset": str(offset)}
+        )
+
+    async def write_chunk(self, session: UploadSession, offset: int, chunks: AsyncIterable[bytes]) -> UploadSession:
+        if offset != session.offset:
+            raise self._offset_mismatch(session.offset)
+
+        # 본문은 요청마다 따로 조각 파일로 받고, offset 을 옮길 수 있는 요청만 스테이징 파일에 붙인다.
+        part_url, written = await write_part(chunks, session.path, offset, session.size)
+        try:
+            async with in_transaction() as connection:
+                # 같은 offset 으로 동시에 보낸 요청은 행 잠금으로 줄을 서고, 먼저 offset 을 옮긴 요청만 반영된다.
+                locked = (
+                    await UploadSession.filter(id=session.id, offset=offset)
+                    .select_for_update()
+                    .using_db(connection)
+                    .first()
+                )
+                if locked is None:
+                    await session.refresh_from_db(fields=["offset"])
+                    raise self._offset_mismatch(session.offset)
+                # 붙이는 도중 실패하면 offset 이 그대로라 같은 위치부터 다시 보내면 된다.
+                await run_in_threadpool(append_part, part_url, session.path, offset)
+                await UploadSession.filter(id=session.id).using_db(connection).update(offset=offset + written)
+        finally:
+            await run_in_threadpool(delete_file, part_url)
+
+        session.offset = offset + written
+        return session
+
+    async def finalize(
+        self, user: User, session: UploadSession, target: MediaTarget, target_id: int | None
+    ) -> Movie | User | Review:
+        if session.offset != session.size:
+            raise self._offset_mismatch(session.offset)
+
+        upload = file_upload_service.open_session_upload(session)
+        return await file_upload_service.attach_upload(user, target, target_id, upload)
+
+    async def abort(self, session: UploadSession) -> None:
+        await UploadSession.filter(id=session.id).delete()
+        await run_in_threadpool(delete_file, session.path)
+
+
+upload_session_service = UploadSessionService()
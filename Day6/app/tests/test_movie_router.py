@@ -1,14 +1,30 @@
+import contextlib
+import hashlib
 import os
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator
+from unittest.mock import patch
 
 import httpx
 from dotenv import load_dotenv
+from fastapi import HTTPException, UploadFile
+from PIL import Image
 from starlette import status
 from tortoise.contrib.test import TestCase, finalizer, initializer
 
+from Day6.app.commands.shard_media import shard_media
 from Day6.app.configs import config
 from Day6.app.main import app
+from Day6.app.models.media import MediaBlob
 from Day6.app.models.movies import Movie
-from Day6.app.tests.utils.fake_file import fake_image
+from Day6.app.services.image import image_variant_service
+from Day6.app.services.media import StoredMedia, media_store
+from Day6.app.services.media_gc import media_gc
+from Day6.app.tests.utils.fake_file import fake_image, fake_photo, remove_media_files
+from Day6.app.utils.file import POSTER_IMAGE_DIR, is_sharded, shard_path, upload_limiter
+from Day6.app.utils.image import IMAGE_VARIANT_SIZES
 
 load_dotenv()
 
@@ -26,7 +42,13 @@ class TestUserRouter(TestCase):
     @classmethod
     def setUpClass(cls) -> None:
         initializer(
-            ["Day6.app.models.movies"],  # 모델이 정의된 모듈 경로
+            [
+                "Day6.app.models.movies",
+                "Day6.app.models.users",
+                "Day6.app.models.reviews",
+                "Day6.app.models.media",
+                "Day6.app.models.uploads",
+            ],  # 모델이 정의된 모듈 경로
             db_url=DB_URL,  # 메모리 DB 사용
         )
         super().setUpClass()
@@ -89,7 +111,7 @@ class TestUserRouter(TestCase):
                 params={"genre": "SF"},
             )
         self.assertEqual(status.HTTP_200_OK, search_response.status_code)
-        response_json = search_response.json()
+        response_json = search_response.json()["items"]
         self.assertEqual(response_json[0]["id"], movie.id)
         self.assertEqual(response_json[0]["title"], movie.title)
         self.assertEqual(response_json[0]["plot"], movie.plot)
@@ -97,6 +119,39 @@ class TestUserRouter(TestCase):
         self.assertEqual(response_json[0]["playtime"], movie.playtime)
         self.assertEqual(response_json[0]["genre"], movie.genre)
 
+    async def test_api_search_movie_with_cursor(self) -> None:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            movie_ids = []
+            for i in range(5):
+                create_response = await client.post(
+                    url="/movies",
+                    json={
+                        "title": f"page_title_{i}",
+                        "plot": "test_plot",
+                        "cast": [],
+                        "playtime": 90,
+                        "genre": "Mystery",
+                    },
+                )
+                movie_ids.append(create_response.json()["id"])
+
+            first_page = await client.get(url="/movies", params={"genre": "Mystery", "limit": 3})
+            second_page = await client.get(
+                url="/movies",
+                params={"genre": "Mystery", "limit": 3, "cursor": first_page.json()["next_cursor"]},
+            )
+            invalid_cursor = await client.get(url="/movies", params={"cursor": "invalid"})
+
+        self.assertEqual(status.HTTP_200_OK, first_page.status_code)
+        self.assertEqual([movie["id"] for movie in first_page.json()["items"]], movie_ids[:3])
+        self.assertIsNotNone(first_page.json()["next_cursor"])
+
+        self.assertEqual(status.HTTP_200_OK, second_page.status_code)
+        self.assertEqual([movie["id"] for movie in second_page.json()["items"]], movie_ids[3:])
+        self.assertIsNone(second_page.json()["next_cursor"])
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, invalid_cursor.status_code)
+
     async def test_api_get_movie_by_movie_id(self) -> None:
         async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
             create_response = await client.post(
@@ -127,6 +182,32 @@ class TestUserRouter(TestCase):
         self.assertEqual(response_json["playtime"], movie.playtime)
         self.assertEqual(response_json["genre"], movie.genre)
 
+    async def test_api_search_and_get_movie_with_fields(self) -> None:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            create_response = await client.post(
+                url="/movies",
+                json={
+                    "title": "test_title",
+                    "plot": "test_plot",
+                    "cast": [{"name": "lee2", "age": 23, "agency": "A actors", "gender": "male"}],
+                    "playtime": 90,
+                    "genre": "Romance",
+                },
+            )
+            movie_id = create_response.json()["id"]
+
+            search_response = await client.get(url="/movies", params={"genre": "Romance", "fields": "title,genre"})
+            get_response = await client.get(url=f"/movies/{movie_id}", params={"fields": "title,poster_image_url"})
+            invalid_response = await client.get(url=f"/movies/{movie_id}", params={"fields": "title,password"})
+
+        self.assertEqual(status.HTTP_200_OK, search_response.status_code)
+        self.assertEqual(search_response.json()["items"], [{"id": movie_id, "title": "test_title", "genre": "Romance"}])
+
+        self.assertEqual(status.HTTP_200_OK, get_response.status_code)
+        self.assertEqual(get_response.json(), {"id": movie_id, "title": "test_title", "poster_image_url": None})
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, invalid_response.status_code)
+
     async def test_api_patch_movie(self) -> None:
         async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
             create_response = await client.post(
@@ -223,8 +304,11 @@ class TestUserRouter(TestCase):
         assert response.status_code == status.HTTP_201_CREATED
         response_json = response.json()
 
-        assert f"movies/poster_images/{image.rsplit(".")[0]}" in response_json["poster_image_url"]
-        assert image.rsplit(".")[1] in response_json["poster_image_url"]
+        # 내용의 sha256 으로 파일명이 정해진다.
+        sha256 = hashlib.sha256(fake_image().getvalue()).hexdigest()
+        assert response_json["poster_image_url"] == shard_path(
+            "movies/poster_images", f"{sha256}.{image.rsplit(".")[1]}"
+        )
 
         await movie.refresh_from_db()
         assert response_json["poster_image_url"] == movie.poster_image_url
@@ -233,8 +317,444 @@ class TestUserRouter(TestCase):
         # 파일이 저장되었는지 확인
         assert os.path.exists(saved_file_path)
 
+        # 썸네일/중간 크기/WebP 변형이 함께 만들어졌는지 확인
+        variants = response_json["poster_image_variants"]
+        assert variants == movie.poster_image_variants
+        assert set(variants) == {"thumb", "thumb_webp", "medium", "medium_webp", "webp"}
+        assert all(os.path.exists(os.path.join(config.MEDIA_DIR, path)) for path in variants.values())
+        with Image.open(os.path.join(config.MEDIA_DIR, variants["thumb_webp"])) as thumb:
+            assert thumb.format == "WEBP"
+            assert max(thumb.size) <= IMAGE_VARIANT_SIZES["thumb"]
+
+        # 원본을 받지 않고도 자리를 잡을 수 있게 메타데이터가 함께 내려온다.
+        metadata = response_json["poster_image_metadata"]
+        assert metadata == movie.poster_image_metadata
+        assert metadata["width"] == metadata["height"] == 100
+        assert metadata["size"] == os.path.getsize(saved_file_path)
+        assert metadata["dominant_color"] == "#ff0000"
+        assert len(metadata["blurhash"]) == 28
+
         # 리소스 정리
-        os.remove(saved_file_path)
+        remove_media_files(movie.poster_image_url, variants)
+
+    async def test_api_register_poster_image_is_optimized(self) -> None:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            create_response = await client.post(
+                url="/movies",
+                json={"title": "test_title", "plot": "test_plot", "cast": [], "playtime": 90, "genre": "SF"},
+            )
+            photo = fake_photo(width=300, height=200).getvalue()
+
+            # when
+            response = await client.post(
+                f"/movies/{create_response.json()['id']}/poster_image",
+                files={"image": ("photo.jpg", photo, "image/jpeg")},
+            )
+            image_metrics = (await client.get("/metrics")).json()["image_variant_service"]
+        response_json = response.json()
+
+        # then: EXIF 를 떼고 다시 인코딩해 작아졌고, 그 전후 크기를 알려준다.
+        metadata = response_json["poster_image_metadata"]
+        saved_file_path = os.path.join(config.MEDIA_DIR, response_json["poster_image_url"])
+        assert metadata["original_size"] == len(photo)
+        assert metadata["size"] == os.path.getsize(saved_file_path) < len(photo)
+        assert image_metrics["bytes_saved"] >= len(photo) - metadata["size"]
+        with Image.open(saved_file_path) as saved:
+            assert saved.format == "JPEG"
+            assert not saved.getexif()
+            # 회전 방향이 픽셀에 적용되어 세로 이미지가 된다.
+            assert saved.size == (200, 300) == (metadata["width"], metadata["height"])
+
+        # 리소스 정리
+        remove_media_files(response_json["poster_image_url"], response_json["poster_image_variants"])
+
+    async def test_api_register_same_poster_image_is_deduplicated(self) -> None:
+        movie_json = {
+            "title": "dedup",
+            "plot": "test_plot",
+            "cast": [{"name": "lee2", "age": 23, "agency": "A actors", "gender": "male"}],
+            "playtime": 90,
+            "genre": "SF",
+        }
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            first_id = (await client.post("/movies", json=movie_json)).json()["id"]
+            second_id = (await client.post("/movies", json=movie_json)).json()["id"]
+
+            # when: 같은 내용의 이미지를 다른 이름으로 두 영화에 등록
+            first = await client.post(
+                f"/movies/{first_id}/poster_image",
+                files={"image": ("first.png", fake_image(color=(0, 255, 0)), "image/png")},
+            )
+            second = await client.post(
+                f"/movies/{second_id}/poster_image",
+                files={"image": ("second.png", fake_image(color=(0, 255, 0)), "image/png")},
+            )
+
+            # then: 파일은 하나만 저장되고 참조 수가 2가 된다.
+            assert first.json()["poster_image_url"] == (url := second.json()["poster_image_url"])
+            # 중복 업로드는 다시 계산하지 않고 저장된 메타데이터를 그대로 돌려준다.
+            assert first.json()["poster_image_metadata"] == second.json()["poster_image_metadata"]
+            assert (await MediaBlob.get(path=url)).ref_count == 2
+
+            # 한 영화를 지워도 다른 영화가 참조하고 있으므로 파일은 남는다.
+            await client.delete(f"/movies/{first_id}")
+            assert (await MediaBlob.get(path=url)).ref_count == 1
+            assert os.path.exists(saved_file_path := os.path.join(config.MEDIA_DIR, url))
+
+            # 마지막 참조가 사라지면 행이 지워지고, 파일은 GC 큐가 비워질 때 지워진다.
+            await client.delete(f"/movies/{second_id}")
+        assert not await MediaBlob.exists(path=url)
+        assert os.path.exists(saved_file_path)
+        await media_gc.flush()
+        assert not os.path.exists(saved_file_path)
+
+    async def test_api_register_poster_image_failure_returns_reference(self) -> None:
+        movie_json = {"title": "repair", "plot": "test_plot", "cast": [], "playtime": 90, "genre": "SF"}
+        failure = HTTPException(status_code=503, detail="busy", headers={"Retry-After": "1"})
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            first_id = (await client.post("/movies", json=movie_json)).json()["id"]
+            second_id = (await client.post("/movies", json=movie_json)).json()["id"]
+            first = await client.post(
+                f"/movies/{first_id}/poster_image",
+                files={"image": ("first.png", fake_image(color=(1, 2, 3)), "image/png")},
+            )
+            url, variants = first.json()["poster_image_url"], first.json()["poster_image_variants"]
+            # 메타데이터가 없는(이전에 저장된) 행이라 같은 내용을 다시 올리면 파일과 변형을 다시 만든다.
+            await MediaBlob.filter(path=url).update(metadata=None)
+            new_content = fake_image(color=(4, 5, 6)).getvalue()
+
+            # when: 다시 만들거나 새로 쓰다가 변형 생성이 실패한다.
+            with patch.object(image_variant_service, "generate", side_effect=failure):
+                repair_response = await client.post(
+                    f"/movies/{second_id}/poster_image",
+                    files={"image": ("second.png", fake_image(color=(1, 2, 3)), "image/png")},
+                )
+                new_response = await client.post(
+                    f"/movies/{second_id}/poster_image", files={"image": ("new.png", new_content, "image/png")}
+                )
+
+        # then: 올렸던 참조를 돌려주고, 아무도 참조하지 않게 된 새 내용의 파일은 GC 큐로 넘긴다.
+        assert repair_response.status_code == new_response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert (await MediaBlob.get(path=url)).ref_count == 1
+        assert (await Movie.get(id=second_id)).poster_image_url is None
+        new_path = shard_path(POSTER_IMAGE_DIR, f"{hashlib.sha256(new_content).hexdigest()}.png")
+        assert not await MediaBlob.exists(path=new_path)
+        await media_gc.flush()
+        assert not os.path.exists(os.path.join(config.MEDIA_DIR, new_path))
+
+        # 리소스 정리
+        remove_media_files(url, variants)
+
+    async def test_media_gc_flush_keeps_media_being_saved(self) -> None:
+        movie_json = {"title": "in_flight", "plot": "test_plot", "cast": [], "playtime": 90, "genre": "SF"}
+        generate = image_variant_service.generate
+
+        async def generate_after_gc_flush(path: str) -> tuple[dict[str, str], dict[str, Any]]:
+            # 원본을 쓴 뒤 변형을 만드는 사이에 GC 큐가 비워진다.
+            await media_gc.flush()
+            return await generate(path)
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            first_id = (await client.post("/movies", json=movie_json)).json()["id"]
+            second_id = (await client.post("/movies", json=movie_json)).json()["id"]
+            first = await client.post(
+                f"/movies/{first_id}/poster_image",
+                files={"image": ("first.png", fake_image(color=(7, 8, 9)), "image/png")},
+            )
+            # 마지막 참조가 반납되어 파일이 삭제 큐에 들어간다.
+            await client.delete(f"/movies/{first_id}")
+
+            # when: 같은 내용을 다시 올리는 중에 큐가 비워진다.
+            with patch.object(image_variant_service, "generate", side_effect=generate_after_gc_flush):
+                second = await client.post(
+                    f"/movies/{second_id}/poster_image",
+                    files={"image": ("second.png", fake_image(color=(7, 8, 9)), "image/png")},
+                )
+        await media_gc.flush()
+
+        # then: 쓰는 중인 파일은 지워지지 않는다.
+        url, variants = second.json()["poster_image_url"], second.json()["poster_image_variants"]
+        assert url == first.json()["poster_image_url"]
+        assert (await MediaBlob.get(path=url)).ref_count == 1
+        assert all(os.path.exists(os.path.join(config.MEDIA_DIR, path)) for path in (url, *variants.values()))
+
+        # 리소스 정리
+        remove_media_files(url, variants)
+
+    async def test_api_register_poster_image_concurrently(self) -> None:
+        movie_json = {"title": "race", "plot": "test_plot", "cast": [], "playtime": 90, "genre": "SF"}
+        save = media_store.save
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            movie_id = (await client.post("/movies", json=movie_json)).json()["id"]
+            other_id = (await client.post("/movies", json=movie_json)).json()["id"]
+            # 두 영화가 같은 이미지를 참조한다.
+            for target_id in (movie_id, other_id):
+                shared = await client.post(
+                    f"/movies/{target_id}/poster_image",
+                    files={"image": ("shared.png", fake_image(color=(10, 10, 10)), "image/png")},
+                )
+            shared_url, shared_variants = shared.json()["poster_image_url"], shared.json()["poster_image_variants"]
+
+            async def save_while_another_upload_finishes(file: UploadFile, upload_dir: str) -> StoredMedia:
+                stored = await save(file, upload_dir)
+                with patch.object(media_store, "save", side_effect=save):
+                    nonlocal winner
+                    winner = await client.post(
+                        f"/movies/{movie_id}/poster_image",
+                        files={"image": ("winner.png", fake_image(color=(20, 20, 20)), "image/png")},
+                    )
+                return stored
+
+            # when: 한 업로드가 저장하는 사이 같은 영화의 다른 업로드가 먼저 끝난다.
+            winner = httpx.Response(status_code=500)
+            with patch.object(media_store, "save", side_effect=save_while_another_upload_finishes):
+                loser = await client.post(
+                    f"/movies/{movie_id}/poster_image",
+                    files={"image": ("loser.png", fake_image(color=(30, 30, 30)), "image/png")},
+                )
+        await media_gc.flush()
+
+        # then: 늦게 끝난 업로드는 409 로 반영되지 않고, 이전 이미지의 참조는 한 번만 반납된다.
+        winner_url, winner_variants = winner.json()["poster_image_url"], winner.json()["poster_image_variants"]
+        assert loser.status_code == status.HTTP_409_CONFLICT
+        assert (await Movie.get(id=movie_id)).poster_image_url == winner_url
+        assert (await MediaBlob.get(path=shared_url)).ref_count == 1
+        assert (await MediaBlob.get(path=winner_url)).ref_count == 1
+        assert await MediaBlob.all().count() == 2
+
+        # 리소스 정리
+        remove_media_files(shared_url, shared_variants)
+        remove_media_files(winner_url, winner_variants)
+
+    async def test_media_gc_sweep_removes_unreferenced_media(self) -> None:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            create_response = await client.post(
+                url="/movies",
+                json={"title": "sweep", "plot": "test_plot", "cast": [], "playtime": 90, "genre": "SF"},
+            )
+            movie_id = create_response.json()["id"]
+            poster_response = await client.post(
+                f"/movies/{movie_id}/poster_image",
+                files={"image": ("poster.png", fake_image(color=(9, 9, 9)), "image/png")},
+            )
+            poster_url = poster_response.json()["poster_image_url"]
+
+        # given: 어떤 모델도 참조하지 않는 blob 과 행 없이 남은 옛 파일. 둘 다 유예 기간보다 오래되었다.
+        long_ago = time.time() - config.MEDIA_GC_GRACE_SECONDS * 2
+        orphan_blob_url = f"{POSTER_IMAGE_DIR}/{'0' * 64}.png"
+        legacy_url = f"{POSTER_IMAGE_DIR}/legacy_{uuid.uuid4().hex}.png"
+        os.makedirs(os.path.join(config.MEDIA_DIR, POSTER_IMAGE_DIR), exist_ok=True)
+        for url in (orphan_blob_url, legacy_url):
+            with open(os.path.join(config.MEDIA_DIR, url), "wb") as f:
+                f.write(fake_image().getvalue())
+            os.utime(os.path.join(config.MEDIA_DIR, url), (long_ago, long_ago))
+        await MediaBlob.create(path=orphan_blob_url, sha256="0" * 64, size=1, ref_count=1)
+        await MediaBlob.filter(path=orphan_blob_url).update(
+            referenced_at=datetime.fromtimestamp(long_ago, tz=timezone.utc)
+        )
+        # 영화가 참조하는 포스터와 변형도 유예 기간보다 오래되었다.
+        movie = await Movie.get(id=movie_id)
+        for url in (poster_url, *movie.poster_image_variants.values()):
+            os.utime(os.path.join(config.MEDIA_DIR, url), (long_ago, long_ago))
+        # 방금 쓰인 파일은 업로드 중일 수 있으므로 유예 기간 동안 남긴다.
+        fresh_url = f"{POSTER_IMAGE_DIR}/fresh_{uuid.uuid4().hex}.png"
+        with open(os.path.join(config.MEDIA_DIR, fresh_url), "wb") as f:
+            f.write(b"uploading")
+
+        # when: blob 과 후보 파일을 한 개씩 나눠 확인한다.
+        with patch.object(media_gc, "batch_size", 1):
+            swept = await media_gc.sweep()
+
+        # then
+        assert swept >= 2
+        assert not await MediaBlob.exists(path=orphan_blob_url)
+        assert not os.path.exists(os.path.join(config.MEDIA_DIR, orphan_blob_url))
+        assert not os.path.exists(os.path.join(config.MEDIA_DIR, legacy_url))
+        assert os.path.exists(os.path.join(config.MEDIA_DIR, fresh_url))
+        # 영화가 참조하는 포스터와 변형은 그대로 남는다.
+        for url in (poster_url, *movie.poster_image_variants.values()):
+            assert os.path.exists(os.path.join(config.MEDIA_DIR, url))
+
+        # 리소스 정리
+        remove_media_files(fresh_url)
+        remove_media_files(poster_url, movie.poster_image_variants)
+
+    async def test_shard_media_command_relocates_flat_files(self) -> None:
+        # given: 샤드 도입 이전처럼 평평한 디렉터리에 저장된 포스터와 변형
+        legacy_url = f"{POSTER_IMAGE_DIR}/legacy_{uuid.uuid4().hex}.png"
+        legacy_variants = {"thumb": legacy_url.replace(".png", "_thumb.png")}
+        os.makedirs(os.path.join(config.MEDIA_DIR, POSTER_IMAGE_DIR), exist_ok=True)
+        for url in (legacy_url, *legacy_variants.values()):
+            with open(os.path.join(config.MEDIA_DIR, url), "wb") as f:
+                f.write(fake_image().getvalue())
+        movie = await Movie.create(
+            title="legacy",
+            plot="test_plot",
+            cast=[],
+            playtime=90,
+            genre="SF",
+            poster_image_url=legacy_url,
+            poster_image_variants=legacy_variants,
+        )
+
+        # when: 두 번 실행해도 결과가 같다.
+        await shard_media(batch_size=1)
+        result = await shard_media(batch_size=1)
+
+        # then
+        await movie.refresh_from_db()
+        assert movie.poster_image_url == shard_path(POSTER_IMAGE_DIR, os.path.basename(legacy_url))
+        assert is_sharded(movie.poster_image_url)
+        assert movie.poster_image_variants == {
+            "thumb": f"{os.path.dirname(movie.poster_image_url)}/{os.path.basename(legacy_variants['thumb'])}"
+        }
+        assert result["Movie"] == {"rows": 0, "files": 0}
+        for old_url, new_url in (
+            (legacy_url, movie.poster_image_url),
+            (legacy_variants["thumb"], movie.poster_image_variants["thumb"]),
+        ):
+            assert not os.path.exists(os.path.join(config.MEDIA_DIR, old_url))
+            assert os.path.exists(os.path.join(config.MEDIA_DIR, new_url))
+
+        # 리소스 정리
+        remove_media_files(movie.poster_image_url, movie.poster_image_variants)
+
+    async def test_shard_media_command_merges_into_sharded_blob(self) -> None:
+        # given: 평평한 경로의 blob 과, 샤드 도입 뒤 같은 내용이 다시 올라와 생긴 샤드 경로의 blob
+        sha256 = hashlib.sha256(f"merge-{uuid.uuid4().hex}".encode()).hexdigest()
+        flat_url = f"{POSTER_IMAGE_DIR}/{sha256}.png"
+        sharded_url = shard_path(POSTER_IMAGE_DIR, os.path.basename(flat_url))
+        legacy_url = f"{POSTER_IMAGE_DIR}/legacy_{uuid.uuid4().hex}.png"
+        long_ago = time.time() - config.MEDIA_GC_GRACE_SECONDS * 2
+        for url in (flat_url, sharded_url, legacy_url):
+            os.makedirs(os.path.dirname(file_path := os.path.join(config.MEDIA_DIR, url)), exist_ok=True)
+            with open(file_path, "wb") as f:
+                f.write(fake_image().getvalue())
+            os.utime(file_path, (long_ago, long_ago))
+        await MediaBlob.create(path=flat_url, sha256=sha256, size=1, ref_count=2)
+        await MediaBlob.create(path=sharded_url, sha256=sha256, size=1, ref_count=1)
+        movie_fields = {"plot": "test_plot", "cast": [], "playtime": 90, "genre": "SF"}
+        flat_movies = [
+            await Movie.create(title=f"flat{i}", poster_image_url=flat_url, **movie_fields) for i in range(2)
+        ]
+        legacy_movie = await Movie.create(title="legacy", poster_image_url=legacy_url, **movie_fields)
+
+        # when
+        result = await shard_media(batch_size=10)
+
+        # then: 평평한 blob 은 샤드 경로의 blob 에 합쳐지고, 모델 행은 함께 샤드 경로로 바뀐다.
+        assert result["MediaBlob"]["merged"] == 1
+        assert not await MediaBlob.exists(path=flat_url)
+        assert (await MediaBlob.get(path=sharded_url)).ref_count == 3
+        for movie in flat_movies:
+            assert (await Movie.get(id=movie.id)).poster_image_url == sharded_url
+        # 옮긴 파일은 수정 시각이 갱신되어, URL 을 고치기 전에 스윕이 지우지 않는다.
+        legacy_sharded_url = (await Movie.get(id=legacy_movie.id)).poster_image_url
+        assert legacy_sharded_url == shard_path(POSTER_IMAGE_DIR, os.path.basename(legacy_url))
+        assert os.stat(os.path.join(config.MEDIA_DIR, legacy_sharded_url)).st_mtime > long_ago + 1
+
+        # 리소스 정리
+        for url in (flat_url, sharded_url, legacy_sharded_url):
+            remove_media_files(url)
+
+    async def test_api_register_poster_image_too_large(self) -> None:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            create_response = await client.post(
+                url="/movies",
+                json={"title": "test_title", "plot": "test_plot", "cast": [], "playtime": 90, "genre": "SF"},
+            )
+            movie_id = create_response.json()["id"]
+            poster_dir = os.path.join(config.MEDIA_DIR, "movies/poster_images")
+            files_before = set(os.listdir(poster_dir)) if os.path.isdir(poster_dir) else set()
+
+            # when
+            with patch.object(config, "MAX_UPLOAD_SIZE", 100):
+                response = await client.post(
+                    f"/movies/{movie_id}/poster_image",
+                    files={"image": ("test_image.png", fake_image(), "image/png")},
+                )
+
+        # then
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert (await Movie.get(id=movie_id)).poster_image_url is None
+        # 쓰다 만 파일이 남지 않았는지 확인
+        assert set(os.listdir(poster_dir)) == files_before
+
+    async def test_api_register_poster_image_with_invalid_content(self) -> None:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            create_response = await client.post(
+                url="/movies",
+                json={"title": "test_title", "plot": "test_plot", "cast": [], "playtime": 90, "genre": "SF"},
+            )
+            movie_id = create_response.json()["id"]
+
+            # when: 확장자만 png 인 텍스트 파일
+            fake_png_response = await client.post(
+                f"/movies/{movie_id}/poster_image",
+                files={"image": ("test_image.png", b"not an image" * 1000, "image/png")},
+            )
+            # when: 헤더의 가로x세로가 허용 픽셀 수를 넘는 이미지
+            with patch.object(config, "MAX_IMAGE_PIXELS", 100):
+                too_many_pixels_response = await client.post(
+                    f"/movies/{movie_id}/poster_image",
+                    files={"image": ("test_image.png", fake_image(), "image/png")},
+                )
+            # when: Content-Length 가 업로드 한도를 넘는 요청은 본문을 읽기 전에 거절
+            too_large_body_response = await client.post(
+                f"/movies/{movie_id}/poster_image",
+                content=b"0" * (config.MAX_UPLOAD_SIZE + 1024 * 1024),
+                headers={"Content-Type": "multipart/form-data; boundary=x"},
+            )
+
+        # then
+        assert fake_png_response.status_code == status.HTTP_400_BAD_REQUEST
+        assert fake_png_response.json()["detail"] == "file content does not match the png format"
+        assert too_many_pixels_response.status_code == status.HTTP_400_BAD_REQUEST
+        assert too_many_pixels_response.json()["detail"] == "image is too large. max pixels: 100"
+        assert too_large_body_response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert (await Movie.get(id=movie_id)).poster_image_url is None
+
+    async def test_api_register_poster_image_when_uploads_are_saturated(self) -> None:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            create_response = await client.post(
+                url="/movies",
+                json={"title": "test_title", "plot": "test_plot", "cast": [], "playtime": 90, "genre": "SF"},
+            )
+            movie_id = create_response.json()["id"]
+            timed_out = upload_limiter.timed_out
+
+            # when: 다른 업로드들이 쓰기 자리를 모두 잡고 있으면 대기 시간 안에 자리가 나지 않아 503
+            async with contextlib.AsyncExitStack() as stack:
+                for _ in range(upload_limiter.max_concurrency):
+                    await stack.enter_async_context(upload_limiter.acquire())
+                with patch.object(upload_limiter, "queue_timeout", 0.01):
+                    busy_response = await client.post(
+                        f"/movies/{movie_id}/poster_image",
+                        files={"image": ("test_image.png", fake_image(color=(9, 9, 9)), "image/png")},
+                    )
+                    # 대기열에서 거절된 요청은 본문을 읽지 않는다.
+                    body_read = False
+
+                    async def body() -> AsyncIterator[bytes]:
+                        nonlocal body_read
+                        body_read = True
+                        yield b"--boundary--\r\n"
+
+                    streamed_response = await client.post(
+                        f"/movies/{movie_id}/poster_image",
+                        content=body(),
+                        headers={"content-type": "multipart/form-data; boundary=boundary"},
+                    )
+            metrics = (await client.get("/metrics")).json()["upload_limiter"]
+
+        # then
+        assert busy_response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert busy_response.headers["retry-after"] == "1"
+        assert streamed_response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert not body_read
+        assert metrics["timed_out"] == timed_out + 2
+        assert metrics["active"] == 0
+        assert (await Movie.get(id=movie_id)).poster_image_url is None
 
     async def test_api_register_movie_poster_image_when_movie_has_profile_image_url(self) -> None:
         # given
@@ -269,15 +789,17 @@ class TestUserRouter(TestCase):
             # when
             response = await client.post(
                 f"/movies/{movie_id}/poster_image",
-                files={"image": ((second_image := "test_image2.png"), fake_image(), "image/png")},
+                files={"image": ((second_image := "test_image2.png"), fake_image(color=(0, 0, 255)), "image/png")},
             )
         # then
         assert response.status_code == status.HTTP_201_CREATED
         response_json = response.json()
 
         # 파일경로와 확장자가 응답으로 반환된 poster_image_url에 포함되어 있는지 확인
-        assert f"movies/poster_images/{second_image.rsplit(".")[0]}" in response_json["poster_image_url"]
-        assert second_image.rsplit(".")[1] in response_json["poster_image_url"]
+        sha256 = hashlib.sha256(fake_image(color=(0, 0, 255)).getvalue()).hexdigest()
+        assert response_json["poster_image_url"] == shard_path(
+            "movies/poster_images", f"{sha256}.{second_image.rsplit(".")[1]}"
+        )
 
         await movie.refresh_from_db()
         # 응답과 Movie객체에 저장된 profile_image_url이 같은지 확인
@@ -287,8 +809,9 @@ class TestUserRouter(TestCase):
         second_file_path = os.path.join(config.MEDIA_DIR, movie.poster_image_url)
         assert os.path.exists(second_file_path)
 
-        # 첫번째로 등록한 파일이 삭제가 되었는지 확인
+        # 첫번째로 등록한 파일이 (GC 큐를 거쳐) 삭제가 되었는지 확인
+        await media_gc.flush()
         assert not os.path.exists(first_file_path)
 
         # 리소스 정리
-        os.remove(second_file_path)
+        remove_media_files(movie.poster_image_url, movie.poster_image_variants)
@@ -0,0 +1,373 @@
+import asyncio
+import contextlib
+import logging
+import os
+from typing import Iterator
+from unittest.mock import patch
+
+import httpx
+from dotenv import load_dotenv
+from starlette import status
+from tortoise.contrib.test import TestCase, finalizer, initializer
+
+from Day6.app.configs import config
+from Day6.app.main import app
+from Day6.app.models.likes import ReviewLike
+from Day6.app.models.movies import Movie
+from Day6.app.models.reviews import Review
+from Day6.app.models.users import User
+from Day6.app.services.likes import like_buffer, like_count_reconciler
+from Day6.app.services.media import media_store
+from Day6.app.tests.utils.fake_file import fake_image, remove_media_files
+
+load_dotenv()
+
+MYSQL_HOST = os.getenv("MYSQL_HOST")
+MYSQL_PORT = os.getenv("MYSQL_PORT")
+MYSQL_USER = os.getenv("MYSQL_USER")
+MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD")
+MYSQL_DB = os.getenv("MYSQL_TEST_DB")  # 테스트 전용 DB 권장
+
+# f-string으로 DB URL 구성
+DB_URL = f"mysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB}"
+
+
+async def login(client: httpx.AsyncClient, username: str) -> dict[str, str]:
+    await client.post(
+        "/users", json={"username": username, "password": (password := "1234"), "age": 20, "gender": "male"}
+    )
+    response = await client.post("/users/login", data={"username": username, "password": password})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+class QueryCounter(logging.Handler):
+    """tortoise 가 실행한 쿼리 수를 센다."""
+
+    def __init__(self) -> None:
+        super().__init__(logging.DEBUG)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.count += 1
+
+
+@contextlib.contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    counter = QueryCounter()
+    db_logger = logging.getLogger("tortoise.db_client")
+    level = db_logger.level
+    db_logger.addHandler(counter)
+    db_logger.setLevel(logging.DEBUG)
+    try:
+        yield counter
+    finally:
+        db_logger.removeHandler(counter)
+        db_logger.setLevel(level)
+
+
+async def create_review(username: str = "reviewer") -> Review:
+    movie = await Movie.create(title="test_title", plot="test_plot", cast=[], playtime=90, genre="SF")
+    user = await User.create(username=username, hashed_password="x", age=20, gender="male")
+    return await Review.create(user=user, movie=movie, title="title", content="content")
+
+
+class TestReviewRouter(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        initializer(
+            [
+                "Day6.app.models.movies",
+                "Day6.app.models.users",
+                "Day6.app.models.reviews",
+                "Day6.app.models.likes",
+                "Day6.app.models.media",
+            ],  # 모델이 정의된 모듈 경로
+            db_url=DB_URL,
+        )
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        finalizer()
+        super().tearDownClass()
+
+    async def test_api_update_review_with_image_is_atomic(self) -> None:
+        review = await create_review()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            headers = await login(client, "review_updater")
+            await Review.filter(id=review.id).update(user_id=(await User.get(username="review_updater")).id)
+            form = {"title": "new_title", "content": "new_content"}
+
+            # when: 이미지 저장이 실패한다.
+            with patch.object(media_store, "save", side_effect=OSError("disk full")):
+                failed_response = await client.patch(
+                    f"/reviews/{review.id}",
+                    data=form,
+                    files={"review_image": ("a.png", fake_image(), "image/png")},
+                    headers=headers,
+                )
+            failed_review = await Review.get(id=review.id)
+
+            updated_response = await client.patch(
+                f"/reviews/{review.id}",
+                data=form,
+                files={"review_image": ("a.png", fake_image(), "image/png")},
+                headers=headers,
+            )
+
+        # then: 글도 바뀌지 않고, 성공하면 글과 이미지가 함께 바뀐다.
+        self.assertEqual(failed_response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual((failed_review.title, failed_review.content), ("title", "content"))
+        self.assertEqual(updated_response.status_code, status.HTTP_200_OK)
+        updated = await Review.get(id=review.id)
+        self.assertEqual((updated.title, updated.content), ("new_title", "new_content"))
+        self.assertIsNotNone(updated.review_image_url)
+        remove_media_files(updated.review_image_url, updated.review_image_variants)
+
+    async def test_api_review_like_count(self) -> None:
+        review = await create_review()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            first_headers = await login(client, "like_first")
+            second_headers = await login(client, "like_second")
+
+            # when: 같은 유저가 여러 번 좋아요/취소해도 상태가 바뀔 때만 센다.
+            await client.get(f"/likes/reviews/{review.id}/like", headers=first_headers)
+            await client.get(f"/likes/reviews/{review.id}/like", headers=first_headers)
+            await client.get(f"/likes/reviews/{review.id}/like", headers=second_headers)
+            # 좋아요는 버퍼에 모였다가 flush 때 반영된다.
+            assert await like_buffer.flush() == 2
+            liked_response = await client.get(f"/reviews/{review.id}/like_count")
+
+            await client.get(f"/likes/reviews/{review.id}/unlike", headers=second_headers)
+            await client.get(f"/likes/reviews/{review.id}/unlike", headers=second_headers)
+            await client.get(f"/likes/reviews/{review.id}/like", headers=first_headers)
+            await like_buffer.flush()
+            unliked_response = await client.get(f"/reviews/{review.id}/like_count")
+
+            missing_response = await client.get("/reviews/999999/like_count")
+
+        assert liked_response.status_code == status.HTTP_200_OK
+        assert liked_response.json() == {"review_id": review.id, "like_count": 2}
+        assert unliked_response.json()["like_count"] == 1
+        assert (await Review.get(id=review.id)).like_count == 1
+        assert missing_response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_api_review_like_count_includes_pending_likes(self) -> None:
+        review = await create_review("pending_count_reviewer")
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            first_headers = await login(client, "pending_count_first")
+            second_headers = await login(client, "pending_count_second")
+            await client.get(f"/likes/reviews/{review.id}/like", headers=first_headers)
+            await like_buffer.flush()
+
+            # when: 반영되기 전의 좋아요/취소도 like_count 에 더해진다.
+            await client.get(f"/likes/reviews/{review.id}/like", headers=second_headers)
+            await client.get(f"/likes/reviews/{review.id}/like", headers=first_headers)
+            liked_response = await client.get(f"/reviews/{review.id}/like_count")
+            await client.get(f"/likes/reviews/{review.id}/unlike", headers=first_headers)
+            unliked_response = await client.get(f"/reviews/{review.id}/like_count")
+            await like_buffer.flush()
+            flushed_response = await client.get(f"/reviews/{review.id}/like_count")
+
+            # when: 없는 리뷰는 버퍼에 넣지 않고 바로 404
+            missing_like_response = await client.get("/likes/reviews/999999/like", headers=first_headers)
+            missing_unlike_response = await client.get("/likes/reviews/999999/unlike", headers=first_headers)
+
+        assert liked_response.json()["like_count"] == 2
+        assert unliked_response.json()["like_count"] == 1
+        assert flushed_response.json()["like_count"] == 1
+        assert missing_like_response.status_code == status.HTTP_404_NOT_FOUND
+        assert missing_unlike_response.status_code == status.HTTP_404_NOT_FOUND
+        assert like_buffer.pending_state(1, 999999) is None
+
+    async def test_like_buffer_keeps_likes_when_flush_is_cancelled(self) -> None:
+        review = await create_review("cancelled_reviewer")
+        user = await User.create(username="cancelled_liker", hashed_password="x", age=20, gender="male")
+        like_buffer.record(user.id, review.id, True)
+
+        # when: 종료 중 취소로 flush 가 중단된다.
+        with patch.object(like_buffer, "_flush_batch", side_effect=asyncio.CancelledError):
+            with self.assertRaises(asyncio.CancelledError):
+                await like_buffer.flush()
+
+        # then: 되돌려 두었다가 다음 flush 에 반영한다.
+        assert like_buffer.pending_state(user.id, review.id) is True
+        assert await like_buffer.flush() == 1
+        assert (await Review.get(id=review.id)).like_count == 1
+
+    async def test_api_review_unlike_without_like(self) -> None:
+        review = await create_review("unlike_reviewer")
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            headers = await login(client, "unlike_only")
+
+            # when: 좋아요한 적 없이 취소
+            response = await client.get(f"/likes/reviews/{review.id}/unlike", headers=headers)
+        await like_buffer.flush()
+
+        # then: 행을 만들지 않고 카운터도 그대로다.
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["is_liked"] is False
+        assert not await ReviewLike.exists(review_id=review.id)
+        assert (await Review.get(id=review.id)).like_count == 0
+
+    async def test_api_review_is_liked_reads_pending_likes(self) -> None:
+        review = await create_review("pending_reviewer")
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            headers = await login(client, "pending_liker")
+
+            # when: 반영되기 전에도 자기가 누른 상태를 읽는다.
+            await client.get(f"/likes/reviews/{review.id}/like", headers=headers)
+            liked_response = await client.get(f"/reviews/{review.id}/is_liked", headers=headers)
+            await client.get(f"/likes/reviews/{review.id}/unlike", headers=headers)
+            unliked_response = await client.get(f"/reviews/{review.id}/is_liked", headers=headers)
+            stored_before_flush = await ReviewLike.exists(review_id=review.id)
+            flushed = await like_buffer.flush()
+
+        assert liked_response.json()["is_liked"] is True
+        assert unliked_response.json()["is_liked"] is False
+        assert not stored_before_flush
+        # 좋아요 후 취소는 마지막 상태(취소)만 남아, 쓸 행이 없다.
+        assert flushed == 1
+        assert not await ReviewLike.exists(review_id=review.id)
+        assert (await Review.get(id=review.id)).like_count == 0
+
+    async def test_api_review_is_liked_during_flush(self) -> None:
+        review = await create_review("flushing_reviewer")
+        flush_batch = like_buffer._flush_batch
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            headers = await login(client, "flushing_liker")
+            await client.get(f"/likes/reviews/{review.id}/like", headers=headers)
+
+            async def read_before_commit(items: list[tuple[tuple[int, int], bool]]) -> None:
+                nonlocal during_flush
+                during_flush = await client.get(f"/reviews/{review.id}/is_liked", headers=headers)
+                await flush_batch(items)
+
+            # when: flush 가 커밋되기 전에 읽고, flush 가 겹쳐 불린다.
+            during_flush = httpx.Response(status_code=500)
+            with patch.object(like_buffer, "_flush_batch", side_effect=read_before_commit):
+                flushed = await asyncio.gather(like_buffer.flush(), like_buffer.flush())
+            after_flush = await client.get(f"/reviews/{review.id}/is_liked", headers=headers)
+
+        # then: 커밋 전후 모두 자기 좋아요가 보이고, 겹친 flush 는 차례로 돌아 한 번만 반영한다.
+        assert during_flush.json()["is_liked"] is True
+        assert after_flush.json()["is_liked"] is True
+        assert sorted(flushed) == [0, 1]
+        assert (await Review.get(id=review.id)).like_count == 1
+
+    async def test_api_reviews_is_liked(self) -> None:
+        liked, unliked, pending = [await create_review(f"bulk_reviewer_{i}") for i in range(3)]
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            headers = await login(client, "bulk_liker")
+            await client.get(f"/likes/reviews/{liked.id}/like", headers=headers)
+            await client.get(f"/likes/reviews/{unliked.id}/like", headers=headers)
+            await client.get(f"/likes/reviews/{unliked.id}/unlike", headers=headers)
+            await like_buffer.flush()
+            await client.get(f"/likes/reviews/{pending.id}/like", headers=headers)
+
+            # when: 여러 리뷰의 좋아요 여부를 한 번에 묻는다.
+            response = await client.get(
+                "/reviews/is_liked",
+                params={"review_ids": [liked.id, unliked.id, pending.id, liked.id]},
+                headers=headers,
+            )
+            single_response = await client.get(f"/reviews/{liked.id}/is_liked", headers=headers)
+            empty_response = await client.get("/reviews/is_liked", headers=headers)
+        await like_buffer.flush()
+
+        # then: 중복을 뺀 요청 순서대로, 아직 반영되지 않은 좋아요까지 돌려준다.
+        assert response.status_code == status.HTTP_200_OK
+        assert [(item["review_id"], item["is_liked"]) for item in response.json()] == [
+            (liked.id, True),
+            (unliked.id, False),
+            (pending.id, True),
+        ]
+        assert single_response.json()["is_liked"] is True
+        assert empty_response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async def test_api_movie_review_feed(self) -> None:
+        movie = await Movie.create(title="feed_title", plot="feed_plot", cast=[], playtime=90, genre="SF")
+        reviews = []
+        metadata = {"width": 100, "height": 50, "size": 10, "dominant_color": "#000000", "blurhash": "LEHV6nWB2yk8"}
+        for i, like_count in enumerate((3, 7, 5)):
+            author = await User.create(username=f"feed_author_{i}", hashed_password="x", age=20, gender="male")
+            reviews.append(
+                await Review.create(
+                    user=author,
+                    movie=movie,
+                    title="title",
+                    content="content",
+                    like_count=like_count,
+                    review_image_url="review_images/a.png",
+                    review_image_metadata=metadata,
+                )
+            )
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            headers = await login(client, "feed_viewer")
+            await client.get(f"/likes/reviews/{reviews[0].id}/like", headers=headers)
+
+            # when: 좋아요 많은 순으로 2개씩 넘긴다.
+            first_page = await client.get(
+                f"/movies/{movie.id}/reviews", params={"sort": "top", "limit": 2}, headers=headers
+            )
+            second_page = await client.get(
+                f"/movies/{movie.id}/reviews",
+                params={"sort": "top", "limit": 2, "cursor": first_page.json()["next_cursor"]},
+                headers=headers,
+            )
+            recent_page = await client.get(f"/movies/{movie.id}/reviews")
+            missing_response = await client.get("/movies/999999/reviews")
+
+            # 페이지 크기와 상관없이 쿼리 수가 같다.
+            query_counts = []
+            for limit in (1, 3):
+                with count_queries() as counter:
+                    page = await client.get(f"/movies/{movie.id}/reviews", params={"limit": limit}, headers=headers)
+                assert len(page.json()["items"]) == limit
+                query_counts.append(counter.count)
+        await like_buffer.flush()
+
+        # then: 작성자 요약과 보는 유저의 좋아요 여부(반영 전 포함)가 함께 온다.
+        assert first_page.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in first_page.json()["items"]] == [reviews[1].id, reviews[2].id]
+        assert first_page.json()["items"][0]["author"]["username"] == "feed_author_1"
+        assert first_page.json()["items"][0]["review_image_metadata"]["blurhash"] == "LEHV6nWB2yk8"
+        assert [item["is_liked"] for item in first_page.json()["items"]] == [False, False]
+        assert [(item["id"], item["is_liked"]) for item in second_page.json()["items"]] == [(reviews[0].id, True)]
+        assert second_page.json()["next_cursor"] is None
+        # 로그인하지 않으면 최신순, is_liked 는 비어 있다.
+        assert [item["id"] for item in recent_page.json()["items"]] == [review.id for review in reversed(reviews)]
+        assert all(item["is_liked"] is None for item in recent_page.json()["items"])
+        assert missing_response.status_code == status.HTTP_404_NOT_FOUND
+        assert query_counts[0] == query_counts[1] == 2
+
+    async def test_api_review_like_without_buffer(self) -> None:
+        review = await create_review("unbuffered_reviewer")
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            headers = await login(client, "unbuffered_liker")
+
+            # when: 버퍼를 끄면 요청마다 바로 반영된다.
+            with patch.object(config, "LIKE_BUFFER_ENABLED", False):
+                await client.get(f"/likes/reviews/{review.id}/like", headers=headers)
+                like_count_response = await client.get(f"/reviews/{review.id}/like_count")
+
+        assert like_count_response.json()["like_count"] == 1
+        assert like_buffer.pending_state(review.user_id, review.id) is None  # type: ignore[attr-defined]
+
+    async def test_like_count_reconciler_repairs_drift(self) -> None:
+        review = await create_review("drift_reviewer")
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            headers = await login(client, "drift_liker")
+            await client.get(f"/likes/reviews/{review.id}/like", headers=headers)
+        await like_buffer.flush()
+
+        # given: 카운터가 실제 좋아요 수와 어긋남
+        await Review.filter(id=review.id).update(like_count=42)
+
+        # when
+        repaired = await like_count_reconciler.reconcile()
+
+        # then
+        assert repaired == 1
+        assert (await Review.get(id=review.id)).like_count == 1
+        assert await like_count_reconciler.reconcile() == 0
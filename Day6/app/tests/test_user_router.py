@@ -1,16 +1,27 @@
+import asyncio
+import hashlib
 import os
+from typing import Any
+from unittest.mock import patch
 
 import httpx
 from dotenv import load_dotenv
 from starlette import status
+from tortoise import timezone
 from tortoise.contrib.test import TestCase, finalizer, initializer
 
 from Day6.app.configs import config
 from Day6.app.main import app
 from Day6.app.models.users import GenderName, User
-from Day6.app.tests.utils.fake_file import fake_image, fake_txt_file
-from Day6.app.utils.auth import verify_password
-from Day6.app.utils.file import IMAGE_EXTENSIONS
+from Day6.app.services.last_login import LastLoginBuffer, last_login_buffer
+from Day6.app.tests.utils.fake_file import (
+    fake_image,
+    fake_txt_file,
+    remove_media_files,
+)
+from Day6.app.utils.auth import get_current_user, user_cache
+from Day6.app.utils.file import IMAGE_EXTENSIONS, shard_path
+from Day6.app.utils.password import verify_password
 
 load_dotenv()
 
@@ -28,7 +39,7 @@ class TestUserRouter(TestCase):
     @classmethod
     def setUpClass(cls) -> None:
         initializer(
-            ["Day6.app.models.users"],  # 모델이 정의된 모듈 경로
+            ["Day6.app.models.users", "Day6.app.models.media"],  # 모델이 정의된 모듈 경로
             db_url=DB_URL,  # 메모리 DB 사용
         )
         super().setUpClass()
@@ -112,6 +123,53 @@ class TestUserRouter(TestCase):
         response_body = user.json()
         self.assertIsNotNone(response_body["access_token"])
 
+    async def test_api_login_records_last_login_on_flush(self) -> None:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://test",
+        ) as client:
+            # Given
+            user_create_response = await client.post(
+                "/users",
+                json={
+                    "username": (username := "last_login_test"),
+                    "password": (password := "1234"),
+                    "age": 20,
+                    "gender": "male",
+                },
+            )
+            id = int(user_create_response.text)
+
+            await client.post("/users/login", data={"username": username, "password": password})
+
+        # 로그인 요청 안에서는 쓰기가 일어나지 않는다.
+        self.assertIsNone((await User.get(id=id)).last_login)
+
+        await last_login_buffer.flush()
+        self.assertIsNotNone((await User.get(id=id)).last_login)
+
+    async def test_last_login_buffer_keeps_logins_when_flush_is_cancelled(self) -> None:
+        user = await User.create(username="cancelled_flush", hashed_password="x", age=20, gender="male")
+        buffer = LastLoginBuffer(flush_interval=60, batch_size=10, max_pending=100, max_buffered=2)
+        logged_in_at = timezone.now()
+
+        # when: 종료 중 취소로 UPDATE 가 중단된다.
+        buffer.record(user.id, logged_in_at)
+        with patch.object(User, "bulk_update", side_effect=asyncio.CancelledError):
+            with self.assertRaises(asyncio.CancelledError):
+                await buffer.flush()
+
+        # then: 되돌려 두었다가 다음 flush 에 반영한다.
+        self.assertEqual(buffer.stats()["pending"], 1)
+        self.assertEqual(await buffer.flush(), 1)
+        self.assertEqual((await User.get(id=user.id)).last_login, logged_in_at)
+
+        # 반영하지 못한 항목이 max_buffered 를 넘으면 가장 오래된 것부터 버린다.
+        for user_id in (101, 102, 103):
+            buffer.record(user_id, logged_in_at)
+        self.assertEqual(buffer.stats()["pending"], 2)
+        self.assertEqual(buffer.stats()["dropped"], 1)
+
     async def test_api_get_token_by_login_none(self) -> None:
         async with httpx.AsyncClient(
             transport=httpx.ASGITransport(app=app),
@@ -178,6 +236,58 @@ class TestUserRouter(TestCase):
         self.assertEqual(response_body["age"], age)
         self.assertEqual(response_body["gender"], gender)
 
+    async def test_api_get_user_cached_and_invalidated_on_update(self) -> None:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://test",
+        ) as client:
+            # Given
+            user_create_response = await client.post(
+                "/users",
+                json={
+                    "username": (username := "cache_test"),
+                    "password": (password := "1234"),
+                    "age": 20,
+                    "gender": "male",
+                },
+            )
+            id = int(user_create_response.text)
+
+            login_user = await client.post("/users/login", data={"username": username, "password": password})
+            headers = {"Authorization": f"Bearer {login_user.json()['access_token']}"}
+
+            await client.get("/users/me", headers=headers)
+            hits = user_cache.hits
+            await client.get("/users/me", headers=headers)
+            self.assertEqual(user_cache.hits, hits + 1)
+
+            # 요청마다 캐시와 분리된 인스턴스를 받으므로, 저장하지 않은 변경은 다른 요청에 보이지 않는다.
+            token = login_user.json()["access_token"]
+            first, second = await get_current_user(token), await get_current_user(token)
+            self.assertIsNot(first, second)
+            first.hashed_password = "unsaved"
+            self.assertNotEqual((await get_current_user(token)).hashed_password, "unsaved")
+
+            # 캐시를 채우려고 읽는 사이 수정으로 invalidate 되면, 읽은 값은 캐시에 넣지 않는다.
+            user_cache.invalidate(id)
+            get_or_none = User.get_or_none
+
+            async def read_then_invalidate(*args: Any, **kwargs: Any) -> User | None:
+                user = await get_or_none(*args, **kwargs)
+                user_cache.invalidate(id)
+                return user
+
+            with patch.object(User, "get_or_none", side_effect=read_then_invalidate):
+                await get_current_user(token)
+            self.assertIsNone(user_cache.get(id))
+
+            await client.patch("/users/me", headers=headers, json={"age": (new_age := 30)})
+            self.assertIsNone(user_cache.get(id))
+
+            response_me = await client.get("/users/me", headers=headers)
+        self.assertEqual(response_me.status_code, 200)
+        self.assertEqual(response_me.json()["age"], new_age)
+
     async def test_api_update_user(self) -> None:
         async with httpx.AsyncClient(
             transport=httpx.ASGITransport(app=app),
@@ -331,8 +441,10 @@ class TestUserRouter(TestCase):
         assert response.status_code == status.HTTP_200_OK
         response_json = response.json()
 
-        assert f"users/profile_images/{image.rsplit(".")[0]}" in response_json["profile_image_url"]
-        assert image.rsplit(".")[1] in response_json["profile_image_url"]
+        sha256 = hashlib.sha256(fake_image().getvalue()).hexdigest()
+        assert response_json["profile_image_url"] == shard_path(
+            "users/profile_images", f"{sha256}.{image.rsplit(".")[1]}"
+        )
 
         await user.refresh_from_db()
         assert response_json["profile_image_url"] == user.profile_image_url
@@ -342,7 +454,7 @@ class TestUserRouter(TestCase):
         assert os.path.exists(saved_file_path)
 
         # 리소스 정리
-        os.remove(saved_file_path)
+        remove_media_files(user.profile_image_url, user.profile_image_variants)
 
     async def test_api_register_user_profile_image_when_file_has_unavailable_extension(self) -> None:
         # given
@@ -413,4 +525,4 @@ class TestUserRouter(TestCase):
 
         saved_file_path = os.path.join(config.MEDIA_DIR, response_body["profile_image_url"])
         assert os.path.exists(saved_file_path)
-        os.remove(saved_file_path)
+        remove_media_files(response_body["profile_image_url"], response_body["profile_image_variants"])
@@ -1,22 +1,44 @@
 # app/tests/utils/fake_file.py
 
 import io
+import os
 
 from PIL import Image
 
+from Day6.app.configs import config
 
-def fake_image() -> io.BytesIO:
+
+def fake_image(color: tuple[int, int, int] = (255, 0, 0)) -> io.BytesIO:
     """가짜 이미지 파일을 생성"""
     image_bytes = io.BytesIO()
-    image = Image.new("RGB", (100, 100), color=(255, 0, 0))  # 빨간색 이미지 생성
+    image = Image.new("RGB", (100, 100), color=color)  # 기본은 빨간색 이미지 생성
     image.save(image_bytes, format="PNG")  # PNG 형식으로 저장
     image_bytes.seek(0)  # 파일 포인터를 처음으로 이동
     return image_bytes
 
 
+def fake_photo(width: int = 300, height: int = 200, orientation: int = 6) -> io.BytesIO:
+    """휴대폰 사진처럼 EXIF(회전 방향, 큰 메이커 노트)가 붙은 고품질 JPEG 를 생성"""
+    image_bytes = io.BytesIO()
+    image = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    exif = Image.Exif()
+    exif[0x0112] = orientation  # Orientation. 6 이면 시계 방향 90도 회전해서 보여야 한다.
+    exif[0x927C] = b"\x00" * 32 * 1024  # MakerNote
+    image.save(image_bytes, format="JPEG", quality=98, exif=exif)
+    image_bytes.seek(0)
+    return image_bytes
+
+
 def fake_txt_file() -> io.BytesIO:
     """가짜 텍스트 파일을 생성"""
     file = io.BytesIO()
     file.write(b"fake txt file!")
     file.seek(0)
     return file
+
+
+def remove_media_files(url: str, variants: dict[str, str] | None = None) -> None:
+    """테스트에서 저장된 미디어 파일과 변형 파일을 정리"""
+    for path in (url, *(variants or {}).values()):
+        if os.path.exists(file_path := os.path.join(config.MEDIA_DIR, path)):
+            os.remove(file_path)
@@ -1,16 +1,23 @@
+import copy
 from typing import Annotated
 
-import jwt
 from fastapi import Depends, HTTPException
 from jwt import InvalidTokenError
-from passlib.context import CryptContext  # type: ignore
 from starlette import status
 
 from Day6.app.configs import config
 from Day6.app.models.users import User
-from Day6.app.utils.jwt import oauth2_scheme
+from Day6.app.services.password import password_hasher
+from Day6.app.utils.cache import TTLCache
+from Day6.app.utils.jwt import (
+    decode_access_token,
+    oauth2_scheme,
+    optional_oauth2_scheme,
+)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 인증된 유저를 user_id 기준으로 캐싱. 유저 정보가 바뀌는 곳에서는 반드시 invalidate 해야 한다.
+# 캐시한 인스턴스는 건드리지 않는 스냅숏이고, 요청마다 복사본을 넘긴다.
+user_cache: TTLCache[int, User] = TTLCache(maxsize=config.USER_CACHE_MAXSIZE, ttl=config.USER_CACHE_TTL_SECONDS)
 
 
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> User:
@@ -20,33 +27,39 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> Use
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        assert config.JWT_ALGORITHM is not None
-        payload = jwt.decode(token, config.SECRET_KEY, algorithms=[config.JWT_ALGORITHM])  # type: ignore[arg-type]
+        payload = decode_access_token(token)
         user_id = payload.get("user_id")
         if user_id is None:
             raise credentials_exception
     except InvalidTokenError:
         credentials_exception.detail = "Invalid token."
         raise credentials_exception
-    user = await User.get(id=user_id)
+
+    # 요청이 필드를 바꾼 뒤 저장하거나 되돌리는 동안 다른 요청이 그 값을 보지 않도록 복사본을 넘긴다.
+    if (cached := user_cache.get(user_id)) is not None:
+        return copy.deepcopy(cached)
+
+    # 읽는 사이 수정/삭제로 invalidate 되면 읽은 값은 캐시에 넣지 않는다.
+    generation = user_cache.generation()
+    user = await User.get_or_none(id=user_id)
     if user is None:
         credentials_exception.detail = "User not found."
         raise credentials_exception
+    user_cache.set(user_id, copy.deepcopy(user), generation=generation)
     return user
 
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)  # type: ignore
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)  # type: ignore
+async def get_optional_user(token: Annotated[str | None, Depends(optional_oauth2_scheme)]) -> User | None:
+    """토큰이 없으면 None, 있으면 get_current_user 와 같이 검증한다."""
+    if token is None:
+        return None
+    return await get_current_user(token)
 
 
 async def authenticate(username: str, password: str) -> User:
     user = await User.get_or_none(username=username)
     if user is None:
         raise HTTPException(status_code=401, detail=f"username: {username} - not found.")
-    if not verify_password(password, user.hashed_password):
+    if not await password_hasher.verify(password, user.hashed_password):
         raise HTTPException(status_code=401, detail="password incorrect.")
     return user
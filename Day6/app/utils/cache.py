@@ -0,0 +1,166 @@
+# app/utils/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """TTL 만료와 LRU 방출을 지원하는 프로세스 내부 캐시
+
+    값을 읽어 오는 동안 invalidate 된 항목이 다시 들어가지 않도록, 읽기 전에 generation() 을 받아 set 에 넘긴다.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # invalidate/clear 때마다 올라가는 세대 번호
+        self._generation = 0
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        if (item := self._data.get(key)) is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def generation(self) -> int:
+        return self._generation
+
+    def set(self, key: K, value: V, ttl: float | None = None, generation: int | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+        # generation 을 받은 뒤 무효화가 있었다면 value 는 바뀌었거나 지워진 값일 수 있다.
+        if generation is not None and generation != self._generation:
+            return
+
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+
+        # 가장 오래 사용되지 않은 항목부터 방출
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        self._generation += 1
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._data.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class SizedLRUCache(Generic[K, V]):
+    """항목 수 대신 값의 총 바이트 수로 크기를 제한하는 LRU 캐시. 각 항목은 ttl 이 지나면 만료된다.
+
+    파일 삭제 등 스레드풀에서 실행되는 코드도 invalidate 를 부르므로 잠금으로 보호한다.
+    값을 읽어 오는 동안 invalidate 된 항목이 다시 들어가지 않도록, 읽기 전에 generation() 을 받아 set 에 넘긴다.
+    """
+
+    def __init__(self, maxbytes: int, max_item_bytes: int, ttl: float) -> None:
+        self.maxbytes = maxbytes
+        self.max_item_bytes = max_item_bytes
+        self.ttl = ttl
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        # invalidate/clear 때마다 올라가는 세대 번호
+        self._generation = 0
+        self._data: OrderedDict[K, tuple[float, int, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def accepts(self, size: int) -> bool:
+        return 0 < size <= min(self.max_item_bytes, self.maxbytes)
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            if (item := self._data.get(key)) is None:
+                self.misses += 1
+                return None
+
+            expires_at, size, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.nbytes -= size
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def set(self, key: K, value: V, size: int, generation: int | None = None) -> None:
+        if not self.accepts(size):
+            return
+
+        with self._lock:
+            # generation 을 받은 뒤 무효화가 있었다면 value 는 지워졌거나 바뀐 파일의 내용일 수 있다.
+            if generation is not None and generation != self._generation:
+                return
+            if (prev := self._data.pop(key, None)) is not None:
+                self.nbytes -= prev[1]
+            self._data[key] = (time.monotonic() + self.ttl, size, value)
+            self.nbytes += size
+
+            # 가장 오래 사용되지 않은 항목부터 방출
+            while self.nbytes > self.maxbytes:
+                _, (_, evicted_size, _) = self._data.popitem(last=False)
+                self.nbytes -= evicted_size
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._generation += 1
+            if (item := self._data.pop(key, None)) is not None:
+                self.nbytes -= item[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "bytes": self.nbytes,
+            "maxbytes": self.maxbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,150 @@
+# app/utils/concurrency.py
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Coroutine, TypeVar
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+from starlette import status
+
+T = TypeVar("T")
+EndpointT = TypeVar("EndpointT", bound=Callable[..., Any])
+
+
+class ConcurrencyLimiter:
+    """동시 실행 수를 제한하고, 대기열이 가득 차면 기다리지 않고 바로 거절하는 리미터.
+
+    queue_timeout 을 주면 그 시간 안에 자리가 나지 않은 요청도 503 으로 돌려보낸다.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout: float | None = None) -> None:
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait_seconds_total = 0.0
+        self.max_wait_seconds = 0.0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def _busy(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"{self.name} is busy. try again later.",
+            headers={"Retry-After": "1"},
+        )
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise self._busy()
+
+        self.waiting += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except TimeoutError:
+            self.timed_out += 1
+            raise self._busy()
+        finally:
+            self.waiting -= 1
+
+        waited = time.perf_counter() - started
+        self.admitted += 1
+        self.wait_seconds_total += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_seconds": self.wait_seconds_total / self.admitted if self.admitted else 0.0,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+
+def limited_by(limiter: ConcurrencyLimiter) -> Callable[[EndpointT], EndpointT]:
+    """엔드포인트를 limiter 로 제한한다. 라우터가 LimitedRoute 를 써야 적용된다."""
+
+    def decorator(endpoint: EndpointT) -> EndpointT:
+        endpoint.__concurrency_limiter__ = limiter  # type: ignore[attr-defined]
+        return endpoint
+
+    return decorator
+
+
+class LimitedRoute(APIRoute):
+    """`limited_by` 로 표시한 엔드포인트는 본문을 읽기 전에 리미터 자리를 잡는다.
+
+    FastAPI 는 의존성보다 본문(multipart 스풀링 포함)을 먼저 읽으므로, 의존성이나 엔드포인트 안에서 자리를 잡으면
+    대기열에서 거절될 요청도 본문을 다 받은 뒤다. 라우트 핸들러 전체를 감싸 거절되는 요청은 본문을 읽지 않는다.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        if (limiter := getattr(self.endpoint, "__concurrency_limiter__", None)) is None:
+            return handler
+
+        async def limited_handler(request: Request) -> Response:
+            async with limiter.acquire():
+                return await handler(request)
+
+        return limited_handler
+
+
+class ProcessPoolRunner:
+    """CPU 를 많이 쓰는 함수를 spawn 프로세스 풀에서 실행하고, 동시 실행 수는 ConcurrencyLimiter 로 제한한다."""
+
+    def __init__(self, name: str, max_workers: int, max_concurrency: int, max_queue: int) -> None:
+        # max_workers 가 0 이하이면 풀 없이 이벤트 루프에서 바로 실행한다.
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._limiter = ConcurrencyLimiter(name, max_concurrency, max_queue)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        async with self._limiter.acquire():
+            if self.max_workers <= 0:
+                return func(*args)
+
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+            except BrokenProcessPool:
+                # 워커가 비정상 종료되면 다음 호출에서 풀을 새로 만든다.
+                self._executor = None
+                raise
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, int | float]:
+        return {"max_workers": self.max_workers, **self._limiter.stats()}
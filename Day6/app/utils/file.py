@@ -1,15 +1,71 @@
 # app/utils/file.py
 
+import hashlib
 import os
+import posixpath
+import shutil
+import stat
 import uuid
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Union
+from typing import AsyncIterable, AsyncIterator, BinaryIO, Iterable, Iterator, Union
 
 from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from PIL import ImageFile
 
 from Day6.app.configs import config
+from Day6.app.utils.cache import SizedLRUCache
+from Day6.app.utils.concurrency import ConcurrencyLimiter
 
 IMAGE_EXTENSIONS = ["jpg", "jpeg", "png", "gif"]
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# MEDIA_DIR 아래 업로드 디렉터리
+POSTER_IMAGE_DIR = "movies/poster_images"
+PROFILE_IMAGE_DIR = "users/profile_images"
+REVIEW_IMAGE_DIR = "reviews/images"
+MEDIA_UPLOAD_DIRS = (POSTER_IMAGE_DIR, PROFILE_IMAGE_DIR, REVIEW_IMAGE_DIR)
+# 클라이언트 직접 업로드가 완료 처리 전까지 머무는 곳
+STAGING_DIR = "staging"
+
+# 확장자별로 허용하는 파일 시그니처(매직 바이트)
+IMAGE_SIGNATURES: dict[str, tuple[bytes, ...]] = {
+    "jpg": (b"\xff\xd8\xff",),
+    "jpeg": (b"\xff\xd8\xff",),
+    "png": (b"\x89PNG\r\n\x1a\n",),
+    "gif": (b"GIF87a", b"GIF89a"),
+}
+# 이미지 헤더(크기 정보)를 찾기 위해 읽는 최대 바이트 수. JPEG 는 EXIF 뒤에 SOF 가 오므로 넉넉히 잡는다.
+IMAGE_HEADER_MAX_BYTES = 256 * 1024
+IMAGE_HEADER_CHUNK_SIZE = 16 * 1024
+
+# 디스크에 쓰는 업로드의 워커당 동시 실행 수. 몰린 업로드가 디스크와 메모리를 다른 요청까지 잡아먹지 않게 한다.
+# 업로드 라우트에 `limited_by(upload_limiter)` 로 걸어, 본문을 받기 전에 자리를 잡는다.
+upload_limiter = ConcurrencyLimiter(
+    "upload", config.UPLOAD_MAX_CONCURRENCY, config.UPLOAD_MAX_QUEUE, queue_timeout=config.UPLOAD_QUEUE_TIMEOUT_SECONDS
+)
+
+
+@dataclass(frozen=True)
+class CachedMedia:
+    content: bytes
+    media_type: str
+    headers: dict[str, str]
+    mtime: float
+
+
+# 작은 미디어 파일의 내용을 메모리에 두어 stat/open/read 없이 응답한다. 키는 media_cache_key(file_url).
+# 이 모듈에서 파일을 쓰거나 옮기거나 지우면 해당 항목을 무효화한다.
+media_cache: SizedLRUCache[str, CachedMedia] = SizedLRUCache(
+    maxbytes=config.MEDIA_CACHE_MAX_BYTES,
+    max_item_bytes=config.MEDIA_CACHE_MAX_ITEM_BYTES,
+    ttl=config.MEDIA_CACHE_TTL_SECONDS,
+)
+
+
+def media_cache_key(file_url: str) -> str:
+    return os.path.normpath(file_url)
 
 
 class FileExtensionError(Exception):
@@ -22,29 +78,178 @@ class FileDoesNotExist(Exception):
         super().__init__(f"file does not exist: {file_path}")
 
 
-async def upload_file(file: UploadFile, upload_dir: str) -> str:
+@dataclass(frozen=True)
+class UploadedFile:
+    url: str
+    size: int
+    sha256: str
 
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="No filename provided")
-    # 파일 확장자 분리
-    filename, ext = file.filename.rsplit(".", 1) if "." in file.filename else (file.filename, "")
 
-    # UUID가 추가된 유니크한 파일명 생성
-    unique_filename = f"{filename}_{uuid.uuid4().hex}.{ext}" if ext else f"{filename}_{uuid.uuid4().hex}"
+def _write_chunk(f: BinaryIO, digest: "hashlib._Hash", chunk: bytes) -> None:
+    digest.update(chunk)
+    f.write(chunk)
+
+
+def _discard(f: BinaryIO, file_path: str) -> None:
+    f.close()
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+
+def _commit(f: BinaryIO, temp_path: str, file_path: str) -> None:
+    f.close()
+    os.replace(temp_path, file_path)
+
+
+def _split_extension(filename: str) -> tuple[str, str]:
+    return (filename.rsplit(".", 1)[0], filename.rsplit(".", 1)[1]) if "." in filename else (filename, "")
+
+
+def _too_large(max_size: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"file is too large. max size: {max_size} bytes")
+
+
+def shard_path(upload_dir: str, filename: str) -> str:
+    """`{upload_dir}/{h[0:2]}/{h[2:4]}/{filename}` (h = sha256(filename)). 한 디렉터리에 파일이 몰리지 않도록 2단계로 나눈다."""
+    h = hashlib.sha256(filename.encode()).hexdigest()
+    return f"{upload_dir}/{h[0:2]}/{h[2:4]}/{filename}"
+
+
+def is_sharded(file_url: str) -> bool:
+    directory, filename = os.path.split(file_url)
+    return shard_path(os.path.dirname(os.path.dirname(directory)), filename) == file_url
+
+
+def move_file(src_url: str, dst_url: str) -> bool:
+    """MEDIA_DIR 안에서 파일을 옮긴다. 이미 옮겨진 경우(원본은 없고 대상은 있음)도 성공으로 본다."""
+    src_path = os.path.join(config.MEDIA_DIR, src_url)
+    dst_path = os.path.join(config.MEDIA_DIR, dst_url)
+    if not os.path.exists(src_path):
+        return os.path.exists(dst_path)
+
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    os.replace(src_path, dst_path)
+    media_cache.invalidate(media_cache_key(src_url))
+    media_cache.invalidate(media_cache_key(dst_url))
+    return True
+
+
+async def hash_upload(file: UploadFile, max_size: int | None = None) -> tuple[str, int]:
+    """업로드를 디스크에 쓰지 않고 청크 단위로 읽어 (sha256, 크기) 를 구한다. 읽은 뒤 파일 포인터는 처음으로 되돌린다."""
+    max_size = config.MAX_UPLOAD_SIZE if max_size is None else max_size
+    # multipart 파서가 기록한 크기를 알면 읽기 전에 거절한다.
+    if file.size is not None and file.size > max_size:
+        raise _too_large(max_size)
+
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_size:
+            raise _too_large(max_size)
+        await run_in_threadpool(digest.update, chunk)
+    await file.seek(0)
+
+    return digest.hexdigest(), size
+
+
+async def upload_file(
+    file: UploadFile, upload_dir: str, filename: str | None = None, max_size: int | None = None
+) -> UploadedFile:
+    max_size = config.MAX_UPLOAD_SIZE if max_size is None else max_size
+
+    if filename is None:
+        if not file.filename:
+            raise HTTPException(status_code=400, detail="No filename provided")
+        # 파일 확장자 분리
+        name, ext = _split_extension(file.filename)
+
+        # UUID가 추가된 유니크한 파일명 생성
+        filename = f"{name}_{uuid.uuid4().hex}.{ext}" if ext else f"{name}_{uuid.uuid4().hex}"
+
+    return await write_chunks(_read_chunks(file), shard_path(upload_dir, filename), max_size)
 
-    upload_dir_path = os.path.join(config.MEDIA_DIR, upload_dir)
-    os.makedirs(upload_dir_path, exist_ok=True)  # 업로드 폴더가 없으면 생성
 
-    file_path = f"{upload_dir}/{unique_filename}"
+async def _read_chunks(file: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
 
-    with open(f"{upload_dir_path}/{unique_filename}", "wb") as f:
-        f.write(await file.read())
 
-    return file_path
+async def write_chunks(chunks: AsyncIterable[bytes], file_url: str, max_size: int | None = None) -> UploadedFile:
+    """청크 스트림을 MEDIA_DIR 기준 file_url 에 저장한다. max_size 를 넘으면 413 을 내고 쓰던 파일을 지운다.
+
+    동시에 쓰는 업로드 수는 업로드 라우트가 본문을 읽기 전에 upload_limiter 로 제한한다.
+    """
+    max_size = config.MAX_UPLOAD_SIZE if max_size is None else max_size
+    saved_path = os.path.join(config.MEDIA_DIR, file_url)
+    await run_in_threadpool(os.makedirs, os.path.dirname(saved_path), exist_ok=True)  # 업로드 폴더가 없으면 생성
+    # 임시 파일에 다 쓴 뒤 rename 하므로, 같은 이름으로 동시에 저장해도 반쯤 쓰인 파일이 보이지 않는다.
+    temp_path = f"{saved_path}.{uuid.uuid4().hex}.part"
+
+    # 전체를 메모리에 올리지 않고 청크 단위로 복사한다. 디스크 쓰기와 해시 계산은 스레드풀에서 실행.
+    digest = hashlib.sha256()
+    size = 0
+    f = await run_in_threadpool(open, temp_path, "wb")
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_size:
+                raise _too_large(max_size)
+            await run_in_threadpool(_write_chunk, f, digest, chunk)
+        await run_in_threadpool(_commit, f, temp_path, saved_path)
+    except BaseException:
+        await run_in_threadpool(_discard, f, temp_path)
+        raise
+    media_cache.invalidate(media_cache_key(file_url))
+
+    return UploadedFile(url=file_url, size=size, sha256=digest.hexdigest())
+
+
+def _open_at(file_path: str, offset: int) -> BinaryIO:
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    f = open(file_path, "r+b" if os.path.exists(file_path) else "wb")
+    if os.fstat(f.fileno()).st_size < offset:
+        f.close()
+        raise HTTPException(status_code=409, detail="upload data before the offset is missing")
+    f.seek(offset)
+    return f
+
+
+async def write_part(chunks: AsyncIterable[bytes], file_url: str, offset: int, max_size: int) -> tuple[str, int]:
+    """청크 스트림을 file_url 옆의 임시 조각 파일에 쓰고 (조각의 MEDIA_DIR 기준 경로, 쓴 바이트 수) 를 돌려준다.
+
+    조각은 요청마다 따로 쓰므로 같은 offset 으로 동시에 보낸 요청끼리 서로의 바이트를 덮어쓰지 않는다.
+    offset 부터 붙였을 때 max_size 를 넘으면 413.
+    """
+    part_url = f"{file_url}.{uuid.uuid4().hex}.part"
+    part_path = os.path.join(config.MEDIA_DIR, part_url)
+    await run_in_threadpool(os.makedirs, os.path.dirname(part_path), exist_ok=True)
+    f = await run_in_threadpool(open, part_path, "wb")
+    written = 0
+    try:
+        async for chunk in chunks:
+            if offset + written + len(chunk) > max_size:
+                raise _too_large(max_size)
+            await run_in_threadpool(f.write, chunk)
+            written += len(chunk)
+        await run_in_threadpool(f.close)
+    except BaseException:
+        await run_in_threadpool(_discard, f, part_path)
+        raise
+    return part_url, written
+
+
+def append_part(part_url: str, file_url: str, offset: int) -> None:
+    """조각 파일의 내용을 file_url 의 offset 위치에 쓰고, 그 뒤에 남은(실패한 이전 시도의) 바이트는 잘라낸다."""
+    with _open_at(os.path.join(config.MEDIA_DIR, file_url), offset) as f:
+        with open(os.path.join(config.MEDIA_DIR, part_url), "rb") as part:
+            shutil.copyfileobj(part, f, UPLOAD_CHUNK_SIZE)
+        f.truncate()
 
 
 def delete_file(file_url: str) -> None:
     file_path = f"{config.MEDIA_DIR}/{file_url}"
+    media_cache.invalidate(media_cache_key(file_url))
 
     if not os.path.exists(file_path):
         return
@@ -52,12 +257,120 @@ def delete_file(file_url: str) -> None:
     os.remove(file_path)
 
 
+def delete_files(file_urls: Iterable[str]) -> int:
+    """여러 파일을 한 번에 지우고 실제로 지운 개수를 돌려준다. 스레드풀 한 번 왕복으로 처리하기 위한 함수."""
+    deleted = 0
+    for file_url in file_urls:
+        media_cache.invalidate(media_cache_key(file_url))
+        try:
+            os.remove(f"{config.MEDIA_DIR}/{file_url}")
+            deleted += 1
+        except FileNotFoundError:
+            pass
+    return deleted
+
+
+def stale_file_batches(upload_dir: str, modified_before: float, batch_size: int) -> Iterator[list[str]]:
+    """upload_dir 아래(하위 디렉터리 포함)에서 modified_before 이전에 수정된 파일의 상대 경로를 batch_size 개씩 돌려준다."""
+    batch: list[str] = []
+    for root, _, filenames in os.walk(os.path.join(config.MEDIA_DIR, upload_dir)):
+        for filename in filenames:
+            file_path = os.path.join(root, filename)
+            try:
+                if os.stat(file_path).st_mtime >= modified_before:
+                    continue
+            except FileNotFoundError:
+                continue
+            batch.append(os.path.relpath(file_path, config.MEDIA_DIR).replace(os.sep, "/"))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
 def validate_image_extension(file: UploadFile) -> str:
+    return validate_image_filename(file.filename)
+
 
-    if not file.filename:
+def validate_image_filename(filename: str | None) -> str:
+
+    if not filename:
         raise HTTPException(status_code=400, detail="No filename provided")
 
-    filename, ext = file.filename.rsplit(".", 1) if "." in file.filename else (file.filename, "")
+    name, ext = _split_extension(filename)
     if ext not in IMAGE_EXTENSIONS:
         raise HTTPException(status_code=400, detail=f"invalid image extension. enable extension: {IMAGE_EXTENSIONS}")
     return ext
+
+
+def is_staging_path(file_url: str) -> bool:
+    """완료 처리 전의 직접 업로드나 이어 올리기 조각이 있는 STAGING_DIR 아래 경로인지 확인한다."""
+    return posixpath.normpath(file_url).lstrip("/").split("/")[0] == STAGING_DIR
+
+
+def resolve_media_file(file_url: str) -> tuple[str, os.stat_result]:
+    """MEDIA_DIR 기준 상대 경로를 실제 파일 경로로 바꾸고 stat 결과와 함께 돌려준다.
+
+    MEDIA_DIR 밖이나, 아직 검증되지 않은 업로드가 머무는 STAGING_DIR 안을 가리키면 404.
+    """
+    media_dir = os.path.realpath(config.MEDIA_DIR)
+    file_path = os.path.realpath(os.path.join(media_dir, file_url))
+    if os.path.commonpath([media_dir, file_path]) != media_dir:
+        raise HTTPException(status_code=404, detail="File not found")
+    staging_dir = os.path.join(media_dir, STAGING_DIR)
+    if os.path.commonpath([staging_dir, file_path]) == staging_dir:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    try:
+        stat_result = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail="File not found")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    return file_path, stat_result
+
+
+def read_media_file(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+async def validate_image_content(file: UploadFile, ext: str, max_pixels: int | None = None) -> tuple[int, int]:
+    """업로드 앞부분만 읽어 매직 바이트와 Pillow 헤더의 가로/세로 크기를 검사한다. 읽은 뒤 파일 포인터는 처음으로 되돌린다.
+
+    본문 전체를 해시하거나 디스크에 쓰기 전에 이미지가 아니거나 너무 큰 업로드를 거절하기 위한 검사다.
+    """
+    max_pixels = config.MAX_IMAGE_PIXELS if max_pixels is None else max_pixels
+
+    size: tuple[int, int] | None = None
+    try:
+        head = await file.read(IMAGE_HEADER_CHUNK_SIZE)
+        if not head.startswith(IMAGE_SIGNATURES.get(ext, ())):
+            raise HTTPException(status_code=400, detail=f"file content does not match the {ext} format")
+
+        parser = ImageFile.Parser()
+        parser.feed(head)
+        read = len(head)
+        # 헤더가 해석될 때까지만 조금씩 더 읽는다.
+        while parser.image is None and read < IMAGE_HEADER_MAX_BYTES:
+            if not (chunk := await file.read(IMAGE_HEADER_CHUNK_SIZE)):
+                break
+            read += len(chunk)
+            parser.feed(chunk)
+        if parser.image is not None:
+            size = parser.image.size
+    except (OSError, SyntaxError, ValueError):
+        size = None
+    finally:
+        await file.seek(0)
+
+    if size is None:
+        raise HTTPException(status_code=400, detail="invalid image file")
+
+    width, height = size
+    if width * height > max_pixels:
+        raise HTTPException(status_code=400, detail=f"image is too large. max pixels: {max_pixels}")
+
+    return width, height
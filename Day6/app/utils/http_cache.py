@@ -0,0 +1,51 @@
+# app/utils/http_cache.py
+
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+
+from starlette.datastructures import Headers
+
+# 중복 제거 저장소가 만든 `{sha256}.{ext}`, `{sha256}_{variant}.{ext}` 이름. sha256 은 업로드한 내용의 해시라,
+# 저장이 끝나기 전(최적화로 덮어쓰기, 변형 생성 중)에는 같은 이름의 바이트가 바뀔 수 있다.
+CONTENT_ADDRESSED_NAME = re.compile(r"^([0-9a-f]{64})(_[a-z]+)?\.[a-z0-9]+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "public, max-age=86400"
+
+
+def content_sha256(file_url: str) -> str | None:
+    """내용 주소 파일이면 이름의 sha256 을, 아니면(중복 제거 이전의 uuid 이름) None 을 돌려준다."""
+    if match := CONTENT_ADDRESSED_NAME.match(os.path.basename(file_url)):
+        return match.group(1)
+    return None
+
+
+def media_cache_headers(stat_result: os.stat_result, immutable: bool = False) -> dict[str, str]:
+    """ETag/Last-Modified/Cache-Control 헤더.
+
+    ETag 는 실제로 저장된 바이트의 크기와 수정 시각으로 만들어, 파일이 다시 쓰이면 바뀐다.
+    immutable 은 더 이상 바이트가 바뀌지 않는 파일(저장이 끝난 내용 주소 파일)에만 준다.
+    """
+    return {
+        "etag": f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"',
+        "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "cache-control": IMMUTABLE_CACHE_CONTROL if immutable else DEFAULT_CACHE_CONTROL,
+    }
+
+
+def is_not_modified(request_headers: Headers, etag: str, mtime: float) -> bool:
+    """If-None-Match 가 있으면 그것만, 없으면 If-Modified-Since 로 304 여부를 판단한다 (RFC 9110 13.2.2)."""
+    if if_none_match := request_headers.get("if-none-match"):
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in tags
+
+    if if_modified_since := request_headers.get("if-modified-since"):
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    return False
@@ -0,0 +1,179 @@
+# app/utils/image.py
+# 프로세스 풀 워커에서도 import 되므로 Pillow 외의 의존성을 두지 않는다.
+
+import io
+import math
+import os
+import uuid
+from typing import Any
+
+from PIL import Image, ImageOps
+
+# 변형 이름 -> 긴 변의 최대 픽셀 수
+IMAGE_VARIANT_SIZES: dict[str, int] = {"thumb": 200, "medium": 800}
+WEBP_QUALITY = 80
+# 원본을 다시 인코딩할 때의 JPEG 품질. 85 부근에서 눈에 띄는 열화 없이 휴대폰 사진(대개 95 이상)이 크게 줄어든다.
+JPEG_QUALITY = 85
+# 다시 인코딩해 최적화하는 원본 형식
+OPTIMIZED_FORMATS = ("JPEG", "PNG")
+# BlurHash 가로/세로 성분 수. 4x3 이면 28자 문자열이 된다.
+BLURHASH_COMPONENTS = (4, 3)
+BLURHASH_SAMPLE_SIZE = 32
+_BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+def _to_webp_mode(image: Image.Image) -> Image.Image:
+    # WebP 는 RGB/RGBA 만 받으므로 팔레트, CMYK 등은 변환한다.
+    if image.mode in ("RGB", "RGBA"):
+        return image
+    return image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+
+
+def variant_path(path: str, variant: str, ext: str | None = None) -> str:
+    """`x/abc.png` 의 변형 경로. 예) thumb -> `x/abc_thumb.png`, ext=webp -> `x/abc_thumb.webp`"""
+    stem, original_ext = os.path.splitext(path)
+    return f"{stem}_{variant}.{ext}" if ext else f"{stem}_{variant}{original_ext}"
+
+
+def image_variant_paths(path: str) -> dict[str, str]:
+    """process_image 가 `path` 옆에 만드는 변형들의 {변형 이름: 경로}"""
+    variants: dict[str, str] = {}
+    for name in IMAGE_VARIANT_SIZES:
+        variants[name] = variant_path(path, name)
+        variants[f"{name}_webp"] = variant_path(path, name, "webp")
+    variants["webp"] = f"{os.path.splitext(path)[0]}.webp"
+    return variants
+
+
+def _base83(value: int, length: int) -> str:
+    return "".join(_BASE83[value // 83 ** (length - i - 1) % 83] for i in range(length))
+
+
+def _srgb_to_linear(value: int) -> float:
+    v = value / 255
+    return v / 12.92 if v <= 0.04045 else ((v + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value: float) -> int:
+    v = max(0.0, min(1.0, value))
+    return round((v * 12.92 if v <= 0.0031308 else 1.055 * v ** (1 / 2.4) - 0.055) * 255)
+
+
+def blurhash(
+    image: Image.Image, x_components: int = BLURHASH_COMPONENTS[0], y_components: int = BLURHASH_COMPONENTS[1]
+) -> str:
+    """BlurHash(https://blurha.sh) 인코딩. 작게 줄인 이미지의 DCT 저주파 성분만 base83 문자열로 담는다."""
+    sample = image.convert("RGB").resize((BLURHASH_SAMPLE_SIZE, BLURHASH_SAMPLE_SIZE), Image.Resampling.BILINEAR)
+    width, height = sample.size
+    linear = [_srgb_to_linear(v) for v in range(256)]
+    data = sample.tobytes()
+    pixels = [(linear[data[k]], linear[data[k + 1]], linear[data[k + 2]]) for k in range(0, len(data), 3)]
+    cos_x = [[math.cos(math.pi * i * x / width) for x in range(width)] for i in range(x_components)]
+    cos_y = [[math.cos(math.pi * j * y / height) for y in range(height)] for j in range(y_components)]
+
+    factors: list[tuple[float, float, float]] = []
+    for j in range(y_components):
+        for i in range(x_components):
+            r = g = b = 0.0
+            for y in range(height):
+                for x in range(width):
+                    basis = cos_x[i][x] * cos_y[j][y]
+                    pr, pg, pb = pixels[y * width + x]
+                    r, g, b = r + basis * pr, g + basis * pg, b + basis * pb
+            scale = (1 if i == j == 0 else 2) / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _base83((x_components - 1) + (y_components - 1) * 9, 1)
+    max_ac = 1.0
+    if ac:
+        quantised_max = max(0, min(82, math.floor(max(abs(c) for f in ac for c in f) * 166 - 0.5)))
+        max_ac = (quantised_max + 1) / 166
+        result += _base83(quantised_max, 1)
+    else:
+        result += _base83(0, 1)
+
+    result += _base83((_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2]), 4)
+    for f in ac:
+        r_q, g_q, b_q = (max(0, min(18, math.floor(math.copysign(abs(c / max_ac) ** 0.5, c) * 9 + 9.5))) for c in f)
+        result += _base83(r_q * 19 * 19 + g_q * 19 + b_q, 2)
+    return result
+
+
+def dominant_color(image: Image.Image) -> str:
+    """팔레트를 8색으로 줄였을 때 가장 많은 픽셀이 속한 색을 `#rrggbb` 로 돌려준다."""
+    quantized = image.convert("RGB").resize((64, 64)).quantize(colors=8)
+    histogram = quantized.histogram()
+    index = histogram.index(max(histogram))
+    palette = quantized.getpalette() or [0, 0, 0]
+    r, g, b = palette[index * 3 : index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def _save_options(image_format: str | None, icc_profile: bytes | None) -> dict[str, Any]:
+    """다시 인코딩할 때의 설정. EXIF/XMP/텍스트 청크는 넘기지 않아 떨어지고, 색 재현에 필요한 ICC 프로파일만 남긴다."""
+    options: dict[str, Any] = {"format": image_format}
+    if icc_profile:
+        options["icc_profile"] = icc_profile
+    if image_format == "JPEG":
+        options.update(quality=JPEG_QUALITY, optimize=True, progressive=True)
+    elif image_format == "PNG":
+        options.update(optimize=True)
+    return options
+
+
+def _optimize(original: Image.Image, file_path: str) -> Image.Image:
+    """EXIF 방향을 픽셀에 적용하고 메타데이터를 뗀 뒤 다시 인코딩한다.
+
+    결과가 원본보다 작거나, 원본에 EXIF(촬영 위치 등)가 있었으면 원본 파일을 바꾼다. 바뀐 방향이 적용된 이미지를 돌려준다.
+    """
+    image = ImageOps.exif_transpose(original) or original
+    # 움직이는 GIF 는 첫 프레임만 남게 되므로 건드리지 않는다.
+    if original.format not in OPTIMIZED_FORMATS or getattr(original, "n_frames", 1) > 1:
+        return image
+
+    buffer = io.BytesIO()
+    image.save(buffer, **_save_options(original.format, original.info.get("icc_profile")))
+    if buffer.tell() < os.path.getsize(file_path) or original.getexif():
+        temp_path = f"{file_path}.{uuid.uuid4().hex}.part"
+        with open(temp_path, "wb") as f:
+            f.write(buffer.getbuffer())
+        os.replace(temp_path, file_path)
+    return image
+
+
+def process_image(media_dir: str, path: str) -> tuple[dict[str, str], dict[str, Any]]:
+    """원본을 최적화(EXIF 방향 적용, 메타데이터 제거, 재인코딩)하고, 원본 옆에 크기별 변형과 WebP 인코딩을 만들고,
+    클라이언트가 내려받기 전에 쓸 메타데이터를 계산한다.
+
+    돌려주는 변형은 {변형 이름: MEDIA_DIR 기준 상대 경로} 로 `thumb`, `thumb_webp`, `medium`, `medium_webp`,
+    원본 크기의 `webp` 이고, 메타데이터는 width, height, size(저장된 bytes), original_size(업로드 bytes),
+    dominant_color, blurhash 이다.
+    """
+    variants = image_variant_paths(path)
+    original_size = os.path.getsize(file_path := os.path.join(media_dir, path))
+    with Image.open(file_path) as original:
+        original.load()
+        image_format = original.format
+        save_options = _save_options(image_format, original.info.get("icc_profile"))
+        image = _optimize(original, file_path)
+
+        metadata = {
+            "width": image.width,
+            "height": image.height,
+            "size": os.path.getsize(file_path),
+            "original_size": original_size,
+            "dominant_color": dominant_color(image),
+            "blurhash": blurhash(image),
+        }
+        for name, max_side in IMAGE_VARIANT_SIZES.items():
+            resized = image.copy()
+            resized.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)  # 비율 유지, 작은 이미지는 그대로
+            resized.save(os.path.join(media_dir, variants[name]), **save_options)
+            _to_webp_mode(resized).save(
+                os.path.join(media_dir, variants[f"{name}_webp"]), format="WEBP", quality=WEBP_QUALITY
+            )
+
+        _to_webp_mode(image).save(os.path.join(media_dir, variants["webp"]), format="WEBP", quality=WEBP_QUALITY)
+
+    return variants, metadata
@@ -1,11 +1,22 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
+from typing import Any
 
 import jwt
 from fastapi.security import OAuth2PasswordBearer
 
 from Day6.app.configs import config
+from Day6.app.utils.cache import TTLCache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+# 로그인하지 않아도 되는 API 용. 토큰이 없으면 401 대신 None 을 넘긴다.
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
+
+# 검증이 끝난 토큰의 payload 를 토큰 digest 기준으로 캐싱. 항목은 토큰의 exp 보다 늦게 만료되지 않는다.
+token_cache: TTLCache[bytes, dict[str, Any]] = TTLCache(
+    maxsize=config.TOKEN_CACHE_MAXSIZE, ttl=config.TOKEN_CACHE_TTL_SECONDS
+)
 
 
 def create_access_token(data: dict[str, int | str | datetime], expires_delta: timedelta | None = None) -> str:
@@ -18,3 +29,20 @@ def create_access_token(data: dict[str, int | str | datetime], expires_delta: ti
 
     encoded_jwt = jwt.encode(to_encode, config.SECRET_KEY, algorithm=config.JWT_ALGORITHM)  # type: ignore[arg-type]
     return encoded_jwt
+
+
+def decode_access_token(token: str) -> dict[str, Any]:
+    """토큰을 검증하고 payload 를 반환한다. 검증에 실패하면 jwt.InvalidTokenError 를 그대로 던진다."""
+    key = hashlib.sha256(token.encode()).digest()
+    if (payload := token_cache.get(key)) is not None:
+        return payload
+
+    assert config.JWT_ALGORITHM is not None
+    payload = jwt.decode(token, config.SECRET_KEY, algorithms=[config.JWT_ALGORITHM])  # type: ignore[arg-type]
+
+    ttl = token_cache.ttl
+    if (exp := payload.get("exp")) is not None:
+        ttl = min(ttl, float(exp) - time.time())
+    if ttl > 0:
+        token_cache.set(key, payload, ttl=ttl)
+    return payload
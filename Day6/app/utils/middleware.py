@@ -0,0 +1,50 @@
+# app/utils/middleware.py
+
+from fastapi import HTTPException
+from starlette import status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class BodySizeLimitMiddleware:
+    """요청 본문 크기를 제한하는 ASGI 미들웨어.
+
+    Content-Length 가 한도를 넘으면 본문을 읽기 전에 413 으로 끊고,
+    Content-Length 가 없는 chunked 요청은 읽은 양이 한도를 넘는 순간 413 을 낸다.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int) -> None:
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body_size:
+            response = JSONResponse(
+                {"detail": f"request body is too large. max size: {self.max_body_size} bytes"},
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                headers={"Connection": "close"},
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # FastAPI 가 본문을 파싱하는 중에 발생하므로 HTTPException 그대로 413 응답이 된다.
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"request body is too large. max size: {self.max_body_size} bytes",
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
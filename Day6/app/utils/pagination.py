@@ -0,0 +1,42 @@
+# app/utils/pagination.py
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Sequence
+
+from fastapi import HTTPException
+from tortoise.expressions import Q
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"cursor value is not serializable: {value!r}")
+
+
+def encode_cursor(*values: Any) -> str:
+    """정렬 키 값들을 클라이언트가 해석할 필요 없는 불투명 토큰으로 만든다."""
+    raw = json.dumps(values, default=_json_default, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[Any], Any]) -> tuple[Any, ...]:
+    """encode_cursor 로 만든 토큰을 parsers 순서대로 변환해 돌려준다."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError(cursor)
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+
+def keyset_filter(keys: Sequence[str], values: Sequence[Any], descending: bool = False) -> Q:
+    """(k1, k2, ...) 가 values 보다 뒤에 오는 행을 고르는 조건. ORDER BY keys 와 같은 방향이어야 한다."""
+    lookup = "lt" if descending else "gt"
+    conditions = [
+        Q(**dict(zip(keys[:index], values[:index])), **{f"{key}__{lookup}": values[index]})
+        for index, key in enumerate(keys)
+    ]
+    return Q(*conditions, join_type=Q.OR)
@@ -0,0 +1,14 @@
+# app/utils/password.py
+# 프로세스 풀 워커에서도 import 되므로 passlib 외의 의존성을 두지 않는다.
+
+from passlib.context import CryptContext  # type: ignore
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)  # type: ignore
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)  # type: ignore
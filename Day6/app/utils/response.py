@@ -0,0 +1,34 @@
+# app/utils/response.py
+
+from typing import Any, Generic, TypeVar
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+T = TypeVar("T")
+
+
+class FastJSONResponse(JSONResponse):
+    """표준 json 대신 pydantic-core(Rust) 직렬화기를 쓰는 기본 응답 클래스"""
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+class ResponseSerializer(Generic[T]):
+    """응답 타입별로 미리 컴파일한 TypeAdapter 로 ORM 객체/모델을 바로 JSON bytes 로 만든다.
+
+    FastAPI 기본 경로(response_model 재검증 + jsonable_encoder + json.dumps)를 건너뛰므로,
+    라우트의 response_model 은 문서화 용도로만 남는다.
+    """
+
+    def __init__(self, type_: type[T]) -> None:
+        self.adapter: TypeAdapter[T] = TypeAdapter(type_)
+
+    def dump_json(self, content: Any) -> bytes:
+        return self.adapter.dump_json(self.adapter.validate_python(content, from_attributes=True))
+
+    def response(self, content: Any, status_code: int = 200) -> Response:
+        return Response(content=self.dump_json(content), status_code=status_code, media_type="application/json")
@@ -0,0 +1,311 @@
+# app/utils/storage.py
+
+import hashlib
+import hmac
+import os
+import time
+import xml.etree.ElementTree as ElementTree
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterator, Sequence
+from urllib.parse import quote, urlsplit
+
+import httpx
+from fastapi.concurrency import run_in_threadpool
+
+from Day6.app.configs import config
+from Day6.app.utils.file import (
+    delete_files,
+    read_media_file,
+    stale_file_batches,
+    write_chunks,
+)
+
+
+@dataclass(frozen=True)
+class PresignedUpload:
+    url: str
+    method: str = "PUT"
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class StorageBackend(ABC):
+    """미디어 파일 저장소. 업로드 처리(해시, 변형 생성)는 MEDIA_DIR 의 로컬 파일로 하고, 결과를 persist 로 넘긴다."""
+
+    @abstractmethod
+    async def persist(self, file_urls: Sequence[str]) -> None:
+        """MEDIA_DIR 에 만들어진 파일들을 저장소에 올린다."""
+
+    @abstractmethod
+    async def exists(self, file_url: str) -> bool: ...
+
+    @abstractmethod
+    async def size(self, file_url: str) -> int | None:
+        """파일 크기. 없으면 None"""
+
+    @abstractmethod
+    async def fetch(self, file_url: str, max_size: int) -> str:
+        """저장소의 파일을 MEDIA_DIR 의 같은 경로로 가져오고 그 로컬 경로를 돌려준다."""
+
+    @abstractmethod
+    async def delete_many(self, file_urls: Sequence[str]) -> int: ...
+
+    @abstractmethod
+    def iter_stale(self, prefix: str, modified_before: float, batch_size: int) -> AsyncIterator[list[str]]:
+        """prefix 아래에서 modified_before 이전에 수정된 파일을 최대 batch_size 개씩 나눠 돌려준다."""
+
+    @abstractmethod
+    def presign_upload(self, file_url: str, expires_in: int) -> PresignedUpload:
+        """클라이언트가 file_url 로 직접 올릴 수 있는 서명된 업로드 요청"""
+
+    def public_url(self, file_url: str) -> str | None:
+        """클라이언트를 보낼 외부 URL. None 이면 앱이 직접 파일을 내려준다."""
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+class LocalStorage(StorageBackend):
+    """config.MEDIA_DIR 을 그대로 쓰는 저장소. 직접 업로드는 앱의 서명된 PUT 경로로 받는다."""
+
+    def __init__(self, secret_key: str | None) -> None:
+        # 빈 키로 서명하면 누구나 업로드 URL 을 만들 수 있으므로 시작할 때 막는다.
+        if not secret_key:
+            raise ValueError("SECRET_KEY is required to sign direct upload URLs")
+        self._secret_key = secret_key.encode()
+
+    def _signature(self, file_url: str, expires: int) -> str:
+        return hmac.new(self._secret_key, f"PUT\n{file_url}\n{expires}".encode(), hashlib.sha256).hexdigest()
+
+    def verify_upload_signature(self, file_url: str, expires: int, signature: str) -> bool:
+        return expires >= time.time() and hmac.compare_digest(self._signature(file_url, expires), signature)
+
+    async def persist(self, file_urls: Sequence[str]) -> None:
+        return None
+
+    async def exists(self, file_url: str) -> bool:
+        return await run_in_threadpool(os.path.isfile, os.path.join(config.MEDIA_DIR, file_url))
+
+    async def size(self, file_url: str) -> int | None:
+        try:
+            return (await run_in_threadpool(os.stat, os.path.join(config.MEDIA_DIR, file_url))).st_size
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    async def fetch(self, file_url: str, max_size: int) -> str:
+        return os.path.join(config.MEDIA_DIR, file_url)
+
+    async def delete_many(self, file_urls: Sequence[str]) -> int:
+        return await run_in_threadpool(delete_files, file_urls)
+
+    async def iter_stale(self, prefix: str, modified_before: float, batch_size: int) -> AsyncIterator[list[str]]:
+        batches = stale_file_batches(prefix, modified_before, batch_size)
+        # 디렉터리 탐색은 블로킹이므로 한 묶음씩 스레드풀에서 진행한다.
+        while (batch := await run_in_threadpool(next, batches, None)) is not None:
+            yield batch
+
+    def presign_upload(self, file_url: str, expires_in: int) -> PresignedUpload:
+        expires = int(time.time()) + expires_in
+        query = f"expires={expires}&signature={self._signature(file_url, expires)}"
+        return PresignedUpload(url=f"/media/uploads/{quote(file_url)}?{query}")
+
+
+class S3Storage(StorageBackend):
+    """S3 호환 오브젝트 스토리지(AWS S3, MinIO 등). 요청은 SigV4 로 서명한다."""
+
+    ALGORITHM = "AWS4-HMAC-SHA256"
+    UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+    S3_NAMESPACE = "{http://s3.amazonaws.com/doc/2006-03-01/}"
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket: str,
+        access_key: str,
+        secret_key: str,
+        region: str = "us-east-1",
+        path_style: bool = True,
+        public_url_expires_in: int = 3600,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        endpoint = urlsplit(endpoint_url)
+        self.scheme = endpoint.scheme
+        # MinIO 등은 path-style(`host/bucket/key`), AWS 는 virtual-hosted(`bucket.host/key`) 를 주로 쓴다.
+        self.host = endpoint.netloc if path_style else f"{bucket}.{endpoint.netloc}"
+        self.bucket = bucket
+        self.path_style = path_style
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.public_url_expires_in = public_url_expires_in
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=30, transport=self._transport)
+        return self._client
+
+    def _canonical_uri(self, file_url: str) -> str:
+        path = f"/{self.bucket}/{file_url}" if self.path_style else f"/{file_url}"
+        return quote(path, safe="/-_.~")
+
+    @staticmethod
+    def _canonical_query(params: dict[str, str]) -> str:
+        return "&".join(f"{quote(k, safe='-_.~')}={quote(v, safe='-_.~')}" for k, v in sorted(params.items()))
+
+    def _signature(
+        self, method: str, uri: str, params: dict[str, str], headers: dict[str, str], payload_hash: str, now: datetime
+    ) -> str:
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        scope = f"{amz_date[:8]}/{self.region}/s3/aws4_request"
+        signed_headers = ";".join(sorted(headers))
+        canonical_request = "\n".join(
+            [
+                method,
+                uri,
+                self._canonical_query(params),
+                "".join(f"{name}:{headers[name].strip()}\n" for name in sorted(headers)),
+                signed_headers,
+                payload_hash,
+            ]
+        )
+        string_to_sign = "\n".join(
+            [self.ALGORITHM, amz_date, scope, hashlib.sha256(canonical_request.encode()).hexdigest()]
+        )
+
+        key = f"AWS4{self.secret_key}".encode()
+        for part in (amz_date[:8], self.region, "s3", "aws4_request"):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        return hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+    def presign(self, method: str, file_url: str, expires_in: int, now: datetime | None = None) -> str:
+        """쿼리 문자열 인증(presigned URL). 서명에는 host 헤더만 포함한다."""
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        uri = self._canonical_uri(file_url)
+        params = {
+            "X-Amz-Algorithm": self.ALGORITHM,
+            "X-Amz-Credential": f"{self.access_key}/{amz_date[:8]}/{self.region}/s3/aws4_request",
+            "X-Amz-Date": amz_date,
+            "X-Amz-Expires": str(expires_in),
+            "X-Amz-SignedHeaders": "host",
+        }
+        signature = self._signature(method, uri, params, {"host": self.host}, self.UNSIGNED_PAYLOAD, now)
+        return f"{self.scheme}://{self.host}{uri}?{self._canonical_query(params)}&X-Amz-Signature={signature}"
+
+    def _signed_headers(self, method: str, uri: str, params: dict[str, str]) -> dict[str, str]:
+        now = datetime.now(timezone.utc)
+        headers = {
+            "host": self.host,
+            "x-amz-content-sha256": self.UNSIGNED_PAYLOAD,
+            "x-amz-date": now.strftime("%Y%m%dT%H%M%SZ"),
+        }
+        signature = self._signature(method, uri, params, headers, self.UNSIGNED_PAYLOAD, now)
+        credential = f"{self.access_key}/{now.strftime('%Y%m%d')}/{self.region}/s3/aws4_request"
+        headers["authorization"] = (
+            f"{self.ALGORITHM} Credential={credential}, SignedHeaders={';'.join(sorted(headers))}, "
+            f"Signature={signature}"
+        )
+        return headers
+
+    async def _request(
+        self, method: str, file_url: str | None, params: dict[str, str] | None = None, **kwargs: object
+    ) -> httpx.Response:
+        params = params or {}
+        if file_url is not None:
+            uri = self._canonical_uri(file_url)
+        else:
+            uri = f"/{self.bucket}" if self.path_style else "/"  # 버킷 단위 요청 (ListObjectsV2)
+        url = f"{self.scheme}://{self.host}{uri}"
+        if params:
+            url = f"{url}?{self._canonical_query(params)}"
+        return await self._get_client().request(
+            method, url, headers=self._signed_headers(method, uri, params), **kwargs  # type: ignore[arg-type]
+        )
+
+    async def persist(self, file_urls: Sequence[str]) -> None:
+        for file_url in file_urls:
+            local_path = os.path.join(config.MEDIA_DIR, file_url)
+            # 파일 열기와 읽기는 블로킹이므로 이벤트 루프 밖에서 한다.
+            response = await self._request(
+                "PUT", file_url, content=await run_in_threadpool(read_media_file, local_path)
+            )
+            response.raise_for_status()
+            # 저장소에 올라간 뒤에는 로컬 사본이 필요 없다.
+            await run_in_threadpool(os.remove, local_path)
+
+    async def exists(self, file_url: str) -> bool:
+        return await self.size(file_url) is not None
+
+    async def size(self, file_url: str) -> int | None:
+        response = await self._request("HEAD", file_url)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return int(response.headers["content-length"])
+
+    async def fetch(self, file_url: str, max_size: int) -> str:
+        url = f"{self.scheme}://{self.host}{(uri := self._canonical_uri(file_url))}"
+        async with self._get_client().stream("GET", url, headers=self._signed_headers("GET", uri, {})) as response:
+            response.raise_for_status()
+            await write_chunks(response.aiter_bytes(), file_url, max_size)
+        return os.path.join(config.MEDIA_DIR, file_url)
+
+    async def delete_many(self, file_urls: Sequence[str]) -> int:
+        deleted = 0
+        for file_url in file_urls:
+            response = await self._request("DELETE", file_url)
+            if response.status_code != 404:
+                response.raise_for_status()
+                deleted += 1
+        return deleted
+
+    async def iter_stale(self, prefix: str, modified_before: float, batch_size: int) -> AsyncIterator[list[str]]:
+        # ListObjectsV2 의 한 페이지(최대 batch_size 개)를 한 묶음으로 돌려준다.
+        params = {"list-type": "2", "prefix": f"{prefix}/", "max-keys": str(batch_size)}
+        while True:
+            response = await self._request("GET", None, params)
+            response.raise_for_status()
+            root = ElementTree.fromstring(response.content)
+            stale: list[str] = []
+            for item in root.iter(f"{self.S3_NAMESPACE}Contents"):
+                key = item.findtext(f"{self.S3_NAMESPACE}Key", "")
+                if not (last_modified := item.findtext(f"{self.S3_NAMESPACE}LastModified", "")):
+                    continue
+                if datetime.fromisoformat(last_modified.replace("Z", "+00:00")).timestamp() < modified_before:
+                    stale.append(key)
+            if stale:
+                yield stale
+            if not (token := root.findtext(f"{self.S3_NAMESPACE}NextContinuationToken")):
+                return
+            params["continuation-token"] = token
+
+    def presign_upload(self, file_url: str, expires_in: int) -> PresignedUpload:
+        return PresignedUpload(url=self.presign("PUT", file_url, expires_in))
+
+    def public_url(self, file_url: str) -> str | None:
+        return self.presign("GET", file_url, self.public_url_expires_in)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def create_storage() -> StorageBackend:
+    if config.STORAGE_BACKEND == "s3":
+        return S3Storage(
+            endpoint_url=config.S3_ENDPOINT_URL,
+            bucket=config.S3_BUCKET,
+            access_key=config.S3_ACCESS_KEY,
+            secret_key=config.S3_SECRET_KEY,
+            region=config.S3_REGION,
+            path_style=config.S3_PATH_STYLE,
+        )
+    return LocalStorage(secret_key=config.SECRET_KEY)
+
+
+storage = create_storage()
@@ -0,0 +1,43 @@
+# benchmarks/bench_jwt_decode.py
+# jwt.decode 직접 호출과 token_cache 를 거치는 decode_access_token 의 호출당 비용을 비교한다.
+#
+#   python -m Day6.benchmarks.bench_jwt_decode [--number 20000]
+
+import argparse
+import timeit
+from datetime import timedelta
+
+import jwt
+
+from Day6.app.configs import config
+from Day6.app.utils.jwt import create_access_token, decode_access_token, token_cache
+
+
+def main(number: int) -> None:
+    assert (algorithm := config.JWT_ALGORITHM) is not None
+    token = create_access_token({"user_id": 1}, expires_delta=timedelta(minutes=30))
+    cold_tokens = iter([create_access_token({"user_id": i}, timedelta(minutes=30)) for i in range(number)])
+
+    def jwt_decode() -> None:
+        jwt.decode(token, config.SECRET_KEY, algorithms=[algorithm])  # type: ignore[arg-type]
+
+    def cached_hit() -> None:
+        decode_access_token(token)
+
+    def cached_miss() -> None:
+        decode_access_token(next(cold_tokens))
+
+    token_cache.clear()
+    decode_access_token(token)
+
+    for label, func in (("jwt.decode", jwt_decode), ("cache hit", cached_hit), ("cache miss", cached_miss)):
+        elapsed = timeit.timeit(func, number=number)
+        print(f"{label:12s} {elapsed / number * 1_000_000:8.2f}us/op")
+
+    print(token_cache.stats())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    main(parser.parse_args().number)
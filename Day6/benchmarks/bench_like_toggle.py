@@ -0,0 +1,82 @@
+# benchmarks/bench_like_toggle.py
+# 여러 유저가 같은 리뷰에 좋아요/취소를 동시에 반복할 때의 처리량과 지연시간을
+# get_or_create + save (이전 방식) / 한 문장 업서트 (ReviewLikeService) 로 비교한다.
+#
+#   python -m Day6.benchmarks.bench_like_toggle [--seconds 5] [--users 16]
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from tortoise.expressions import F
+from tortoise.transactions import in_transaction
+
+from Day6.app.models.likes import ReviewLike
+from Day6.app.models.movies import Movie
+from Day6.app.models.reviews import Review
+from Day6.app.models.users import User
+from Day6.app.services.likes import like_count_reconciler, review_like_service
+from Day6.benchmarks.utils import bench_client, summarize
+
+Toggle = Callable[[int, int], Awaitable[object]]
+
+
+async def legacy_like(user_id: int, review_id: int) -> None:
+    async with in_transaction():
+        review_like, created = await ReviewLike.get_or_create(user_id=user_id, review_id=review_id)
+        if created or not review_like.is_liked:
+            review_like.is_liked = True
+            await review_like.save()
+            await Review.filter(id=review_id).update(like_count=F("like_count") + 1)
+
+
+async def legacy_unlike(user_id: int, review_id: int) -> None:
+    async with in_transaction():
+        if (review_like := await ReviewLike.get_or_none(user_id=user_id, review_id=review_id)) and review_like.is_liked:
+            review_like.is_liked = False
+            await review_like.save()
+            await Review.filter(id=review_id).update(like_count=F("like_count") - 1)
+
+
+async def _toggle_storm(
+    user_id: int, review_id: int, like: Toggle, unlike: Toggle, seconds: float, samples: list[float]
+) -> None:
+    deadline = time.perf_counter() + seconds
+    liked = False
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        # 더블탭: 같은 요청을 두 번 동시에 보낸다.
+        toggle = unlike if liked else like
+        await asyncio.gather(toggle(user_id, review_id), toggle(user_id, review_id))
+        samples.append((time.perf_counter() - started) * 1000)
+        liked = not liked
+
+
+async def run_scenario(label: str, like: Toggle, unlike: Toggle, user_ids: list[int], seconds: float) -> None:
+    movie = await Movie.create(title=label, plot="plot", cast=[], playtime=90, genre="SF")
+    review = await Review.create(user_id=user_ids[0], movie_id=movie.id, title=label, content="bench")
+    samples: list[float] = []
+    await asyncio.gather(*(_toggle_storm(user_id, review.id, like, unlike, seconds, samples) for user_id in user_ids))
+
+    drift = await like_count_reconciler.reconcile()
+    print(f"{label:22s} {summarize(samples)}  toggles/s={len(samples) / seconds:8.1f}  drifted={drift}")
+
+
+async def main(seconds: float, users: int) -> None:
+    async with bench_client():
+        user_ids = [
+            (await User.create(username=f"bench_like_{i}", hashed_password="x", age=20, gender="male")).id
+            for i in range(users)
+        ]
+
+        await run_scenario("before (get_or_create)", legacy_like, legacy_unlike, user_ids, seconds)
+        await run_scenario("after (upsert)", review_like_service.like, review_like_service.unlike, user_ids, seconds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--users", type=int, default=16, help="동시에 좋아요/취소를 반복하는 유저 수")
+    args = parser.parse_args()
+    asyncio.run(main(args.seconds, args.users))
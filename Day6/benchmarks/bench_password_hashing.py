@@ -0,0 +1,72 @@
+# benchmarks/bench_password_hashing.py
+# 로그인 폭주 중 GET /movies 지연시간(p95)을 bcrypt 인라인 실행 / 프로세스 풀 실행으로 비교한다.
+#
+#   python -m Day6.benchmarks.bench_password_hashing [--seconds 5] [--logins 8]
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from Day6.app.services.password import password_hasher
+from Day6.benchmarks.utils import bench_client, summarize
+
+USERNAME = "bench_user"
+PASSWORD = "bench_password"
+
+
+async def _login_storm(client: httpx.AsyncClient, stop: asyncio.Event) -> int:
+    count = 0
+    while not stop.is_set():
+        await client.post("/users/login", data={"username": USERNAME, "password": PASSWORD})
+        count += 1
+    return count
+
+
+async def _measure_movies(client: httpx.AsyncClient, seconds: float) -> list[float]:
+    samples: list[float] = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await client.get("/movies")
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.005)
+    return samples
+
+
+async def run_scenario(client: httpx.AsyncClient, seconds: float, logins: int) -> tuple[list[float], int]:
+    stop = asyncio.Event()
+    storm = [asyncio.create_task(_login_storm(client, stop)) for _ in range(logins)]
+    samples = await _measure_movies(client, seconds)
+    stop.set()
+    return samples, sum(await asyncio.gather(*storm))
+
+
+async def main(seconds: float, logins: int) -> None:
+    async with bench_client() as client:
+        await client.post("/users", json={"username": USERNAME, "password": PASSWORD, "age": 20, "gender": "male"})
+        for i in range(20):
+            await client.post(
+                "/movies",
+                json={"title": f"movie{i}", "plot": "plot", "cast": [], "playtime": 90, "genre": "SF"},
+            )
+
+        print(f"idle                 {summarize(await _measure_movies(client, seconds))}")
+
+        workers = password_hasher.max_workers or 2
+        for label, max_workers in (("before (inline)", 0), (f"after (pool x{workers})", workers)):
+            password_hasher.shutdown()
+            password_hasher.max_workers = max_workers
+            samples, login_count = await run_scenario(client, seconds, logins)
+            print(f"{label:20s} {summarize(samples)}  logins={login_count}")
+
+        password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--logins", type=int, default=8, help="동시에 로그인을 반복하는 클라이언트 수")
+    args = parser.parse_args()
+    asyncio.run(main(args.seconds, args.logins))
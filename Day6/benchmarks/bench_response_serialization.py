@@ -0,0 +1,101 @@
+# benchmarks/bench_response_serialization.py
+# GET /movies, GET /users 의 초당 처리량을 FastAPI 기본 직렬화(response_model + jsonable_encoder + json.dumps)와
+# FastJSONResponse/ResponseSerializer 경로로 비교한다.
+#
+#   python -m Day6.benchmarks.bench_response_serialization [--seconds 3] [--rows 100]
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+
+from Day6.app.models.movies import Movie
+from Day6.app.models.users import User
+from Day6.app.schemas.movies import (
+    MoviePageResponse,
+    MovieResponse,
+    movie_page_serializer,
+)
+from Day6.app.schemas.users import UserResponse
+from Day6.benchmarks.utils import bench_client
+
+CAST = [{"name": f"actor{i}", "age": 20 + i, "agency": "A actors", "gender": "male"} for i in range(10)]
+
+# 변경 전 라우터와 같은 방식으로 응답하는 비교용 앱
+baseline_app = FastAPI()
+
+
+@baseline_app.get("/movies", response_model=MoviePageResponse)
+async def baseline_search_movie(limit: int = 20) -> MoviePageResponse:
+    movies = await Movie.all().order_by("created_at", "id").limit(limit)
+    return MoviePageResponse(items=[MovieResponse.model_validate(movie) for movie in movies])
+
+
+@baseline_app.get("/users", response_model=list[UserResponse])
+async def baseline_get_all_users() -> list[User]:
+    return await User.all()
+
+
+async def requests_per_second(client: httpx.AsyncClient, url: str, seconds: float) -> float:
+    count = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        response = await client.get(url)
+        assert response.status_code == 200, response.text
+        count += 1
+    return count / elapsed
+
+
+def serialization_only(rows: int, number: int = 200) -> None:
+    page: dict[str, Any] = {
+        "items": [
+            {"id": i, "title": f"t{i}", "plot": "p" * 500, "cast": CAST, "playtime": 90, "genre": "SF"}
+            for i in range(rows)
+        ],
+        "next_cursor": None,
+    }
+    model = MoviePageResponse.model_validate(page)
+
+    started = time.perf_counter()
+    for _ in range(number):
+        json.dumps(jsonable_encoder(model)).encode()
+    default_ms = (time.perf_counter() - started) / number * 1000
+
+    started = time.perf_counter()
+    for _ in range(number):
+        movie_page_serializer.dump_json(page)
+    fast_ms = (time.perf_counter() - started) / number * 1000
+
+    print(f"serialize {rows} movies   default={default_ms:.3f}ms  fast={fast_ms:.3f}ms  ({default_ms / fast_ms:.1f}x)")
+
+
+async def main(seconds: float, rows: int) -> None:
+    serialization_only(rows)
+
+    async with bench_client() as client:
+        await Movie.bulk_create(
+            [Movie(title=f"movie{i}", plot="p" * 500, cast=CAST, playtime=90, genre="SF") for i in range(rows)]
+        )
+        await User.bulk_create(
+            [User(username=f"user{i}", hashed_password="x", age=20, gender="male") for i in range(rows)]
+        )
+
+        baseline = httpx.AsyncClient(transport=httpx.ASGITransport(app=baseline_app), base_url="http://bench")
+        async with baseline:
+            for url in (f"/movies?limit={min(rows, 100)}", "/users"):
+                before = await requests_per_second(baseline, url, seconds)
+                after = await requests_per_second(client, url, seconds)
+                print(f"GET {url:20s} before={before:8.1f} req/s  after={after:8.1f} req/s  ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--rows", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.seconds, args.rows))
@@ -0,0 +1,36 @@
+# benchmarks/utils.py
+# 벤치마크 공용 유틸. MySQL 대신 메모리 sqlite 로 앱을 띄워 프로세스 안에서 측정한다.
+
+import statistics
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+from tortoise import Tortoise
+
+from Day6.app.configs.database import TORTOISE_APP_MODELS
+from Day6.app.main import app
+
+
+@asynccontextmanager
+async def bench_client() -> AsyncIterator[httpx.AsyncClient]:
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": TORTOISE_APP_MODELS})
+    await Tortoise.generate_schemas()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            yield client
+    finally:
+        await Tortoise.close_connections()
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100, method="inclusive")[int(pct) - 1]
+
+
+def summarize(samples_ms: list[float]) -> str:
+    return (
+        f"n={len(samples_ms):5d}  p50={percentile(samples_ms, 50):8.2f}ms  "
+        f"p95={percentile(samples_ms, 95):8.2f}ms  max={max(samples_ms, default=0.0):8.2f}ms"
+    )
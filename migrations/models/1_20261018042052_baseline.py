@@ -0,0 +1,70 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS `reviews` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `created_at` DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    `title` VARCHAR(50) NOT NULL,
+    `content` LONGTEXT NOT NULL,
+    `review_image_url` VARCHAR(255),
+    `movie_id` INT NOT NULL,
+    `user_id` INT NOT NULL,
+    UNIQUE KEY `uid_reviews_user_id_44b823` (`user_id`, `movie_id`),
+    CONSTRAINT `fk_reviews_movies_56a147b9` FOREIGN KEY (`movie_id`) REFERENCES `movies` (`id`) ON DELETE CASCADE,
+    CONSTRAINT `fk_reviews_users_8aed0759` FOREIGN KEY (`user_id`) REFERENCES `users` (`id`) ON DELETE CASCADE
+) CHARACTER SET utf8mb4;
+        CREATE TABLE IF NOT EXISTS `review_likes` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `created_at` DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    `is_liked` BOOL NOT NULL DEFAULT 1,
+    `review_id` INT NOT NULL,
+    `user_id` INT NOT NULL,
+    UNIQUE KEY `uid_review_like_user_id_c69f9e` (`user_id`, `review_id`),
+    CONSTRAINT `fk_review_l_reviews_6cb49859` FOREIGN KEY (`review_id`) REFERENCES `reviews` (`id`) ON DELETE CASCADE,
+    CONSTRAINT `fk_review_l_users_5cd4a3e1` FOREIGN KEY (`user_id`) REFERENCES `users` (`id`) ON DELETE CASCADE
+) CHARACTER SET utf8mb4;
+        ALTER TABLE `movies` ADD `poster_image_url` VARCHAR(255);
+        ALTER TABLE `users` ADD `profile_image_url` VARCHAR(255);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `movies` DROP COLUMN `poster_image_url`;
+        ALTER TABLE `users` DROP COLUMN `profile_image_url`;
+        DROP TABLE IF EXISTS `review_likes`;
+        DROP TABLE IF EXISTS `reviews`;"""
+
+
+MODELS_STATE = (
+    "eJztW21z2jgQ/isePqUzuU6SS9KGb4bAhWvAN8bptQ0Zj2IL8ESWqCwnYTr57yfJNn6nmI"
+    "MEJv6SwGrX0j5a7e5jm18Nl9gQeR/75NGBjabyq4GBKz6kBw6VBpjNYrEQMHCPQk2uIkXg"
+    "3mMUWIxLxwB5kIts6FnUmTGHYC7FPkJCSCyu6OBJLPKx89OHJiMTyKaQ8oHbOy52sA2f+c"
+    "XDr7MHc+xAZKdW6thibik32XwmZT3MulJRzHZvWgT5Lo6VZ3M2JXih7WAmpBOIIQUMissz"
+    "6ovli9WFfkYeBSuNVYIlJmxsOAY+Ygl3V8TAIljgx1fjSQcnYpY/To5PP51+/vP89DNXkS"
+    "tZSD69BO7FvgeGEoGB0XiR44CBQEPCGONmUSicNQHL43fJR5jjwmIQ05YZMO3Q9GP0IQtt"
+    "BOQybCNBDG4cUBtCl/tgaxjNw41bAqXR63eGhtr/R3jiet5PJCFSjY4YOZHSeUZ6cP5ByA"
+    "k/DsEpWVxE+bdnXCniq/JDG3QkgsRjEypnjPWMHw2xJuAzYmLyZAI7EWORNAKGa8YbyxyG"
+    "YH5P21NAi/dzYZDZSo7Xjm6eC55NBPGETcV5ODtbsntfVb19peoHXCuzJYNw6CQYe0mBOE"
+    "Ok4FwY8LkksUT6+wLhsnjvfDNSoR4BddBXv31Ihfu1NvgrUk8A277WWhk8LeAV4Pn3UBuU"
+    "5JhQP4PnDeZ+3tqOxQ4V5Hjsbu/QFS4vRzcLZCZDiAtk0Z0hMI9y7YqVMGny+3q4G7Bupi"
+    "TGsHEPaUmm7GDflcD1+AoAtmAOwIXxGx/5xrDbVIbdEVYvv3YGxo3eaSqq/Qgx8ykcYV3r"
+    "q4M2l+nEFX6McFvr99pNpU1cxxrhrjow1OH3ptIFmAFvPsLDdq8jLYaWA6VF//vQ6Ohcpz"
+    "/3GKRcR20bPW3AJ7LEKkb4StN1TW8qV4RSIv2vmsUvVsjhF6UZ/CKXv4lYqem4YAJNn6Iq"
+    "9bDIdq1NDqv1/ldG0XyPHxJtpBDcA+vhCVDbTI3EW0AhJwZPXh75VmjY/aJDBKSLeYRDAq"
+    "LLi+xmOnqJAieSRr2kQIeckDK88kPuiZuVAMyjzw7nFjOFgNx4kh7lmJqUHy4jaj7XqHla"
+    "zdNqnrYbPE2cR/m5QmlK2mym79j68UhVpLOjFQrS2VFpPRJD6UI/Bd6Ux/gMeN4ToQU5ph"
+    "zMAtN9oW+vwIB5+amQsEPtd8wk7KD+rkklQuu35hIuQLCpiL8jPIbBt+D/Oj39+QpRmU3A"
+    "cUyeZyMSAY+ZiEwcXLUSpi03UAlfv7Pfk8IXub208s0oGTsIrsnOioxrelbTs5XpWTIUAx"
+    "RM5DzAjUBxzS+0Z3Bsk62G8VHAV+PIKWesiRDdLGe9lY20TIzyAeddTWJrEluT2Pph4xsQ"
+    "WD4dg7jSw8aEyb6g+NrPG8O6vlaHWWT7vhvMw1T95uiYlQph0uS93iEQDUc11BIW7wm0HJ"
+    "lJY5gHsEsodCb4C5zn7rIUd+rRo5Ldw6+sR+diCp4W/WgyNLh73CnIgpymDtvqZaeRP7Ab"
+    "gG3xLuD+4pZMRMXArcKca7K4TbIoQSkljBFkvyONMaPfFnMM5qmpY00da+q4FnV0PHlIC4"
+    "5FixAEAS45GgmzzJ7ec7ttbePi1Gya/rQ07Tq1Y61elt/c9Fsd/eBYbhVXcoKale8xI+JS"
+    "JdOkbN5Tn1k353Vz/vbNOV3cBv+fuO3jk5gscqlcVLU/32ZnqkLqWNNGQVcajiztSEGsU7"
+    "95t2MJbVnn+QipF7K4VW8dJkz25c7sa7xKxI9GBRBD9f0E8PholScEXKsUQDm24jOCJT+g"
+    "KX1GUP+GZvEbmgovTmy+vLz8BwujIB0="
+)
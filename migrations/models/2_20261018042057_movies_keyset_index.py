@@ -0,0 +1,44 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `movies` ADD INDEX `idx_movies_created_6a3d1d` (`created_at`, `id`);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `movies` DROP INDEX `idx_movies_created_6a3d1d`;"""
+
+
+MODELS_STATE = (
+    "eJztW21z2jgQ/isePqUzuU6SS9KGb4bAhWvAN8bptQ0Zj2IL8ESWqCwnYTr57yfJNn6nmI"
+    "MkDP6SwGrX0j5a7e5jm18Nl9gQeR/75NGBjabyq4GBKz6kBw6VBpjNYrEQMHCPQk2uIkXg"
+    "3mMUWIxLxwB5kIts6FnUmTGHYC7FPkJCSCyu6OBJLPKx89OHJiMTyKaQ8oHbOy52sA2f+c"
+    "X519uGRSFg0DYBE5M5duNOqMwezLEDkZ1aPR/kQ1JusvlMynqYdaWiWMG9aRHkuzhWns3Z"
+    "lOCFtoPlLBOIIRWzchmjvnBJrDj0PfIyWH2sEiw7YWPDMfARS0CwIi4WwQJTvhpPOjgRs/"
+    "xxcnz66fTzn+enn7mKXMlC8uklcC/2PTCUCAyMxoscBwwEGhLaGLc0xGn8LvkIc1xYDGLa"
+    "MgOmHZp+jD5koY2AXIZtJIjBjYNsQ+hyH2wNo3m4cUugNHr9ztBQ+/8IT1zP+4kkRKrRES"
+    "MnUjrPSA/OPwg54UckODmLiyj/9owrRXxVfmiDjkSQeGxC5YyxnvGjIdYEfEZMTJ5MYCdi"
+    "LJJGwHDNeGOZwxDM72l7Cmjxfi4MMlvJ8Xqnm+eCZxNBPGFTcR7Ozpbs3ldVb1+p+gHXym"
+    "zJIBw6CcZeUiDOECk4FwZ8Lkkskf6uQLgs3jvfjFSoR0Ad9NVvH1Lhfq0N/orUE8C2r7VW"
+    "Bk8LeAV4/j3UBiU5JtTP4HmDuZ+3tmOxQwU5HrvbOXSFy8vRzQKZyRDiAll0ZwjMo1y7Yi"
+    "VMmvy+Hr4PWDdTEmPYuIe0JFN2sO9K4Hp8BQBbMAfgwviNj3xj2G0qw+4Iq5dfOwPjRu80"
+    "FdV+hJj5FI6wrvXVQZvLdOIKP0a4rfV77abSJq5jjXBXHRjq8HtT6QLMgDcf4WG715EWQ8"
+    "uB0qL/fWh0dK7Tn3sMUq6jto2eNuATWWIVI3yl6bqmN5UrQimR/lfN4hcr5PCL0gx+kcvf"
+    "RKzUdFwwgaZPUZV6WGS71iaH1Xr3K6NovscPiTZSCO6B9fAEqG2mRuItoJCThScvj3wrNO"
+    "x+0SEC0sU8wiEp0eVF3mc6eokCJ5JGvaRAh5yQMrzyQ+6Jm5UAzKPPDucWM4WA3HiSMuXY"
+    "m5QfLiNvPtfYPneredpaRanmaXvH08R5lJ8rlKakzWb6jq0fj1RFOjtaoSCdHZXWIzGULv"
+    "RT4E15jM+A5z0RWpBjysEsMN0V+vYKDJiXnwoJO9TeYyZhB/V3TSoRWr81l3ABgk1F/B3h"
+    "MQy+Bf/X6enPV4jKbAKOY/I8G5EIeMxEZOLgqpUwbbmBSvj6nf2OFL7I7aWVb0bJ2EFwTX"
+    "ZWZFzTs5qerUzPkqEYoGAi5wFuBIprfqEdg2ObbDWMjwK+GkdOOWNNhOhmOeutbKRlYpQP"
+    "Pe9qEluT2JrE1g8b34DA8ukYxJUeNiZMdgXF137eGNb1tTrMItv9bjAPU/Wbo2NWKoRJk3"
+    "29QyAajmqoJSz2CbQcmUljmAewSyh0JvgLnOfushR36tGjkveHX1mPzsUUPC360WRocPe4"
+    "U5AFOU0dttXLTiN/YDcA2+L9wN3FLZmIioFbhTnXZHGbZFGCUkoYI8h+RxpjRr8t5hjMU1"
+    "PHmjrW1HEt6uh48pAWHIsWIQgCXHI0EmaZPb3ndtvaxsWp2TT9aWnadWrHWr0sv7nptzr6"
+    "wbHcKq7kBDUr32NGxKVKpknZ7FOfWTfndXP+9s05XdwG/5+47eKTmCxyqVxUtT/fZmeqQu"
+    "pY00ZBVxqOLO1IQaxTv3n3zhLass7zEVIvZHGr3jpMmOzKndnXeJWIH40KIIbquwng8dEq"
+    "Twi4VimAcmzFZwRLfkBT+oyg/g3N4jc0FV6c2Hx5efkP+OYmgg=="
+)
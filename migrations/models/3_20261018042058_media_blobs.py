@@ -0,0 +1,57 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS `media_blobs` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `created_at` DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    `path` VARCHAR(255) NOT NULL UNIQUE,
+    `sha256` VARCHAR(64) NOT NULL,
+    `size` BIGINT NOT NULL,
+    `ref_count` INT NOT NULL DEFAULT 0,
+    KEY `idx_media_blobs_sha256_098c7f` (`sha256`)
+) CHARACTER SET utf8mb4 COMMENT='내용(sha256) 기준으로 한 번만 저장되는 미디어 파일과 그 참조 수';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS `media_blobs`;"""
+
+
+MODELS_STATE = (
+    "eJztW1tz2jgU/isMT+lMtkO4w5uh0LAN0AHSbRsyHmEL0MSWqC03ZTv57yvJNr5TzEIST/"
+    "wC+Fws6ZN0zvls8buoExVq5vsh+YlgsV34XcRA5z+CistCEWw2npgLKFhojiUzESKwMKkB"
+    "FMqkS6CZkIlUaCoG2lBEMJNiS9O4kCjMEOGVJ7Iw+mFBmZIVpGtoMMXdPRMjrMJf7Obs8q"
+    "6oGBBQqMqA8saQWrznJpsHeYmgpgZ6z5RMJeQy3W6EbIBpXxjyHixkhWiWjj3jzZauCd5Z"
+    "IyxaWUEMDd4qk1HD4kPiPXbG7o7S7r1nYnfb56PCJbA06oPgQFwUgjmmrDemGOCKt/JX+a"
+    "raqDYr9WqTmYie7CSNJ3t43thtR4HAaFZ8EnpAgW0hoPVwC0IcxO8D01Ckw3gQg54hMFXH"
+    "9b37IwytC+Q+bF2BB663yE6ELhuDOsba1pm4PVDOBsPedCYNP/OR6Kb5QxMQSbMe15SFdB"
+    "uSXtTfcTlhW8TeObubFP4ZzK4L/LLwfTzqCQSJSVeGaNGzm30v8j4BixIZk0cZqL415kpd"
+    "YJilN7EUUQ1G57S7Bkb8fO4cQlPJ8Hqlk6eDX7IG8Yqu+X6o1fbM3hdp0r2WJhfMKjQlI0"
+    "dVtnVPARA3GonZFzP4KyGwuPZZgXDfeu99nQWWugvUxVD6+i6w3G/Go4+uuQ/Y7s24E8JT"
+    "AWYMnn9Px6OEGOPYh/C8xWycdypS6GVBQya9zxy6fMj70Q0DGYoQ/AZhdDca2Lqx9sBM6H"
+    "f5cz58HbCeJiV6sLERGgmRsoctXQA3YD0AWIERAHfOL7zli9N+uzDtz7H04UtvNLud9NoF"
+    "Sf0JMbUMOMeT8VAadZlsQnQ+jjnujoeDbrvQJTpS5rgvjWbS9Fu70AeYAnM7x9PuoCc8pg"
+    "qCwmP4bTrrTZjNcGtSaDAbqTsbjEesIYX3Yo6vx5PJeNIuXBPDIGL8aaN464AY3kqM4K1I"
+    "/Ca8pzLSwQrKlqGlyYdxvkdNspOts58ZefG9fPCVkVywAMrDIzBUOaDxpsCAjCw8mlHkO4"
+    "5j/9MEakAMMYqwQ0om4iavMxw9uQvHlbq1JEeHlEkSXlGVXtbDEoDZ6lOdtnlLDiC3pqBM"
+    "EfYm5Jf7yJvFLM7P3XKedlRSynnam+NpfD+K3ylSk9/nNHXH2bdHICPVSgckpFopMR9xVT"
+    "DRr4G5Zmt8A0zzkRgxMSYZzBjXrNC3Z2DALP2kCNiO9RtmEqqdf4+kEo73S3MJHWiwXeCf"
+    "c7yE9pX9fUxNXz9gVYYDsLcm6+EVqQGTyhpZIZw2EwY9T5AJn7+yz0jic4e9N/NtDLJEGj"
+    "ySncU55/Qsp2cH0zP/UrRRkDX0AE8CxQ27UcbgOCdbddZHDF/1Vk4yY/Ut0dNy1jtRSIvA"
+    "KF563uckNiexOYnNXza+AIFlzVGIU71s9LlkBcXnft/o5PWjKsw437ddYF4G8jdDR06VCP"
+    "0ub/UJAS840qHm83hLoEXITBDDKIB9YkC0wp/gNvKUJb5Sd1+VvD78kmp0JjbA464e9S8N"
+    "Njw2KEjtmCZNu9KHXjG6YU8A2+58YHZx8weieOAOYc45WTwnWRSgJBJGF7I/kUaP0Z+LOd"
+    "rt5NQxp445dTyKOiJTbNKYbdEhRIMAJ2wNn1toThfM71zTuNs1p6Y/nfH4JjBjnUGY39wO"
+    "O73JxZWYKmaE7JwVrTFd4pIm0gR83lKdmRfneXH+8sW5sXsM/j9xy+KbmDBygViUtj4/Z2"
+    "U6hCoCHY0sijGFqafcW5fq3ExeMLvDytLi3FqUFtW5pdRB68Jcg3Kt/q4wtwCslJiwVeKf"
+    "jYrCzJo1hSnUmvhaKM0m+2wp/EJp2magxkTVK64ot6rcarHkF7Ur3kBtwUVqpaRw2wb7BM"
+    "qSuwN12eR3USpNfq9GiV+Ur5rhwwCvva/5scW8bM/L9tOU7RtA16nOazj2WTyueJYH6HZ4"
+    "TAOh53Gu1z1nRbFePeQcWDX5IFg1AiH6N+aJZgetEiOz65GxYr1VLlcqjXKpUm/Wqo1GrV"
+    "naxemoal/A7gw+8pgdQDiOQC4ZZlbc28g9BNLn83zwll4ZEXqZwlSCBlLWcVWpo9lbkgLP"
+    "Jv9LSIZqq5/QMJ3XC4emEJ9LVo4MPMcZd7Y1UoDomGcTwKvSIUdXmFUigEJ34OGVPf/sTj"
+    "y8kv+5e/fn7hdNL0//AaLYfV0="
+)
@@ -0,0 +1,56 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `movies` ADD `poster_image_variants` JSON;
+        ALTER TABLE `users` ADD `profile_image_variants` JSON;
+        ALTER TABLE `reviews` ADD `review_image_variants` JSON;
+        ALTER TABLE `media_blobs` ADD `variants` JSON;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `movies` DROP COLUMN `poster_image_variants`;
+        ALTER TABLE `users` DROP COLUMN `profile_image_variants`;
+        ALTER TABLE `reviews` DROP COLUMN `review_image_variants`;
+        ALTER TABLE `media_blobs` DROP COLUMN `variants`;"""
+
+
+MODELS_STATE = (
+    "eJztXFtz2jgU/iuMn9KZbIdwhzdDoWEbYAdIt23IeIQtQBNborachO3kv68k2/iCTTELCW"
+    "z8AvjoHF0+SeecT3LySzKIBnXrY488Iig1cr8kDAz+I1xwmZPAcumLuYCCqe5qMhUhAlOL"
+    "mkClTDoDugWZSIOWaqIlRQQzKbZ1nQuJyhQRnvsiG6OfNlQomUO6gCYruLtnYoQ1+MwqZ4"
+    "93kmpCQKGmAMobQ5p0z1WWD8oMQV0L9Z4VsiIhV+hqKWRdTDtCkfdgqqhEtw3sKy9XdEHw"
+    "Whth0cocYmjyVpmMmjYfEu+xO3ZvlE7vfRWn2wEbDc6ArdMABDviohLMMWW9scQA57yVPw"
+    "pXpWqpVqyUakxF9GQtqb44w/PH7hgKBPpj6UWUAwocDQGtj1sY4jB+n1gJRQaMBzFsGQFT"
+    "c00/ej+i0HpAbsPWE/jg+ovsQOiyMWgDrK/cidsC5bjba4/Gcu8vPhLDsn7qAiJ53OYlBS"
+    "FdRaQXlQ9cTtgWcXbOupLc393xdY4/5n4M+m2BILHo3BQt+nrjHxLvE7ApUTB5UoAWWGOe"
+    "1AOGafoTSxHV4eacthbAjJ/PtUFkKhleJzp5BnhWdIjndMH3Q7m8Zfa+ysPWtTy8YFqRKe"
+    "m7RQWn7CUE4lInMftiDJ8THIunfy4Qblvv7W/j0FL3gLroyd8+hJb7zaD/2VMPANu6GTQj"
+    "eKrAisHzz9Ggn+BjXP0InreYjfNOQyq9zOnIovdnhy4f8nZ0o0BGPASvIIruUgcrz9fuGA"
+    "mDJr+Ph6cB62FCog8bG6GZ4Cnb2DYEcF3WA4BVuAHg2viNt7w06jRyo84Ey5++tvvj22G7"
+    "kZO1R4ipbcIJHg56cr/FZENi8HFMcGvQ67YauRYxkDrBHbk/lkffG7kOwBRYqwketbptYT"
+    "FSERQWve+jcXvIdHori0KT6citcXfQZw2pvBcTfD0YDgfDRu6amCYR40/rxes7+PB6ogev"
+    "b/hvwnuqIAPMoWKbepp4GGe71yS70fp/FhmD6DwCEwHedgrXnljBAXz96yP+Gq6ec5/ZQy"
+    "CL54IpUB+egKkpoRJ/nkzIuNpTzMw0XcPOlyHUgRjvJvguJxyKSk4zGrx4C8uTuvMv4CIF"
+    "koTXZpFRMKISgNnq1Ny2eUsuILeWYKwb5FnIL7dxZ5tpHJ86ZzR5r5wgo8nvjibz/Sh+p8"
+    "gMgjaHSfuOvj1CCUE5v0M+UM4npgO8KJwNLIC1YGt8CSzriZgxPiYZzBjTc2HPr5BmsfCT"
+    "wmG72u+YyGlO/N2TybnWb03lDKDDRo5/TvAMOk/O9z6UqrLDqow6YH9NVqIrUgcWVXQyRz"
+    "htJAxbHiASnlSaf0qBzxv21si3NMkM6XBPchxnnLHjeGz3oseJNWT8+DLjxwfgx8H16qCg"
+    "6OgBHgSKG1bRmcFxzOMCd33EHBj4Kyf5yCCwRA97aHAnmIzYe+LS/z47RchOEbJThOyy/Q"
+    "1OEFhzFOJUl+0Bk3NB8bXv2924vleKH2ebZfixyO6T4CdWkOX3Cfn9ZSh9YugpqfKQoMl7"
+    "PSHj+V461AIW7wm0DS4ZxnATwA4xIZrjL3C1ccoYT5S8q8LTwy+JIjGxCZ7WdCC4NNjw2K"
+    "AgdUKKPGrJn9rS5oY9AGzr15PPF7egI4oHbpeDi4yrH5OrC1AS+boH2e84u3+gcizi7rST"
+    "MfeMuWfMfS/mjiyxSWO2RZMQHQKcsDUCZpE5nTK7Y03jetccOklvDgY3oRlrdqP08rbXbA"
+    "8vrsRUMSXkxKzNHNMjNmk8TcjmPeWZWXKeJedvn5yb61uI/4jbOV6ERZEL+aK0+fkxM9Me"
+    "1BBo6mQqxSSmfuHWvNTgasqU6e2WlkoTe5qflia2WgH1C2sBCuXKh9zEBrCYZ8J6nn9Wiy"
+    "pTq5VVVqCVxddUrdXYZ13lD2rNUQNlJipd8YJCvcS1pjP+UL7iDZSnXKQV8yrXrbJPoM64"
+    "OdBmNV6LWqzxuqp5/lC4qkmRaT/1vmav7WZpe5a2HyZtXwK6SHOZ4emf4+u6R7m/cNxjGg"
+    "h9i2Pdth0VxUppl/cgS8kvQpY2IET/xJxoNtE80TN7FmeWrNcLhWKxWsgXK7VyqVot1/Jr"
+    "P71ZtM1hN7ufuc8OIRxHIGcMMzvuMngLgQzYvB68+bcOfT5q+9xBZteOh32t8JjZvwxNpC"
+    "6kmNTfLdma9wNfJ/u7szNKYB+habl3OLvG6YDJubwW8xp/SMO2RgoQXfXzBPAqv8vrWUwr"
+    "EUBRtuMLWlv+e0fiC1rZP/A4jfDy8i9X+WY1"
+)
@@ -0,0 +1,50 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `media_blobs` ADD `referenced_at` DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `media_blobs` DROP COLUMN `referenced_at`;"""
+
+
+MODELS_STATE = (
+    "eJztXG1z2jgQ/iuMP6UzuQ7hHb4ZCg3XADdAem1DxiNsAZrYMrXlJFwn//0k2cbvFHMmgY"
+    "u/ELzataRH0u4+ksgvQdMVqJofB/ojgkKr8EvAQGNfggWXBQGs156YCQiYq44mVeEiMDeJ"
+    "AWRCpQugmpCKFGjKBloTpGMqxZaqMqEuU0WEl57IwuinBSWiLyFZQYMW3N1TMcIKfKYvp4"
+    "93gmxAQKAiAcIqQ4pwz1TWD9ICQVUJtJ4W0iIul8hmzWV9THpckbVgLsm6amnYU15vyErH"
+    "W22EeS1LiKHBaqUyYlisS6zFTt/dXtqt91TsZvtsFLgAlkp8EOyJi6xjhiltjck7uGS1/F"
+    "G6qtQrjXKt0qAqvCVbSf3F7p7Xd9uQIzCcCi+8HBBga3BoPdyCEAfx+0RLCNJgPIhByxCY"
+    "imP60f0ShtYFche2rsAD15tkGaFL+6CMsLpxBm4HlNP+oDuZioO/WE800/ypcojEaZeVlL"
+    "h0E5Je1D4wuU6XiL1yti8p/N2fXhfYY+HHaNjlCOomWRq8Rk9v+kNgbQIW0SWsP0lA8c0x"
+    "V+oCQzW9gSWIqDA6pp0VMOLHc2sQGkqK14kOngaeJRXiJVmx9VCt7hi9r+K4cy2OL6hWaE"
+    "iGTlHJLnsJgLhW9Zh1MYXPCY7F1T8XCHfN9+63aWCqu0BdDMRvHwLT/WY0/Oyq+4Dt3Iza"
+    "ITxlYMbg+edkNEzwMY5+CM9bTPt5pyCZXBZUZJL7s0OXdXk3umEgQx6CvSCM7loFG9fX7h"
+    "kJ/Sa/j4enAWs2IdGDjfbQSPCUXWxpHLg+bQHAMowAuDV+4yUvTHqtwqQ3w+Knr93h9Hbc"
+    "bRVE5RFiYhlwhsejgTjsUNlY11g/ZrgzGvQ7rUJH15A8wz1xOBUn31uFHsAEmJsZnnT6XW"
+    "4xkRHkFoPvk2l3THUGG5NAg+qInWl/NKQVyawVM3w9Go9H41bhWjcMnfc/rRdv7uHDm4ke"
+    "vBnx3zprqYQ0sISSZahp4mGc7UGD7ETr/1lk9KPzCAwEWN0pXHviCzLw9a+P+Gu4esZ9Fg"
+    "++LJ4J5kB+eAKGIgVKvHEyIOVqTzEj03YMe1/GUAW8v1HwHU445i85zWjw4k4sV+qMP4dL"
+    "L+lJeEWLtJIWlgBMZ6fi1M1qcgC5NTljjZBnLr/cxZ0tqnF86pzT5INygpwmvzuazNYj/5"
+    "4iM/DbZJP2HX15BBKCanGPfKBaTEwHWFEwG1gBc0Xn+BqY5pNuxPiYZDBjTM+FPb9CmkXD"
+    "TwqH7Wi/YyKn2PH3QCbnWL81ldOAClsF9jnDC2g/2X8PoVS1PWZl2AF7c7IWnpEqMImk6k"
+    "uE00bCoGUGkfCk0vxTCnxut3dGvrWhL5AKDyTHccY5O47H9iB6nPiGnB9f5vw4A37sn682"
+    "CpKKHmAmUNzQF50ZHMfcLnDmR8yGgTdzkrcMfFM0202DO85k+Nrjh/73+S5CvouQ7yLkh+"
+    "1vsINAqyMQpzps95mcC4qvfd7uxPWDUvw42zzDj0X2kAQ/8QV5fp+Q318G0ieKnpQqD/Gb"
+    "vNcdMpbvpUPNZ/GeQItwySCGUQB7ugHREn+Bm8guYzxRco8KTw+/JIpExQZ42tIB/9Sg3a"
+    "OdgsQOKeKkI37qCtEFmwFs2+vJ54ub3xHFA7fPxkXO1Y/J1TkoiXzdhex3nN3bUDkWcbfr"
+    "yZl7ztxz5n4Qc0cmX6Qxy6Kt6yoEOGFp+MxCYzqndscaxu2qyTpJb49GN4ERa/fD9PJ20O"
+    "6OL674UFElZMesaI7pEps0niZg857yzDw5z5Pzt0/Oje0pxH/E7RwPwsLIBXxR2vz8mJnp"
+    "ACoItFV9LsQkpl7hzrxUY2rSnOrtl5YKM2tenFdmllwDzQtzBUrV2ofCzAKwXKTCZpF91s"
+    "syVWtUZVqgVPmfudxo0M+mzB7khq0GqlRUuWIFpWaFac0X7KF6xSqozplIKRdlplunn0Be"
+    "MHOgLBrsLXK5wd5VL7KH0lVDCA37qbc1v7abp+152p5N2r4GZJXmMMPVP8frukc5v7DdYx"
+    "oIPYtjnbYdFcVaZZ97kJXki5CVCITon5gdzTZaJnpm1+LMkvVmqVQu10vFcq1RrdTr1UZx"
+    "66ejRbscdrv/mfnsAMJxBHJBMbPiDoN3EEifzevBW3zr0BdADRrsh5qHRLuIcR7w3jTgRS"
+    "7oHXLCnB8qZ3tp9JjcToQGkldCDLFzSi53sTrg6eS/Ksw+/h2NnjxCw3RO6PbNwnwm53Lp"
+    "6TV+JkWXRgoQHfXzBPCquM/lO6qVCCAv2/P63Y7/zZJ4/S7/9yynEV5e/gUOs/+x"
+)
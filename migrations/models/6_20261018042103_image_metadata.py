@@ -0,0 +1,57 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `movies` ADD `poster_image_metadata` JSON;
+        ALTER TABLE `users` ADD `profile_image_metadata` JSON;
+        ALTER TABLE `reviews` ADD `review_image_metadata` JSON;
+        ALTER TABLE `media_blobs` ADD `metadata` JSON;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `movies` DROP COLUMN `poster_image_metadata`;
+        ALTER TABLE `users` DROP COLUMN `profile_image_metadata`;
+        ALTER TABLE `reviews` DROP COLUMN `review_image_metadata`;
+        ALTER TABLE `media_blobs` DROP COLUMN `metadata`;"""
+
+
+MODELS_STATE = (
+    "eJztXFtz2jgU/iuMn9KZbIdwhzdDoWEbYAdIt23IeIQtwBNbprachO3kv68k2/hOsRcS2O"
+    "gF8NE5unySzk0yvwTdUKBmfRwYjyoUWoVfAgI6/REuuCwIYL32yZSAwVxzOQkLI4G5hU0g"
+    "Y0JdAM2ChKRASzbVNVYNRKjI1jRKNGTCqKKlT7KR+tOGEjaWEK+gSQru7glZRQp8JpWTxz"
+    "tBNiHAUJEApo2pinBPWdYP0kKFmhLqPSkkRYwu4c2a0foI9xgj7cFckg3N1pHPvN7glYG2"
+    "3CpirSwhgiZtldCwadMh0R67Y/dG6fTeZ3G6HZBR4ALYGg5AsCcusoEopqQ3FhvgkrbyR+"
+    "mqUq80yrVKg7Cwnmwp9RdneP7YHUGGwHAqvLBygIHDwaD1cQtDHMbvEynBqg6TQQxLRsBU"
+    "XNGP3o8otB6Qu7D1CD64/iI7ELpkDMoIaRt34nZAOe0PupOpOPiLjkS3rJ8ag0icdmlJiV"
+    "E3EepF7QOlG2SLODtnW0nh7/70ukAfCz9Gwy5D0LDw0mQt+nzTHwLtE7CxISHjSQJKYI15"
+    "VA8YwulPLFaxBuNz2lkBM3k+twKRqSR4nejk6eBZ0iBa4hXdD9Xqjtn7Ko471+L4gnBFpm"
+    "ToFpWcspcQiGvNSNgXU/icolg8/nOBcNd6736bhpa6B9TFQPz2IbTcb0bDzx57ANjOzagd"
+    "wVMGVgKef05GwxQd4/JH8LxFZJx3iirjy4KmWvj+7NClQ96NbhTIiIagFUTRXWtg4+naPS"
+    "1hUOT39vA0YD2MSfRhIyM0UzRlF9k6A65PegCQDGMAboXfeMsLk16rMOnNkPjpa3c4vR13"
+    "WwVReYQI2yacofFoIA47hDY2dDqOGeqMBv1Oq9AxdFWeoZ44nIqT761CDyAMrM0MTTr9Lp"
+    "OYyCpkEoPvk2l3THgGGwtDk/CInWl/NCQNybQXM3Q9Go9H41bh2jBNg40/qxZv7qHDm6ka"
+    "vBnT3wbtqaTqYAkl29Sy2MMk2VyT7Frr/5llDKLzCEwV0LYzqPbUCg6g618f8VdX9UH0dI"
+    "gBdfBzwx+sgMOfAj8NPRcPgSCKEuZAfngCpiKFSvx5MiEJlZ8SNkbbFex9GUMNsPHGwXdD"
+    "8jGr5DSN8Yu3sDyqO/8MLqNkpOEVL9JLepQCEFmdits2bckF5NZiCYNY7oLRL3elLmzCcf"
+    "zMBc9S5HLJeJbi3WUp6H5kvzM4ZkGZw3jdR98eIX+sWtzDHasWU70xWhT2BlbAWpE1vgaW"
+    "9WSYCTomHcwE0XNJXryCl0vMTwaF7XK/4zhacexvzkDalX7rSFoHGmwV6OcMLaDz5HzniW"
+    "hre6zKqAL212QtuiI1YGFJM5YqymoJw5IHsIQn5eafkuHzhr3T8q1NY6FqMGduIkmYJyeS"
+    "sc2VnUitgcfHl3ukJ0Lw5cpPpNbAJyBlAniCIlOCIrheHRQkTX2AB4HihlR0ZnAcM1/jro"
+    "+EjI2/ctJzNoEletiszR0LJdneY5de7nkah6dxeBqHXzZ5gxQOaQ5DlOmySUDkXFB87fsm"
+    "rl3PFWMlyfIQKxHZPBFWagXcv0/x71PhzxNfpVbA4d8DfuYvSpncwKDIe80QU3c7G2oBif"
+    "cEWiyUD2MYB7BnmFBdoi9wE8uyJ8ep3lH56eGXFqESsgmettFYcGmQ4ZFBQexYdHHSET91"
+    "hfiGPQBs27cjzhe3oCJKBm6fvBFPlRwzVcJASU2XeJD9LmXi57OOlTdx2uGJE5444YmTXI"
+    "kT1WKbNGFbtA1DgwClbI2AWGRO50TuWNO43TWHdtLbo9FNaMba/Wh0fztod8cXV2yqCJPq"
+    "2Ky4j+kFNlk0TUjmPfmZ3DnnzvnbO+fm9hDoP+J2jueQUeRCuiirf35Mz3QAFRW0NWMuJD"
+    "imfuFOv1SnbNKc8O3nlgoze16cV2a2XAPNC2sFStXah8LMBrBcJMRmkX7WyzJha1RlUqBU"
+    "2ddcbjTIZ1OmD3LDYQNVQqpc0YJSs0K55gv6UL2iDVTnlKSUizLlrZNPIC+oOFAWDVqLXG"
+    "7QuupF+lC6agiRaT/1vvJr69xt5277Ydz2NcCrLGdJHv85Xlc/yvGRox6zQOhLHOuw86go"
+    "1ir73AOupF8ErsQgVP9JyGi21WWqZvYkzsxZb5ZK5XK9VCzXGtVKvV5tFLd6Ol60S2G3+5"
+    "+pzg4hnBRALghmdtJZ/I4AMiDzevAW39r0hVCDJn1PPI+1iwlzg/emBi92PzLPAT8/0896"
+    "qJzjGJ+f3B/2YvQxA2gRmqq8EhKiZ7fkclfoDHwe/ury4Z2Mo8WAj9C03GPQfV3dgMi5XO"
+    "x7jXcxydbIAKLLfp4AXhX3uWBKuFIBZGV7XjHd8f9bqVdM+V9wnYZ5efkXhA/nUQ=="
+)
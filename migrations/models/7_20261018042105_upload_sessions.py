@@ -0,0 +1,66 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS `upload_sessions` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `created_at` DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    `path` VARCHAR(255) NOT NULL UNIQUE,
+    `size` BIGINT NOT NULL,
+    `offset` BIGINT NOT NULL DEFAULT 0,
+    `expires_at` DATETIME(6) NOT NULL,
+    `user_id` INT NOT NULL,
+    CONSTRAINT `fk_upload_s_users_6f3a8c17` FOREIGN KEY (`user_id`) REFERENCES `users` (`id`) ON DELETE CASCADE,
+    KEY `idx_upload_sess_expires_3a131a` (`expires_at`)
+) CHARACTER SET utf8mb4 COMMENT='청크 단위로 이어 올리는 업로드. 받은 바이트는 `path`(MEDIA_DIR 기준 스테이징 파일)의 offset 위치에 쓴다.';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS `upload_sessions`;"""
+
+
+MODELS_STATE = (
+    "eJztXNty4jgQ/RWKp6Qqm+Jic8kbEDJhd4AtILMzE1IeIQtwxciML0nYqfz7SrKN7wR7gM"
+    "BGL4Bb3bJ0ZLX6tGR+5ReajFTjsqs9KSh/lfuVx2BBfwQLLnJ5sFx6YiowwUR1NIkKE4GJ"
+    "YeoAmkQ6BaqBiEhGBtSVpalomEixpapUqEGiqOCZJ7Kw8tNCkqnNkDlHOim4fyBiBcvohV"
+    "ROLu/zUEfARLIETHozRc4/UJXlozRVkCoHWk8KSRGTS+ZqyWQdbN4wRdqCiQQ11VpgT3m5"
+    "MucaXmsrmN1lhjDS6V2JzNQt2iXaYqfvbi/t1nsqdrN9NjKaAks1fRBsiQvUMMWUtMZgHZ"
+    "zRu/xRKgpVoVauCDWiwlqyllRf7e55fbcNGQK9Uf6VlQMT2BoMWg+3IMRB/K5JiaksUDyI"
+    "QcsQmLJjeun+CEPrArkJW1fgges9ZDtCl/RB7mN15QzcBihHnW57OGp0/6Y9WRjGT5VB1B"
+    "i1aUmJSVch6VnlnMo1MkXsmbOuJPdPZ3Sbo5e57/1emyGoGeZMZ3f09Ebf87RNwDI1CWvP"
+    "EpB9z5grdYEhmt7AmoqpouiYtuZAjx/PtUFoKAleRzp4C/AiqQjPzDmdD6K4YfS+NAat28"
+    "bgjGiFhqTnFJXsstcAiEtVi5kXI/SS4Fhc/VOBcNPz3v46CjzqLlBn3cbX88Dj/rnf++Sq"
+    "+4Btfe43Q3hCYMTg+eew30vwMY5+CM87TPp5LyvQvMipimE+nBy6tMub0Q0DGfIQtIIwuk"
+    "sVrFxfu+VK6Dd5ez08Dlh3syR6sJEe6gmeso2tBQOuQ1oAMEQRANfG7zzl88Obq9zwZowb"
+    "11/avdHdoH2Va8hPCJuWjsZ40O82ei0iG2gL2o8xbvW7ndZVrqUtFDjGN43eqDH8dpW7Ad"
+    "gExmqMh61Om1kMoYKYRffbcNQeEJ3uyjCRTnQarVGn3yM3grQVY3zbHwz6g6vcrabrGut/"
+    "Wi9e38KH1xM9eD3ivzXaUklZgBmSLF1Nsx7G2WYaZGe1/p+tjH50noCuAHrvFK49sYId+P"
+    "rDI35wV+9Hb4FMQAP8zPD7K+DwJ8BPqef00UeiqGAC4OMz0GUpUOKNk44IVX6OmRhNx/Dm"
+    "rwFSAetvFHyHkg9YJce5GL+6D5YrdcafwaWVtCS8okWL0iIsAZg8nbJzb3onB5A7gyUMIr"
+    "kLJr/YlLqwiMb+Mxc8S5EpJONZig+XpaDzkf1OEZj5bXYTde99egTiMbGwRTgmFhKjMVoU"
+    "jAbmwJiTZ3wJDONZ02N8TDKYMaankrw4QJRLlp8UDtvR/sA8WrbX34xE2rF+bya9ACq6yt"
+    "HPMZ4i+8r+zsJoK1s8lWEH7D2TlfATqQLDlFRtpuC0K2HQcgcr4VGF+ce08Lnd3rjyLXVt"
+    "qqgoY24izpgnJ+KxzZSdSKyB8+OLLdITAfgy5ScSa+ADkDAAPEGRKkHhf15tFCRVeUQ7ge"
+    "IzqeiE4bCWqgZkyUCGQar/TUTuWGVDu64TA2WfSSxn0sSksbzplJzI8s3b3aay7hm/Zg6J"
+    "nQR64LktntviuS1+Aucd8lrkdibCqU7g+ExOBcVDH8Jxgp1MxDPOlvPOWGSz0M7ECjjpuX"
+    "ibdQbQy0I6Eyvg8G8BP4sXpVRhoN/ko6bNabidDjWfxUcCLZLfCGIYBfBG05Eyw3+hVWTr"
+    "IYGqOtUcH35JDJWIdfC8ZmP+R4N0j3QKmfaK3hi2GtftfHTC7gC29Ssjp4ub3xHFA7dNMu"
+    "0j54/2nyphoCSmS1zI3kqZeEm+feVN7PvwxAlPnPDESabEiWKwSRozLZqapiKAE6aGzyw0"
+    "phNit69hXM+aXQfpzX7/c2DEmp0wu7/rNtuDsyIbKqKk2GtWNMZ0iU0aTxOw+UhxJg/OeX"
+    "D+/sG5vt4E+k3cTnFzNoxcwBeljc/3GZl2kayApqpN8jGBqVe4MS5dUDVpQvS2C0vzY2tS"
+    "mAhjC1ZA/cyYg5JYOc+NLYDKBSKsF+hntQyJWk2EpEAW2dcE1mrksw7pBazZakAkIqFIC0"
+    "p1gWpNpvRCLNIbiBMqkssFSHWr5BPAKTUH8rRGa4HlGq2rWqAXpWItHxr2Y28rP8vPw3Ye"
+    "tu8mbF8Cc55mL8nVP8Uz/HvZPrLdYxoIPYt9bXbuFcWKsM3haCH5dLQQgVD5Nyaj2VRmiZ"
+    "7ZtTixYL1eKpXL1VKhXKmJQrUq1gprPx0t2uSwm51P1GcHEI4jkFOCmRW3F7+BQPpsDgdv"
+    "4b2XvgBqSKcvz2dZ7SLGfMF71wUvckoyywY/39NPu6mcYRuf79zv9rT4Xl/lDpwOjnunO3"
+    "x8eMPL3dFjy9uQaQiBTIhjocKIZwlRllgtCGtKSsikxy9hpUTJah3ANQuFIhRtZUpPZXjJ"
+    "+GtxQi2Fgn0huNXIpYnLX3/QAPjHWbd93WlI151BgBYzjgqoQVGA6zbUZTHAcc/pl1jLad"
+    "Opgcyc23CIRNoJUWbVCFOB9Uu4jGHnH6vznO5zus+jH073j4Puc666F65qrwfpkPVsTomo"
+    "HhhY9LJUiP/I4MqDlodx5Tt2CCfiuV0c3vzXFb6rzXe1D7Or/T7EsoF0Bc7zMYzSKbnYRC"
+    "WBp8P/KOzIJuXFBrbxhHQ3T7BtXOozOZU3xg7xz0dkaqQA0VE/TQCLhW3eXCRaiQCysi3f"
+    "Xdzwb9eJ7y7yP7w+jrzl63/b/NKA"
+)
@@ -0,0 +1,57 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `reviews` ADD `like_count` INT NOT NULL DEFAULT 0;
+        UPDATE `reviews` SET `like_count` = (SELECT COUNT(*) FROM `review_likes` WHERE `review_likes`.`review_id` = `reviews`.`id` AND `review_likes`.`is_liked` = 1);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `reviews` DROP COLUMN `like_count`;"""
+
+
+MODELS_STATE = (
+    "eJztXNty4jgQ/RWKp6Qqm+Jic8kbEDJhd4AtILMzE1IeIQtwxciML0nYqfz7SrKN7wR7gM"
+    "BGL4Bb3bJ0JLX6tGV+5ReajFTjsqs9KSh/lfuVx2BBfwQLLnJ5sFx6YiowwUR1NIkKE4GJ"
+    "YeoAmkQ6BaqBiEhGBtSVpalomEixpapUqEGiqOCZJ7Kw8tNCkqnNkDlHOim4fyBiBcvohV"
+    "ROLu/zUEfARLIETHozRc4/UJXlozRVkCoHWk8KSRGTS+ZqyWQdbN4wRdqCiQQ11VpgT3m5"
+    "MucaXmsrmN1lhjDS6V2JzNQt2iXaYqfvbi/t1nsqdrN9NjKaAks1fRBsiQvUMMWUtMZgHZ"
+    "zRu/xRKgpVoVauCDWiwlqyllRf7e55fbcNGQK9Uf6VlQMT2BoMWg+3IMRB/K5JiaksUDyI"
+    "QcsQmLJjeun+CEPrArkJW1fggetNsh2hS/og97G6cgZuA5SjTrc9HDW6f9OeLAzjp8ogao"
+    "zatKTEpKuQ9KxyTuUaWSL2yllXkvunM7rN0cvc936vzRDUDHOmszt6eqPvedomYJmahLVn"
+    "Cci+OeZKXWCIpjewpmKqKDqmrTnQ48dzbRAaSoLXkQ7eArxIKsIzc07XgyhuGL0vjUHrtj"
+    "E4I1qhIek5RSW77DUA4lLVYtbFCL0kOBZX/1Qg3DTf219HganuAnXWbXw9D0z3z/3eJ1fd"
+    "B2zrc78ZwhMCIwbPP4f9XoKPcfRDeN5h0s97WYHmRU5VDPPh5NClXd6MbhjIkIegFYTRXa"
+    "pg5fraLXdCv8nb++FxwLqbLdGDjfRQT/CUbWwtGHAd0gKAIYoAuDZ+5yWfH95c5YY3Y9y4"
+    "/tLuje4G7atcQ35C2LR0NMaDfrfRaxHZQFvQfoxxq9/ttK5yLW2hwDG+afRGjeG3q9wNwC"
+    "YwVmM8bHXazGIIFcQsut+Go/aA6HRXhol0otNojTr9HrkRpK0Y49v+YNAfXOVuNV3XWP/T"
+    "evH6Fj68nujB6xH/rdGWSsoCzJBk6Wqa/TDONtMgO7v1/2xn9KPzBHQF0HuncO2JFezA1x"
+    "8e8YO7ej96C2QCGuBnht9fAYc/AX5KPaePPhJFBRMAH5+BLkuBEm+cdESo8nPMwmg6hjd/"
+    "DZAKWH+j4DuUfMAqOc7N+NWdWK7UGX8Gl1bSkvCKFi1Ki7AEYDI7Zefe9E4OIHcGSxhEch"
+    "dMfrEpdWERjf1nLniWIlNIxrMUHy5LQdcj+50iMPPb7Cbq3vvyCMRjYmGLcEwsJEZjtCgY"
+    "DcyBMSdzfAkM41nTY3xMMpgxpqeSvDhAlEu2nxQO29H+wDxatvffjETasX5vJr0AKrrK0c"
+    "8xniL7yv7OwmgrW8zKsAP25mQlPCNVYJiSqs0UnHYnDFruYCc8qjD/mDY+t9sbd76lrk0V"
+    "FWXMTcQZ8+REPLaZshOJNXB+fLFFeiIAX6b8RGINfAASBoAnKFIlKPzz1UZBUpVHtBMoPp"
+    "OKThgOa6lqQJYMZBik+t9E5I5VNrTrOjFQ9pnEchZNTBrLW07JiSzfut1tKuue8WvmkNhJ"
+    "oAee2+K5LZ7b4idw3iGvRW5nIpzqBI7P5FRQPPQhHCfYyUQ842w574xFNgvtTKyAk56Lt1"
+    "lnAL0spDOxAg7/FvBT9kTAtOIcdmIgGDQ6XOq88N4BoT/qJ7NOShU++00+6uMGSlPSoeaz"
+    "+EigRfJCQQyjAN5oOlJm+C+0ijyySaD4TjXHh18SsydiHTyvWax/apDukU4h046EGsNW47"
+    "qdjy7YHcC2ftXmdHHzO6J44LZJQn7kvNv+U0wMlMQ0kwvZW6kmLzm6r3yTfR+ecOIJJ55w"
+    "ypRwUgy2SGOWRVPTVARwwtLwmYXGdELs9jWM61Wza3LT7Pc/B0as2QlnRe66zfbgrMiGii"
+    "gp9p4VjTFdQpjG0wRsPlKcyYNzHpy/f3Curx+e/SZup/hQO4xcwBeljc/3GZl2kayApqpN"
+    "8jGBqVe4MS5dUDVpQvS2C0vzY2tSmAhjC1ZA/cyYg5JYOc+NLYDKBSKsF+hntQyJWk2EpE"
+    "AW2dcE1mrksw7pBazZakAkIqFIC0p1gWpNpvRCLNIbiBMqkssFSHWr5BPAKTUH8rRGa4Hl"
+    "Gq2rWqAXpWItHxr2Y28rfweCh+08bN9N2L4E5jzNMzhX/xTffdjLYzfbPaaB0LPY10Piva"
+    "JYEbY5VC4knyoXIhAq/8ZkNJvKLNEzuxYnFqzXS6VyuVoqlCs1UahWxVph7aejRZscdrPz"
+    "ifrsAMJxBHKa+pFYwOZDPhEjCCCd/ulAlt0uYsw3vHfd8CKnS7McjOBnIVI+jM9y/IGfeN"
+    "jtKfu9vgIfOFUd9y58+Nj1hpfio8e9tyHTEAKZEMdChRHPEqIssVoQ1pSUkEmPX8JKiZLV"
+    "OoBrFgpFKNrKlJ7K8JLx1+KEWgoF+0Jwq5FLE5e//qAB8I+zbvu605CuO4MALWYcFVCDog"
+    "DXbajLYoDjntMvsZbTplMDmTm34RCJtBOizKoRpgLrl3AZw84/Vuc53ed0n0c/nO4fB93n"
+    "XHUvXNXeD9Ih69mcElE9MLDoZakQ/5HBlQctD+PKd+wQTsRzuzi8+W81/Kk2f6p9mKfa70"
+    "MsG0hX4DwfwyidkotNVBJ4OvwP1o5sUV5sYBtPSHfzBNvGpT6TU3nT7hD/GEWWRgoQHfXT"
+    "BLBY2OaNT6KVCCAr2/Kdzw3/Ep74zif/o/DjyFu+/gfPJzSo"
+)
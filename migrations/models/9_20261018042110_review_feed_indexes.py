@@ -0,0 +1,59 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `reviews` ADD INDEX `idx_reviews_movie_i_866033` (`movie_id`, `like_count`, `id`);
+        ALTER TABLE `reviews` ADD INDEX `idx_reviews_movie_i_1f1300` (`movie_id`, `created_at`, `id`);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE `reviews` DROP INDEX `idx_reviews_movie_i_1f1300`;
+        ALTER TABLE `reviews` DROP INDEX `idx_reviews_movie_i_866033`;"""
+
+
+MODELS_STATE = (
+    "eJztXNty4jgQ/RUXT0kVm+Jic8kbEDJhd4AtILMzE1IeYQtwxciMbZKwU/n3lWQb34ntAQ"
+    "KLXgC3umXpyGr1acn8yi00GarGVVd7VmDumvuVQ2BBfvgL8lwOLJeumAhMMFFtTaxCRWBi"
+    "mDqQTCydAtWAWCRDQ9KVpaloCEvRSlWJUJOwooJmrmiFlJ8rKJraDJpzqOOCh0csVpAMX3"
+    "Hl+PIhJ+kQmFAWgUlupsi5R6KyfBKnClRlX+txIS6ictFcL6msg8xbqkhaMBElTV0tkKu8"
+    "XJtzDW20FUTvMoMI6uSuWGbqK9Il0mK7704vrda7KlazPTYynIKVanogSIiLpCGCKW6NQT"
+    "s4I3f5o1Tkq3ytXOFrWIW2ZCOpvlndc/tuGVIEeqPcGy0HJrA0KLQubn6I/fjd4BJTWcBo"
+    "EP2WATBl2/TK+RGE1gFyG7aOwAXXfch2hC7ug9xH6toeuC1Qjjrd9nDU6P5NerIwjJ8qha"
+    "gxapOSEpWuA9KLyiWRa3iKWDNnUwn3T2d0x5FL7nu/16YIaoY50+kdXb3R9xxpE1iZmoi0"
+    "FxHInmfMkTrAYE13YE3FVGF4TFtzoEeP58YgMJQYryMdvAV4FVWIZuaczAdB2DJ6XxqD1l"
+    "1jcIG1AkPSs4tKVtmbD8SlqkXMixF8jXEsjv6pQLjteW9/HfkedQeoi27j66Xvcf/c731y"
+    "1D3Atj73mwE8JWBE4PnnsN+L8TG2fgDPe4T7+SArkpnnVMUwH08OXdLl7egGgQx4CFJBEN"
+    "2lCtaOr024EnpN3l8PjwPW3SyJLmy4h3qMp2yj1YIC18EtAEiCIQA3xh885XPD22tueDtG"
+    "jZsv7d7oftC+5hryM0TmSodjNOh3G70Wlg20BenHGLX63U7rmmtpC0Uao9tGb9QYfrvmbg"
+    "EygbEeo2Gr06YWQ0mB1KL7bThqD7BOd22YUMc6jdao0+/hG0mkFWN01x8M+oNr7k7TdY32"
+    "P60Xryfw4fVYD14P+W+NtFRUFmAGxZWuplkPo2wzDbK9Wv/PVkYvOs9AVwC5dwrXHlvBDn"
+    "z94RE/uKv3oreAJiABfmb4vRUw+GPgJ9Rz+uQhUUQwAdLTC9Bl0VfijpMOMVV+iZgYTdvw"
+    "9q8BVAHtbxh8m5IPaCXHuRi/OQ+WI7XHn8KllbQ4vMJFi9IiKAEIP52yfW9yJxuQe4MmDE"
+    "K5CyrPb0tdrLDG/jMXLEuRKSRjWYqzy1KQ+Uh/pwjMvDa7ibr3Pj188ZhQSBCOCYXYaIwU"
+    "+aOBOTDm+BlfAsN40fQIHxMPZoTpqSQvDhDl4uUnhcO2tc+YR8vW+puRSNvWH82kF0CF1x"
+    "z5HKMptK6s7yyMtpLgqQw6YPeZrASfSBUYpqhqMwWlXQn9ljtYCY8qzD+mhc/p9taVb6lr"
+    "U0WFGXMTUcYsORGNbabsRGwNjB/nE6QnfPBlyk/E1sAGIGYAWIIiVYLC+7xaKIiq8gR3As"
+    "VnXNEJw7FaqhqQRQMaBq7+NxG5p5UNrbpODJR9JrHsSRORxnKnU3wiyzNvd5vKeqD8mjok"
+    "ehLoMXQqh8pFKzsVPqGT5/waZE5hZFeIneFh2TGWHWNneA6aGcO3MyFKdYbHY3IqKB76GI"
+    "8dLmWirlG2jLlGIpuFuMZWwGhT/n3e6kMvC22NrYDBnwB+f6yYMBD0Gx0u+V746IDQyxvc"
+    "eDshal6Tc92wIEQnHWoei3MCLZRZ8mMYBvBW06EyQ3/BdWjTJyZJYFdzfPjF5QawWAcvGx"
+    "brfTRw93CnoGlFQo1hq3HTzoUn7A5g27ysc7q4eR1RNHBJ0pjnnLnbf5KKghKbqHIgey9Z"
+    "5aZX95Wxsu4TSlmxhFOmhZIlnM4u4aQYdJJGTIumpqkQoJip4TELjOkE2+1rGDezZtfkpt"
+    "nvf/aNWLMTzIrcd5vtwUWRDhVWUqw1KxxjOoQwjafx2ZxTnMmCcxacf3xwrm+2334Tt1Pc"
+    "Fg8i5/NFaePzfUamXSgroKlqk1xEYOoWbo1LF0RNnGC9ZGFpbryaFCb8eCVVQP3CmIOSUL"
+    "nkxisAywUsrBfIZ7UsYbWaIOECWaBfE6lWw591iVxINUsNCFjEF0lBqc4TrcmUXAhFcgNh"
+    "QkRyuSAR3Sr+BNKUmAN5WiO1SOUaqataIBelYi0XGPZjbyt7i4KF7Sxs303YvgTmPM0enK"
+    "N/im9P7GXbzXKPaSB0Lfa1SbxXFCt8kmPpfPy5dD4EofJvREazqcxiPbNjcWLBer1UKper"
+    "pUK5UhP4alWoFTZ+Oly0zWE3O5+Iz/YhHEUgp6m3xHw2Z7kjhhGAOvnbgiyrXciYLXgfuu"
+    "CFzqdmORjBzkKk3IzPcvyBnXjY7Tn9vb5E7zuXHfU2ffDg9pbX6sMHxpOQaUkCMiaOhQol"
+    "niVIWGK1wG8oKSaTLr+UKiVCVutA2rBQSZAES5nQU1m6ovy1OCGWfMG64J1q5NLE4a8/SA"
+    "D846Lbvuk0xJvOwEeLKUcFxKDIS5s21GXBx3EvyZdQ47Tp1IAm5zRcggLphCDTavgpT/vF"
+    "X0Ww8/PqPKP7jO6z6IfR/eOg+4yr7oWrWutBOmRdm1MiqgcGFr4uFew/Mrhyv+VhXPmOHc"
+    "KJeG4Hh3f/74btarNd7cPsan8MsWxAXZHmuQhGaZfkt1FJ4Oqwv2g7skmZ38I2nqHu5AmS"
+    "xqUek1N50+4Q/zmFp0YKEG310wSwWEjyxifWigWQliV853PL/4zHvvPJ/mr8OPKWb/8BzS"
+    "hJlw=="
+)